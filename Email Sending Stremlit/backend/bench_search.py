@@ -0,0 +1,126 @@
+"""
+Lead search benchmark
+Compares the previous search (five ILIKE '%q%' predicates, all rows returned)
+with the full-text index on a synthetic SQLite database
+
+Usage:
+    python -m backend.bench_search [--leads 1000000] [--db ./bench_search.db] [--repeat 5]
+
+The database is generated once and reused on later runs with the same --db.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from .models import Base, User, Lead
+from .services.search_service import LeadSearchService
+
+FIRST_NAMES = ['john', 'jane', 'joseph', 'maria', 'michael', 'sarah', 'david', 'laura', 'omar', 'aisha',
+               'chen', 'priya', 'lucas', 'emma', 'noah', 'olivia', 'ahmed', 'sofia', 'liam', 'yuki']
+LAST_NAMES = ['smith', 'johnson', 'garcia', 'khan', 'nguyen', 'müller', 'rossi', 'kim', 'brown', 'silva',
+              'patel', 'cohen', 'ivanov', 'tanaka', 'dubois', 'jones', 'lopez', 'wilson', 'ali', 'martin']
+COMPANY_WORDS = ['acme', 'globex', 'initech', 'umbrella', 'stark', 'wayne', 'hooli', 'vandelay', 'wonka',
+                 'cyberdyne', 'soylent', 'tyrell', 'aperture', 'massive', 'dynamic', 'blue', 'north', 'prime']
+COMPANY_SUFFIXES = ['inc', 'labs', 'group', 'systems', 'partners', 'digital', 'health', 'capital']
+JOB_TITLES = ['ceo', 'cto', 'marketing manager', 'sales director', 'software engineer', 'founder',
+              'operations lead', 'product manager', 'account executive', 'data analyst']
+
+QUERIES = ['jo', 'john', 'acme', 'john acme', 'sales dir', 'müller', 'cyberdyne health', 'zzz']
+
+USERS = 10
+
+
+def legacy_search(db, query: str, user_id: int):
+    """Search as LeadService.search_leads did before the index"""
+    leads = db.query(Lead).filter(Lead.user_id == user_id)
+    search_filter = (
+        Lead.first_name.ilike(f"%{query}%") |
+        Lead.last_name.ilike(f"%{query}%") |
+        Lead.email.ilike(f"%{query}%") |
+        Lead.company.ilike(f"%{query}%") |
+        Lead.job_title.ilike(f"%{query}%")
+    )
+    return leads.filter(search_filter).all()
+
+
+def generate(engine, count: int, batch: int = 50000):
+    """Insert synthetic users and leads"""
+    rng = random.Random(42)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {'id': i, 'email': f'user{i}@bench.local', 'full_name': f'User {i}', 'hashed_password': '-'}
+            for i in range(1, USERS + 1)
+        ])
+
+    started = time.perf_counter()
+    for start in range(0, count, batch):
+        rows = []
+        for i in range(start, min(start + batch, count)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            company_word = rng.choice(COMPANY_WORDS)
+            rows.append({
+                'user_id': i % USERS + 1,
+                'email': f'{first}.{last}{i}@{company_word}.com',
+                'first_name': first.title(),
+                'last_name': last.title(),
+                'company': f'{company_word.title()} {rng.choice(COMPANY_SUFFIXES).title()}',
+                'job_title': rng.choice(JOB_TITLES).title(),
+                'status': 'new',
+                'ai_score': rng.random(),
+                'is_verified': False
+            })
+        with engine.begin() as conn:
+            conn.execute(Lead.__table__.insert(), rows)
+    print(f"Generated {count:,} leads in {time.perf_counter() - started:.1f}s")
+
+
+def timed(func, repeat: int):
+    """Median wall time in ms and the last result"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lead search')
+    parser.add_argument('--leads', type=int, default=1000000, help='Synthetic leads to generate')
+    parser.add_argument('--db', default='./bench_search.db', help='SQLite file for the benchmark data')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query (median is reported)')
+    args = parser.parse_args()
+
+    engine = create_engine(f'sqlite:///{args.db}')
+    SessionLocal = sessionmaker(bind=engine)
+    if not os.path.exists(args.db) or os.path.getsize(args.db) == 0:
+        generate(engine, args.leads)
+
+    search = LeadSearchService()
+    started = time.perf_counter()
+    search.ensure(engine)
+    print(f"Index ready ({search.backend}) in {time.perf_counter() - started:.1f}s")
+
+    db = SessionLocal()
+    try:
+        total = db.query(func.count(Lead.id)).scalar()
+        print(f"Leads: {total:,} across {USERS} users; searching as user 1\n")
+        print(f"{'query':<20} {'legacy ms':>10} {'rows':>8} {'indexed ms':>11} {'page':>5} {'speedup':>8}")
+        for query in QUERIES:
+            legacy_ms, legacy_rows = timed(lambda: legacy_search(db, query, 1), args.repeat)
+            indexed_ms, page = timed(lambda: search.search(query, 1, db, limit=50), args.repeat)
+            print(f"{query:<20} {legacy_ms:>10.1f} {len(legacy_rows):>8} {indexed_ms:>11.1f} {len(page):>5} "
+                  f"{legacy_ms / max(indexed_ms, 0.001):>7.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
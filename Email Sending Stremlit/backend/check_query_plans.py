@@ -0,0 +1,93 @@
+"""
+Query-plan regression check for the hot backend queries
+Migrates a scratch SQLite database, runs EXPLAIN QUERY PLAN on each hot query
+and exits non-zero if any of them full-scans a table
+
+Usage:
+    python -m backend.check_query_plans [--verbose]
+
+Run it in CI after changing models, migrations or the queries below; keep
+the queries in step with the services they mirror.
+"""
+
+import argparse
+import re
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import create_engine, select, func, case, desc
+from sqlalchemy.sql import Select
+
+from .migrations import upgrade
+from .models import Lead, Campaign, Email, EmailQueue
+
+USER_ID = 1
+CAMPAIGN_ID = 1
+NOW = datetime(2024, 1, 1)
+
+# name -> query, mirroring the endpoints and services that run them
+HOT_QUERIES: Dict[str, Select] = {
+    "leads.list_page": select(Lead).where(Lead.user_id == USER_ID, Lead.id > 0).order_by(Lead.id).limit(100),
+    "leads.count": select(func.count(Lead.id)).where(Lead.user_id == USER_ID),
+    "leads.recent": select(Lead.email, Lead.created_at).where(Lead.user_id == USER_ID)
+        .order_by(desc(Lead.created_at)).limit(3),
+    "leads.quality_distribution": select(func.count(case((Lead.ai_score > 0.7, 1))))
+        .where(Lead.user_id == USER_ID, Lead.ai_score.isnot(None)),
+    "leads.import_existing_emails": select(Lead.email)
+        .where(Lead.user_id == USER_ID, Lead.email.in_(["a@example.com", "b@example.com"])),
+    "leads.export": select(*Lead.__table__.columns).where(Lead.user_id == USER_ID, Lead.id > 0).order_by(Lead.id),
+    "campaigns.list": select(Campaign).where(Campaign.user_id == USER_ID),
+    "campaigns.recent": select(Campaign.name).where(Campaign.user_id == USER_ID)
+        .order_by(desc(Campaign.created_at)).limit(3),
+    "emails.dashboard_stats": select(func.count(Email.sent_at), func.count(case((Email.is_opened == True, 1))))
+        .join(Campaign).where(Campaign.user_id == USER_ID),
+    "emails.campaign_stats": select(func.count(Email.id), func.count(Email.sent_at))
+        .where(Email.campaign_id == CAMPAIGN_ID),
+    "emails.campaign_recipients": select(Email.id, Lead.first_name).join(Lead, Email.lead_id == Lead.id)
+        .where(Email.campaign_id == CAMPAIGN_ID, Email.id > 0).order_by(Email.id).limit(100),
+    "emails.daily_sent": select(func.count(Email.id)).join(Campaign)
+        .where(Campaign.user_id == USER_ID, Email.sent_at >= NOW, Email.sent_at < NOW + timedelta(days=1)),
+    "emails.tracking_unmarked": select(Email.id, Email.campaign_id)
+        .where(Email.id.in_([1, 2, 3]), Email.is_opened.isnot(True)),
+    "email_queue.due": select(EmailQueue).where(EmailQueue.status == "pending", EmailQueue.scheduled_at <= NOW)
+        .order_by(EmailQueue.priority.desc(), EmailQueue.created_at.asc()).limit(10),
+}
+
+# "SCAN leads" is a full table scan; "SCAN leads USING INDEX ..." and "SEARCH ..." are not
+FULL_SCAN_RE = re.compile(r"^SCAN (\w+)$")
+
+def explain(conn, query: Select) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for a query"""
+    # render_postcompile expands IN lists into one placeholder per value
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail if a hot query full-scans a table")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    upgrade(engine)
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, query in HOT_QUERIES.items():
+            plan = explain(conn, query)
+            scans = [m.group(1) for m in map(FULL_SCAN_RE.match, plan) if m]
+            if scans:
+                failures += 1
+            if scans or args.verbose:
+                print(f"{'FAIL' if scans else 'ok  '} {name}")
+                for line in plan:
+                    print(f"       {line}")
+            else:
+                print(f"ok   {name}")
+
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use an index")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
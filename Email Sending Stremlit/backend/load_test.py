@@ -0,0 +1,156 @@
+"""
+Concurrent load test for the hot API endpoints
+Fires a mix of tracking pixels, lead list, analytics and websocket-style
+metric reads at a running server and reports latency percentiles per endpoint
+
+Usage:
+    python -m backend.load_test --seed                    # create test data, print token/ids
+    python -m backend.load_test --token T --email-id 1 --campaign-id 1 [--url http://127.0.0.1:8000]
+
+Run it against the server before and after a change with the same seed and
+options; p99 of the tracking endpoints is the number to compare, since they
+are what a slow analytics query used to stall. Requires httpx.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def seed(leads: int, emails: int):
+    """Create a user with leads, a campaign and sent emails in DATABASE_URL"""
+    from datetime import datetime
+    from .database import SessionLocal, engine
+    from .models import Base, User, Lead, Campaign, Email
+    from .auth import create_access_token
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        suffix = int(time.time())
+        user = User(email=f"loadtest{suffix}@example.com", full_name="Load Test", hashed_password="-")
+        db.add(user)
+        db.flush()
+
+        lead_rows = [
+            Lead(user_id=user.id, email=f"lead{i}.{suffix}@example.com", company=f"Company {i}",
+                 industry=random.choice(["technology", "finance", "healthcare"]), ai_score=random.random())
+            for i in range(leads)
+        ]
+        db.add_all(lead_rows)
+        campaign = Campaign(user_id=user.id, name="Load test", subject="Hello", content="Hi",
+                            total_recipients=emails)
+        db.add(campaign)
+        db.flush()
+
+        db.add_all([
+            Email(campaign_id=campaign.id, lead_id=lead_rows[i % leads].id,
+                  recipient_email=lead_rows[i % leads].email, subject="Hello", content="Hi",
+                  sent_at=datetime.utcnow())
+            for i in range(emails)
+        ])
+        db.commit()
+        first_email = db.query(Email.id).filter(Email.campaign_id == campaign.id).order_by(Email.id).first()[0]
+
+        print(f"--token {create_access_token(data={'sub': str(user.id)})} "
+              f"--email-id {first_email} --campaign-id {campaign.id}")
+    finally:
+        db.close()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run(args) -> Dict[str, List[float]]:
+    """Issue requests from concurrent workers and collect latencies per endpoint"""
+    headers = {"Authorization": f"Bearer {args.token}"}
+    # Weighted mix: pixels dominate right after a send
+    endpoints = [
+        ("track_open", 60, lambda: f"/emails/{args.email_id + random.randrange(args.email_span)}/track"),
+        ("track_click", 15, lambda: f"/emails/{args.email_id + random.randrange(args.email_span)}/click?link=https://example.com"),
+        ("leads", 10, lambda: "/leads?limit=100"),
+        ("dashboard", 10, lambda: "/analytics/dashboard"),
+        ("campaign", 5, lambda: f"/analytics/campaigns/{args.campaign_id}"),
+    ]
+    if args.only:
+        endpoints = [endpoint for endpoint in endpoints if endpoint[0] in args.only.split(",")]
+    names = [name for name, _, _ in endpoints]
+    weights = [weight for _, weight, _ in endpoints]
+    paths = {name: path for name, _, path in endpoints}
+
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=60) as client:
+        # Wait for the server to come up so startup is not counted as errors
+        for _ in range(60):
+            try:
+                await client.get("/health")
+                break
+            except httpx.HTTPError:
+                await asyncio.sleep(1)
+        deadline = time.monotonic() + args.duration
+
+        async def worker():
+            while time.monotonic() < deadline:
+                name = random.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[name]())
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                latencies[name].append((time.perf_counter() - started) * 1000)
+                if not ok:
+                    errors[name] += 1
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    print(f"{'endpoint':<12} {'requests':>8} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    total = 0
+    for name in names:
+        samples = latencies[name]
+        if not samples:
+            continue
+        total += len(samples)
+        print(f"{name:<12} {len(samples):>8} {errors[name]:>6} {statistics.median(samples):>8.1f} "
+              f"{percentile(samples, 95):>8.1f} {percentile(samples, 99):>8.1f} {max(samples):>8.1f}")
+    print(f"Throughput: {total / args.duration:.0f} req/s at concurrency {args.concurrency}")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the LeadAI Pro API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the running API")
+    parser.add_argument("--token", help="Bearer token of the seeded user")
+    parser.add_argument("--email-id", type=int, default=1, help="First seeded email id")
+    parser.add_argument("--email-span", type=int, default=1000, help="Number of email ids to spread pixels over")
+    parser.add_argument("--campaign-id", type=int, default=1, help="Seeded campaign id")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--only", help="Comma-separated endpoints to hit, e.g. track_open for an open burst")
+    parser.add_argument("--seed", action="store_true", help="Create test data and print the options to use")
+    parser.add_argument("--leads", type=int, default=20000, help="Leads to seed")
+    parser.add_argument("--emails", type=int, default=50000, help="Emails to seed")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.leads, args.emails)
+        return
+    if not args.token:
+        parser.error("--token is required (run with --seed first)")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,14 @@ FastAPI Backend for LeadAI Pro
 AI-powered lead management and email marketing platform
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Depends, status, WebSocket, WebSocketDisconnect, BackgroundTasks, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 import uvicorn
 from datetime import datetime, timedelta
 from typing import List, Optional
@@ -17,24 +21,28 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import database and models
-from .database import get_db, engine, SessionLocal
-from .models import Base, User, Lead, Campaign, Email, Analytics
+from .database import get_db, get_async_db, engine, SessionLocal, AsyncSessionLocal, DATABASE_URL
+from .models import Base, User, UserRole, Lead, Campaign, Email, Analytics
 from .schemas import (
     UserCreate, UserLogin, UserResponse,
     LeadCreate, LeadResponse, LeadUpdate,
     CampaignCreate, CampaignResponse,
     EmailCreate, EmailResponse,
-    AnalyticsResponse
+    AnalyticsResponse, ImportJobResponse, TrainingJobResponse
 )
+from .migrations import upgrade as run_migrations
 from .auth import create_access_token, verify_token, get_password_hash, verify_password
 from .services.lead_service import LeadService
 from .services.campaign_service import CampaignService
 from .services.email_service import EmailService
 from .services.ai_service import AIService
 from .services.analytics_service import AnalyticsService
+from .services.import_job_service import ImportJobService
+from .services.tracking_service import TrackingService
+from .services.user_cache import UserCache, CurrentUser
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create/upgrade database tables and indexes
+run_migrations(engine)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -56,11 +64,12 @@ app.add_middleware(
 
 # Security
 security = HTTPBearer()
+user_cache = UserCache()
 
 # Dependency to get current user
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current authenticated user"""
     token = credentials.credentials
@@ -72,21 +81,68 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    user_id = str(payload.get("sub"))
+    user = None
+    if user_id.isdigit():
+        # The session only connects on a cache miss
+        user = user_cache.get(int(user_id))
+        if user is None:
+            user = await db.get(User, int(user_id))
+            if user is not None:
+                # Hits and misses both return the detached snapshot
+                user = user_cache.set(user)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+    if user.is_active is False:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is deactivated"
+        )
     return user
 
 # Initialize services
 lead_service = LeadService()
 campaign_service = CampaignService()
-email_service = EmailService()
-ai_service = AIService()
+tracking_service = TrackingService(SessionLocal)
+email_service = EmailService(tracking_service)
+ai_service = AIService(DATABASE_URL)
 analytics_service = AnalyticsService()
+import_job_service = ImportJobService()
+
+@app.on_event("startup")
+async def prepare_search_index():
+    """Create the lead full-text index (and its sync triggers) if missing"""
+    lead_service.search_index.ensure(engine)
+
+@app.on_event("startup")
+async def start_tracking():
+    """Replay journaled tracking events and start the batch flusher"""
+    tracking_service.start()
+
+@app.on_event("shutdown")
+async def stop_tracking():
+    """Apply buffered tracking events before exiting"""
+    tracking_service.stop()
+
+@app.on_event("startup")
+async def start_model_training():
+    """Load the active lead scoring model and schedule incremental retraining"""
+    ai_service.load_model()
+    interval = int(os.getenv("MODEL_RETRAIN_INTERVAL", "0"))
+    if interval > 0:
+        async def retrain_periodically():
+            while True:
+                await asyncio.sleep(interval)
+                await ai_service.train_lead_scoring_model("incremental")
+        asyncio.create_task(retrain_periodically())
+
+@app.on_event("shutdown")
+async def stop_model_training():
+    """Stop the training worker process"""
+    ai_service.trainer.shutdown()
 
 # WebSocket for live analytics
 clients = set()
@@ -98,13 +154,12 @@ async def websocket_metrics(ws: WebSocket):
     try:
         while True:
             # Periodically push overall metrics
-            db = SessionLocal()
-            try:
-                total_leads = db.query(Lead).count()
-                total_campaigns = db.query(Campaign).count()
-                total_sent = db.query(Email).filter(Email.sent_at != None).count()
-                total_opened = db.query(Email).filter(Email.opened_at != None).count()
-                total_clicked = db.query(Email).filter(Email.clicked_at != None).count()
+            async with AsyncSessionLocal() as db:
+                total_leads = await db.scalar(select(func.count(Lead.id)))
+                total_campaigns = await db.scalar(select(func.count(Campaign.id)))
+                total_sent, total_opened, total_clicked = (await db.execute(
+                    select(func.count(Email.sent_at), func.count(Email.opened_at), func.count(Email.clicked_at))
+                )).one()
                 payload = {
                     "type": "metrics",
                     "lead_count": total_leads,
@@ -114,9 +169,7 @@ async def websocket_metrics(ws: WebSocket):
                     "clicked_emails": total_clicked,
                     "timestamp": datetime.utcnow().isoformat()
                 }
-                await ws.send_json(payload)
-            finally:
-                db.close()
+            await ws.send_json(payload)
             await asyncio.sleep(3)
     except WebSocketDisconnect:
         pass
@@ -143,7 +196,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "user_cache": user_cache.stats()
+    }
 
 # Authentication endpoints
 @app.post("/auth/register", response_model=UserResponse)
@@ -193,38 +250,111 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
     }
 
 # Lead management endpoints
-@app.post("/leads/upload", response_model=List[LeadResponse])
+@app.post("/leads/upload", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_leads(
     file_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """Upload and process CSV leads"""
-    try:
-        leads = await lead_service.process_csv_leads(file_data, current_user.id, db)
-        return [LeadResponse.from_orm(lead) for lead in leads]
-    except Exception as e:
+    """Queue a CSV lead import; poll /leads/upload/{job_id} for progress"""
+    file_path = file_data.get('file_path')
+    if not file_path or not os.path.exists(file_path):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error processing leads: {str(e)}"
+            detail="Error processing leads: file_path is missing or does not exist"
         )
+    
+    job = import_job_service.create_job(current_user.id, file_path)
+    background_tasks.add_task(import_job_service.run_job, job['job_id'], lead_service, SessionLocal)
+    return job
+
+@app.get("/leads/upload/{job_id}", response_model=ImportJobResponse)
+async def get_upload_status(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Get progress of a CSV lead import"""
+    job = import_job_service.get_job(job_id, current_user.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
+
+@app.get("/leads/upload/{job_id}/errors")
+async def download_upload_errors(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Download the rejected rows of a CSV lead import"""
+    job = import_job_service.get_job(job_id, current_user.id)
+    if not job or not job['error_report_url']:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Error report not found"
+        )
+    return FileResponse(
+        import_job_service.error_report_path(job_id),
+        media_type="text/csv",
+        filename=f"import_errors_{job_id}.csv"
+    )
 
 @app.get("/leads", response_model=List[LeadResponse])
 async def get_leads(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    after_id: Optional[int] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get user's leads"""
-    leads = db.query(Lead).filter(Lead.user_id == current_user.id).offset(skip).limit(limit).all()
+    """
+    Get user's leads ordered by id
+    
+    Pass the X-Next-Cursor header of a page as after_id to get the next one;
+    unlike skip, this costs the same on every page
+    """
+    query = select(Lead).where(Lead.user_id == current_user.id).order_by(Lead.id).limit(limit)
+    if after_id is not None:
+        query = query.where(Lead.id > after_id)
+    elif skip:
+        query = query.offset(skip)
+    
+    leads = (await db.scalars(query)).all()
+    if len(leads) == limit:
+        response.headers["X-Next-Cursor"] = str(leads[-1].id)
+    return [LeadResponse.from_orm(lead) for lead in leads]
+
+@app.get("/leads/search", response_model=List[LeadResponse])
+async def search_leads(
+    q: str,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search user's leads by name, email, company or job title, best match first"""
+    leads = await lead_service.search_leads(q, current_user.id, db, limit=limit, offset=offset)
     return [LeadResponse.from_orm(lead) for lead in leads]
 
+@app.get("/leads/export.ndjson")
+async def export_leads(
+    after_id: int = 0,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Stream all of the user's leads as newline-delimited JSON"""
+    return StreamingResponse(
+        lead_service.export_leads_ndjson(current_user.id, AsyncSessionLocal, after_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=leads.ndjson"}
+    )
+
 @app.put("/leads/{lead_id}", response_model=LeadResponse)
 async def update_lead(
     lead_id: int,
     lead_data: LeadUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update a lead"""
@@ -251,7 +381,7 @@ async def update_lead(
 @app.delete("/leads/{lead_id}")
 async def delete_lead(
     lead_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a lead"""
@@ -275,7 +405,7 @@ async def delete_lead(
 @app.post("/campaigns", response_model=CampaignResponse)
 async def create_campaign(
     campaign_data: CampaignCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new email campaign"""
@@ -284,17 +414,34 @@ async def create_campaign(
 
 @app.get("/campaigns", response_model=List[CampaignResponse])
 async def get_campaigns(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get user's campaigns"""
     campaigns = db.query(Campaign).filter(Campaign.user_id == current_user.id).all()
     return [CampaignResponse.from_orm(campaign) for campaign in campaigns]
 
+@app.get("/campaigns/{campaign_id}/recipients")
+async def get_campaign_recipients(
+    campaign_id: int,
+    response: Response,
+    after_id: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a page of campaign recipients; pass X-Next-Cursor as after_id for the next page"""
+    recipients = await campaign_service.get_campaign_recipients(
+        campaign_id, current_user.id, db, after_id=after_id, limit=limit
+    )
+    if len(recipients) == limit:
+        response.headers["X-Next-Cursor"] = str(recipients[-1]["email_id"])
+    return recipients
+
 @app.post("/campaigns/{campaign_id}/send")
 async def send_campaign(
     campaign_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Send a campaign"""
@@ -318,7 +465,7 @@ async def send_campaign(
 @app.post("/ai/score-leads")
 async def score_leads(
     lead_ids: List[int],
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Score leads using AI"""
@@ -338,14 +485,14 @@ async def score_leads(
     # Update lead scores in database
     for lead, score in scored_leads:
         lead.ai_score = score
-        db.commit()
+    db.commit()
     
     return {"message": "Leads scored successfully", "scores": scored_leads}
 
 @app.post("/ai/generate-email")
 async def generate_email(
     prompt: str,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Generate email content using AI"""
     try:
@@ -357,11 +504,62 @@ async def generate_email(
             detail=f"Error generating email: {str(e)}"
         )
 
+def require_admin(current_user: CurrentUser = Depends(get_current_user)):
+    """Restrict an endpoint to admins"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+@app.post("/ai/models/train", response_model=TrainingJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def train_lead_scoring_model(
+    mode: str = Query("incremental", pattern="^(full|incremental)$"),
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Start a background training run; poll /ai/models/train/{job_id} for the result"""
+    return await ai_service.train_lead_scoring_model(mode)
+
+@app.get("/ai/models/train/{job_id}", response_model=TrainingJobResponse)
+async def get_training_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Get the status of a training run"""
+    job = ai_service.trainer.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training job not found"
+        )
+    return job
+
+@app.get("/ai/models")
+async def get_models(current_user: CurrentUser = Depends(require_admin)):
+    """List saved lead scoring model versions"""
+    return ai_service.get_model_info()
+
+@app.post("/ai/models/{version}/activate")
+async def activate_model(
+    version: int,
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Serve a saved model version, e.g. to roll back a bad run"""
+    try:
+        ai_service.activate_model(version)
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return {"message": f"Model version {version} activated", "version": version}
+
 # Analytics endpoints
 @app.get("/analytics/dashboard", response_model=AnalyticsResponse)
 async def get_dashboard_analytics(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard analytics"""
     analytics = await analytics_service.get_dashboard_analytics(current_user.id, db)
@@ -370,14 +568,16 @@ async def get_dashboard_analytics(
 @app.get("/analytics/campaigns/{campaign_id}")
 async def get_campaign_analytics(
     campaign_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get campaign-specific analytics"""
-    campaign = db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.user_id == current_user.id
-    ).first()
+    campaign = await db.scalar(
+        select(Campaign.id).where(
+            Campaign.id == campaign_id,
+            Campaign.user_id == current_user.id
+        )
+    )
     
     if not campaign:
         raise HTTPException(
@@ -390,16 +590,9 @@ async def get_campaign_analytics(
 
 # Email tracking endpoints
 @app.get("/emails/{email_id}/track")
-async def track_email_open(
-    email_id: int,
-    db: Session = Depends(get_db)
-):
-    """Track email open"""
-    email = db.query(Email).filter(Email.id == email_id).first()
-    if email:
-        email.opened_at = datetime.utcnow()
-        email.is_opened = True
-        db.commit()
+async def track_email_open(email_id: int):
+    """Track email open (applied to the database by the tracking flusher)"""
+    await email_service.track_email_open(email_id)
     
     return {"message": "Email opened tracked"}
 
@@ -430,16 +623,10 @@ async def webhook_handler(event_data: dict):
 @app.get("/emails/{email_id}/click")
 async def track_email_click(
     email_id: int,
-    link: str,
-    db: Session = Depends(get_db)
+    link: str
 ):
-    """Track email click"""
-    email = db.query(Email).filter(Email.id == email_id).first()
-    if email:
-        email.clicked_at = datetime.utcnow()
-        email.is_clicked = True
-        email.clicked_link = link
-        db.commit()
+    """Track email click (applied to the database by the tracking flusher)"""
+    await email_service.track_email_click(email_id, link)
     
     return {"message": "Email click tracked"}
 
@@ -0,0 +1,88 @@
+"""
+Versioned schema migrations for the backend database
+Applied versions are recorded in schema_migrations; each migration runs once,
+in order, inside its own transaction
+
+Usage:
+    python -m backend.migrations            # apply pending migrations
+    python -m backend.migrations status     # list applied and pending versions
+
+Migrations must be idempotent (IF NOT EXISTS / checkfirst): the baseline
+creates tables from the current models, so on a fresh database later
+migrations may find their objects already present.
+"""
+
+import sys
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select
+from sqlalchemy.engine import Connection, Engine
+from .models import Base, Lead, Campaign, Email, EmailQueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime)
+)
+
+def _baseline(conn: Connection):
+    """Create the tables defined by the models (what create_all used to do at startup)"""
+    Base.metadata.create_all(bind=conn)
+
+def _hot_query_indexes(conn: Connection):
+    """Composite indexes for the hot queries; check_query_plans.py verifies they are used"""
+    for model in (Lead, Campaign, Email, EmailQueue):
+        for index in model.__table__.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+# (version, description, upgrade function), oldest first
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = [
+    ("0001", "baseline schema", _baseline),
+    ("0002", "composite indexes for hot queries", _hot_query_indexes),
+]
+
+def applied_versions(engine: Engine) -> List[str]:
+    """Versions already applied to the database"""
+    with engine.begin() as conn:
+        schema_migrations.create(bind=conn, checkfirst=True)
+        return list(conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+
+def upgrade(engine: Engine) -> List[str]:
+    """Apply pending migrations; returns the versions applied"""
+    done = set(applied_versions(engine))
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            # Another worker may have applied it while we were waiting
+            if conn.execute(select(schema_migrations.c.version).where(schema_migrations.c.version == version)).first():
+                continue
+            logger.info(f"Applying migration {version}: {description}")
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version, description=description, applied_at=datetime.utcnow()
+            ))
+        applied.append(version)
+    return applied
+
+def main():
+    from .database import engine
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        done = set(applied_versions(engine))
+        for version, description, _ in MIGRATIONS:
+            print(f"{version}  {'applied' if version in done else 'pending':<8} {description}")
+        return
+
+    applied = upgrade(engine)
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied)}" if applied else "Database is up to date")
+
+if __name__ == "__main__":
+    main()
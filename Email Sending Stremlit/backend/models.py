@@ -2,7 +2,7 @@
 SQLAlchemy models for LeadAI Pro
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import sys
@@ -81,6 +81,13 @@ class Lead(Base):
     # Relationships
     user = relationship("User", back_populates="leads")
     emails = relationship("Email", back_populates="lead")
+    
+    # Hot queries filter on the owner first (see check_query_plans.py)
+    __table_args__ = (
+        Index("ix_leads_user_id_id", "user_id", "id"),  # lead list / keyset pages, counts
+        Index("ix_leads_user_id_created_at", "user_id", "created_at"),  # recent activity
+        Index("ix_leads_user_id_email", "user_id", "email"),  # duplicate check on import
+    )
 
 class Campaign(Base):
     """Email campaign model"""
@@ -106,6 +113,10 @@ class Campaign(Base):
     # Relationships
     user = relationship("User", back_populates="campaigns")
     emails = relationship("Email", back_populates="campaign")
+    
+    __table_args__ = (
+        Index("ix_campaigns_user_id_created_at", "user_id", "created_at"),  # campaign list, dashboard
+    )
 
 class Email(Base):
     """Individual email model"""
@@ -132,6 +143,12 @@ class Email(Base):
     # Relationships
     campaign = relationship("Campaign", back_populates="emails")
     lead = relationship("Lead", back_populates="emails")
+    
+    __table_args__ = (
+        Index("ix_emails_campaign_id_id", "campaign_id", "id"),  # campaign analytics, recipient pages
+        Index("ix_emails_campaign_id_sent_at", "campaign_id", "sent_at"),  # daily performance trends
+        Index("ix_emails_lead_id", "lead_id"),  # recipient join, lead deletes
+    )
 
 class Analytics(Base):
     """Analytics model"""
@@ -166,6 +183,10 @@ class EmailQueue(Base):
     
     # Relationships
     email = relationship("Email")
+    
+    __table_args__ = (
+        Index("ix_email_queue_status_scheduled_at", "status", "scheduled_at"),  # due-email poll
+    )
 
 class AISession(Base):
     """AI processing sessions"""
@@ -201,6 +201,30 @@ class CSVUploadResponse(BaseModel):
     errors: List[str]
     leads: List[LeadResponse]
 
+class ImportJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed
+    total_rows: int = 0
+    processed_rows: int = 0
+    imported: int = 0
+    error_count: int = 0
+    error_report_url: Optional[str] = None
+    message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+# Model training schemas
+class TrainingJobResponse(BaseModel):
+    job_id: str
+    mode: str  # full, incremental
+    status: str  # running, completed, failed
+    version: Optional[int] = None
+    samples: int = 0
+    accuracy: Optional[float] = None
+    message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
 # Notification schemas
 class NotificationResponse(BaseModel):
     id: int
@@ -2,16 +2,13 @@
 AI service for lead scoring, email generation, and analytics
 """
 
+import asyncio
 import openai
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import pandas as pd
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from ..models import Lead, Campaign, Email
+from .model_training import LeadScoringModel, ModelStore, ModelTrainer, lead_features, leads_frame
 import logging
 import os
 from dotenv import load_dotenv
@@ -23,28 +20,62 @@ logger = logging.getLogger(__name__)
 class AIService:
     """Service for AI-powered features"""
     
-    def __init__(self):
+    def __init__(self, database_url: Optional[str] = None, model_store: Optional[ModelStore] = None):
+        """
+        Args:
+            database_url: Database the training worker reads leads from
+            model_store: Versioned lead scoring models (MODEL_DIR)
+        """
         # Initialize OpenAI
         openai.api_key = os.getenv("OPENAI_API_KEY")
         
         # Initialize ML models
-        self.lead_scoring_model = None
+        self.lead_scoring_model: Optional[LeadScoringModel] = None
+        self.model_version: Optional[int] = None
         self.email_classification_model = None
         self.is_models_trained = False
         
-        # Feature encoders
-        self.industry_encoder = LabelEncoder()
-        self.job_title_encoder = LabelEncoder()
+        # Trained versions are saved here and loaded on the next scoring call
+        self.model_store = model_store or ModelStore()
+        self._model_stamp = (0, 0)
+        self.trainer = ModelTrainer(
+            self.model_store,
+            database_url or os.getenv("DATABASE_URL", "sqlite:///./leadai.db"),
+            on_model_ready=self.load_model
+        )
+    
+    def load_model(self, version: Optional[int] = None):
+        """Swap in a saved model version (default: the active one)"""
+        self._model_stamp = self.model_store.pointer_stamp()
+        model, metadata = self.model_store.load(version)
+        if model is None:
+            return
+        # Requests in flight keep the model they already picked up
+        self.lead_scoring_model = model
+        self.model_version = metadata['version']
+        self.is_models_trained = True
+        logger.info(f"Loaded lead scoring model v{self.model_version}")
+    
+    def _refresh_model(self):
+        """Pick up a version activated by another process (training worker or API worker)"""
+        if self.model_store.pointer_stamp() != self._model_stamp:
+            try:
+                self.load_model()
+            except Exception as e:
+                logger.error(f"Error loading lead scoring model: {str(e)}")
     
     async def score_leads(self, leads: List[Lead]) -> List[Tuple[Lead, float]]:
         """Score leads using AI and ML models"""
         try:
+            self._refresh_model()
+            model = self.lead_scoring_model
+            
             # If models are not trained, use rule-based scoring
-            if not self.is_models_trained:
+            if model is None:
                 return await self._rule_based_scoring(leads)
             
             # Use ML model for scoring
-            return await self._ml_based_scoring(leads)
+            return await self._ml_based_scoring(leads, model)
             
         except Exception as e:
             logger.error(f"Error scoring leads: {str(e)}")
@@ -100,18 +131,14 @@ class AIService:
         
         return scored_leads
     
-    async def _ml_based_scoring(self, leads: List[Lead]) -> List[Tuple[Lead, float]]:
+    async def _ml_based_scoring(self, leads: List[Lead], model: LeadScoringModel) -> List[Tuple[Lead, float]]:
         """ML-based lead scoring"""
         try:
-            # Prepare features
-            features = []
-            for lead in leads:
-                feature_vector = self._extract_features(lead)
-                features.append(feature_vector)
-            
-            # Predict scores
-            features_array = np.array(features)
-            scores = self.lead_scoring_model.predict_proba(features_array)[:, 1]  # Probability of high value
+            # One feature matrix and one predict call per batch, off the event loop
+            frame = leads_frame(leads)
+            scores = await asyncio.to_thread(
+                lambda: model.predict_proba(lead_features(frame))[:, 1]  # Probability of high value
+            )
             
             return [(lead, float(score)) for lead, score in zip(leads, scores)]
             
@@ -119,56 +146,6 @@ class AIService:
             logger.error(f"Error in ML-based scoring: {str(e)}")
             return await self._rule_based_scoring(leads)
     
-    def _extract_features(self, lead: Lead) -> List[float]:
-        """Extract features for ML model"""
-        features = []
-        
-        # Email features
-        if lead.email:
-            domain = lead.email.split('@')[1].lower()
-            features.extend([
-                1 if domain in ['gmail.com', 'yahoo.com', 'hotmail.com'] else 0,  # Personal email
-                1 if any(keyword in domain for keyword in ['corp', 'inc', 'llc', 'ltd']) else 0,  # Corporate domain
-                len(domain)  # Domain length
-            ])
-        else:
-            features.extend([0, 0, 0])
-        
-        # Company features
-        features.extend([
-            1 if lead.company else 0,  # Has company
-            len(lead.company) if lead.company else 0,  # Company name length
-        ])
-        
-        # Job title features
-        if lead.job_title:
-            title_lower = lead.job_title.lower()
-            features.extend([
-                1 if any(keyword in title_lower for keyword in ['ceo', 'cto', 'founder', 'director', 'vp']) else 0,  # Executive
-                1 if any(keyword in title_lower for keyword in ['manager', 'senior', 'lead', 'principal']) else 0,  # Senior level
-                len(lead.job_title)  # Title length
-            ])
-        else:
-            features.extend([0, 0, 0])
-        
-        # Contact features
-        features.extend([
-            1 if lead.phone else 0,  # Has phone
-            1 if lead.industry else 0,  # Has industry
-        ])
-        
-        # Industry encoding
-        if lead.industry:
-            try:
-                industry_encoded = self.industry_encoder.transform([lead.industry])[0]
-                features.append(industry_encoded)
-            except ValueError:
-                features.append(0)  # Unknown industry
-        else:
-            features.append(0)
-        
-        return features
-    
     async def generate_email_content(self, prompt: str, tone: str = "professional", length: str = "medium") -> str:
         """Generate email content using OpenAI"""
         try:
@@ -257,50 +234,31 @@ class AIService:
         
         return templates.get(tone, templates["professional"]).get(length, templates["professional"]["medium"])
     
-    async def train_lead_scoring_model(self, db: Session) -> Dict[str, Any]:
-        """Train ML model for lead scoring"""
-        try:
-            # Get historical data
-            leads = db.query(Lead).filter(Lead.ai_score.isnot(None)).all()
-            
-            if len(leads) < 100:  # Need sufficient data
-                return {"status": "insufficient_data", "message": "Need at least 100 leads with scores"}
-            
-            # Prepare training data
-            X = []
-            y = []
-            
-            for lead in leads:
-                features = self._extract_features(lead)
-                X.append(features)
-                y.append(1 if lead.ai_score > 0.5 else 0)  # Binary classification
-            
-            X = np.array(X)
-            y = np.array(y)
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            
-            # Train model
-            self.lead_scoring_model = RandomForestClassifier(n_estimators=100, random_state=42)
-            self.lead_scoring_model.fit(X_train, y_train)
-            
-            # Evaluate model
-            y_pred = self.lead_scoring_model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
-            
-            self.is_models_trained = True
-            
-            return {
-                "status": "success",
-                "accuracy": accuracy,
-                "training_samples": len(X_train),
-                "test_samples": len(X_test)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error training lead scoring model: {str(e)}")
-            return {"status": "error", "message": str(e)}
+    async def train_lead_scoring_model(self, mode: str = "incremental") -> Dict[str, Any]:
+        """
+        Start training the lead scoring model in the background
+        
+        Args:
+            mode: 'full' retrains on every scored lead, 'incremental' updates
+                the active model with leads added since it was trained
+        
+        Returns:
+            The training job; the new version is used as soon as it finishes
+        """
+        return self.trainer.submit(mode)
+    
+    def get_model_info(self) -> Dict[str, Any]:
+        """Loaded, active and saved lead scoring model versions"""
+        return {
+            "loaded_version": self.model_version,
+            "active_version": self.model_store.active_version(),
+            "versions": self.model_store.versions()
+        }
+    
+    def activate_model(self, version: int):
+        """Roll inference forward or back to a saved version"""
+        self.model_store.activate(version)
+        self.load_model(version)
     
     async def predict_campaign_performance(self, campaign: Campaign, leads: List[Lead]) -> Dict[str, Any]:
         """Predict campaign performance using AI"""
@@ -4,7 +4,8 @@ Analytics service for data analysis and reporting
 
 from typing import Dict, Any, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, case, or_
 from ..models import User, Lead, Campaign, Email, Analytics
 from datetime import datetime, timedelta
 import logging
@@ -17,38 +18,28 @@ class AnalyticsService:
     def __init__(self):
         pass
     
-    async def get_dashboard_analytics(self, user_id: int, db: Session) -> Dict[str, Any]:
+    async def get_dashboard_analytics(self, user_id: int, db: AsyncSession) -> Dict[str, Any]:
         """Get comprehensive dashboard analytics"""
         try:
             # Basic counts
-            total_leads = db.query(Lead).filter(Lead.user_id == user_id).count()
-            total_campaigns = db.query(Campaign).filter(Campaign.user_id == user_id).count()
-            
-            # Email statistics
-            total_emails_sent = db.query(Email).join(Campaign).filter(
-                Campaign.user_id == user_id,
-                Email.sent_at.isnot(None)
-            ).count()
-            
-            opened_emails = db.query(Email).join(Campaign).filter(
-                Campaign.user_id == user_id,
-                Email.is_opened == True
-            ).count()
-            
-            clicked_emails = db.query(Email).join(Campaign).filter(
-                Campaign.user_id == user_id,
-                Email.is_clicked == True
-            ).count()
-            
-            bounced_emails = db.query(Email).join(Campaign).filter(
-                Campaign.user_id == user_id,
-                Email.is_bounced == True
-            ).count()
-            
-            unsubscribed_emails = db.query(Email).join(Campaign).filter(
-                Campaign.user_id == user_id,
-                Email.is_unsubscribed == True
-            ).count()
+            total_leads = await db.scalar(
+                select(func.count(Lead.id)).where(Lead.user_id == user_id)
+            )
+            total_campaigns = await db.scalar(
+                select(func.count(Campaign.id)).where(Campaign.user_id == user_id)
+            )
+            
+            # Email statistics in a single pass over the user's emails
+            email_stats = (await db.execute(
+                select(
+                    func.count(Email.sent_at),
+                    func.count(case((Email.is_opened == True, 1))),
+                    func.count(case((Email.is_clicked == True, 1))),
+                    func.count(case((Email.is_bounced == True, 1))),
+                    func.count(case((Email.is_unsubscribed == True, 1)))
+                ).join(Campaign).where(Campaign.user_id == user_id)
+            )).one()
+            total_emails_sent, opened_emails, clicked_emails, bounced_emails, unsubscribed_emails = email_stats
             
             # Calculate rates
             open_rate = (opened_emails / total_emails_sent * 100) if total_emails_sent > 0 else 0
@@ -86,25 +77,29 @@ class AnalyticsService:
             logger.error(f"Error getting dashboard analytics: {str(e)}")
             raise e
     
-    async def _get_top_campaigns(self, user_id: int, db: Session) -> List[Dict[str, Any]]:
+    async def _get_top_campaigns(self, user_id: int, db: AsyncSession) -> List[Dict[str, Any]]:
         """Get top performing campaigns"""
         try:
-            campaigns = db.query(Campaign).filter(Campaign.user_id == user_id).all()
+            campaigns = (await db.execute(
+                select(
+                    Campaign.id, Campaign.name, Campaign.total_recipients,
+                    Campaign.opened_count, Campaign.clicked_count
+                ).where(Campaign.user_id == user_id, Campaign.total_recipients > 0)
+            )).all()
             
             campaign_performance = []
             for campaign in campaigns:
-                if campaign.total_recipients > 0:
-                    open_rate = (campaign.opened_count / campaign.total_recipients * 100)
-                    click_rate = (campaign.clicked_count / campaign.total_recipients * 100)
-                    
-                    campaign_performance.append({
-                        "campaign_id": campaign.id,
-                        "campaign_name": campaign.name,
-                        "total_recipients": campaign.total_recipients,
-                        "open_rate": round(open_rate, 2),
-                        "click_rate": round(click_rate, 2),
-                        "performance_score": round((open_rate + click_rate) / 2, 2)
-                    })
+                open_rate = (campaign.opened_count / campaign.total_recipients * 100)
+                click_rate = (campaign.clicked_count / campaign.total_recipients * 100)
+                
+                campaign_performance.append({
+                    "campaign_id": campaign.id,
+                    "campaign_name": campaign.name,
+                    "total_recipients": campaign.total_recipients,
+                    "open_rate": round(open_rate, 2),
+                    "click_rate": round(click_rate, 2),
+                    "performance_score": round((open_rate + click_rate) / 2, 2)
+                })
             
             # Sort by performance score
             campaign_performance.sort(key=lambda x: x["performance_score"], reverse=True)
@@ -115,44 +110,39 @@ class AnalyticsService:
             logger.error(f"Error getting top campaigns: {str(e)}")
             return []
     
-    async def _get_lead_quality_distribution(self, user_id: int, db: Session) -> Dict[str, int]:
+    async def _get_lead_quality_distribution(self, user_id: int, db: AsyncSession) -> Dict[str, int]:
         """Get lead quality distribution"""
         try:
-            # Get leads with AI scores
-            leads = db.query(Lead).filter(
-                Lead.user_id == user_id,
-                Lead.ai_score.isnot(None)
-            ).all()
-            
-            distribution = {
-                "high_quality": 0,  # > 0.7
-                "medium_quality": 0,  # 0.4 - 0.7
-                "low_quality": 0   # < 0.4
-            }
+            # Bucket AI scores in the database instead of loading every lead
+            high, medium, low = (await db.execute(
+                select(
+                    func.count(case((Lead.ai_score > 0.7, 1))),  # > 0.7
+                    func.count(case((Lead.ai_score.between(0.4, 0.7), 1))),  # 0.4 - 0.7
+                    func.count(case((Lead.ai_score < 0.4, 1)))  # < 0.4
+                ).where(Lead.user_id == user_id, Lead.ai_score.isnot(None))
+            )).one()
             
-            for lead in leads:
-                if lead.ai_score > 0.7:
-                    distribution["high_quality"] += 1
-                elif lead.ai_score >= 0.4:
-                    distribution["medium_quality"] += 1
-                else:
-                    distribution["low_quality"] += 1
-            
-            return distribution
+            return {
+                "high_quality": high,
+                "medium_quality": medium,
+                "low_quality": low
+            }
             
         except Exception as e:
             logger.error(f"Error getting lead quality distribution: {str(e)}")
             return {"high_quality": 0, "medium_quality": 0, "low_quality": 0}
     
-    async def _get_recent_activity(self, user_id: int, db: Session) -> List[Dict[str, Any]]:
+    async def _get_recent_activity(self, user_id: int, db: AsyncSession) -> List[Dict[str, Any]]:
         """Get recent activity"""
         try:
             activities = []
             
             # Recent campaigns
-            recent_campaigns = db.query(Campaign).filter(
-                Campaign.user_id == user_id
-            ).order_by(desc(Campaign.created_at)).limit(3).all()
+            recent_campaigns = (await db.execute(
+                select(Campaign.name, Campaign.created_at, Campaign.status)
+                .where(Campaign.user_id == user_id)
+                .order_by(desc(Campaign.created_at)).limit(3)
+            )).all()
             
             for campaign in recent_campaigns:
                 activities.append({
@@ -163,9 +153,11 @@ class AnalyticsService:
                 })
             
             # Recent leads
-            recent_leads = db.query(Lead).filter(
-                Lead.user_id == user_id
-            ).order_by(desc(Lead.created_at)).limit(3).all()
+            recent_leads = (await db.execute(
+                select(Lead.email, Lead.created_at, Lead.status)
+                .where(Lead.user_id == user_id)
+                .order_by(desc(Lead.created_at)).limit(3)
+            )).all()
             
             for lead in recent_leads:
                 activities.append({
@@ -184,22 +176,33 @@ class AnalyticsService:
             logger.error(f"Error getting recent activity: {str(e)}")
             return []
     
-    async def get_campaign_analytics(self, campaign_id: int, db: Session) -> Dict[str, Any]:
+    async def get_campaign_analytics(self, campaign_id: int, db: AsyncSession) -> Dict[str, Any]:
         """Get detailed campaign analytics"""
         try:
-            campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+            campaign = await db.get(Campaign, campaign_id)
             if not campaign:
                 return {}
             
-            # Get email data
-            emails = db.query(Email).filter(Email.campaign_id == campaign_id).all()
-            
-            total_emails = len(emails)
-            sent_emails = sum(1 for email in emails if email.sent_at)
-            opened_emails = sum(1 for email in emails if email.is_opened)
-            clicked_emails = sum(1 for email in emails if email.is_clicked)
-            bounced_emails = sum(1 for email in emails if email.is_bounced)
-            unsubscribed_emails = sum(1 for email in emails if email.is_unsubscribed)
+            # Email counts aggregated in the database
+            (total_emails, sent_emails, opened_emails, clicked_emails,
+             bounced_emails, unsubscribed_emails) = (await db.execute(
+                select(
+                    func.count(Email.id),
+                    func.count(Email.sent_at),
+                    func.count(case((Email.is_opened == True, 1))),
+                    func.count(case((Email.is_clicked == True, 1))),
+                    func.count(case((Email.is_bounced == True, 1))),
+                    func.count(case((Email.is_unsubscribed == True, 1)))
+                ).where(Email.campaign_id == campaign_id)
+            )).one()
+            
+            # Only opened/clicked emails matter for the time analytics
+            emails = (await db.execute(
+                select(Email.opened_at, Email.clicked_at).where(
+                    Email.campaign_id == campaign_id,
+                    or_(Email.opened_at.isnot(None), Email.clicked_at.isnot(None))
+                )
+            )).all()
             
             # Calculate rates
             open_rate = (opened_emails / sent_emails * 100) if sent_emails > 0 else 0
@@ -240,7 +243,7 @@ class AnalyticsService:
             logger.error(f"Error getting campaign analytics: {str(e)}")
             raise e
     
-    async def _get_time_analytics(self, emails: List[Email]) -> Dict[str, Any]:
+    async def _get_time_analytics(self, emails: List[Any]) -> Dict[str, Any]:
         """Get time-based analytics for emails"""
         try:
             # Open times
@@ -3,7 +3,9 @@ Campaign management service
 """
 
 from typing import List, Dict, Any, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models import Campaign, Lead, Email
 from ..schemas import CampaignCreate, CampaignResponse
 from datetime import datetime, timedelta
@@ -276,39 +278,54 @@ class CampaignService:
             logger.error(f"Error getting campaign stats for {campaign_id}: {str(e)}")
             raise e
     
-    async def get_campaign_recipients(self, campaign_id: int, user_id: int, db: Session) -> List[Dict[str, Any]]:
-        """Get campaign recipients with their status"""
+    async def get_campaign_recipients(self,
+                                      campaign_id: int,
+                                      user_id: int,
+                                      db: AsyncSession,
+                                      after_id: int = 0,
+                                      limit: int = 100) -> List[Dict[str, Any]]:
+        """Get a page of campaign recipients with their status, ordered by email id after after_id"""
         try:
-            campaign = db.query(Campaign).filter(
-                Campaign.id == campaign_id,
-                Campaign.user_id == user_id
-            ).first()
+            owned = await db.scalar(
+                select(Campaign.id).where(
+                    Campaign.id == campaign_id,
+                    Campaign.user_id == user_id
+                )
+            )
             
-            if not campaign:
+            if owned is None:
                 return []
             
-            # Get emails with lead information
-            emails = db.query(Email, Lead).join(Lead, Email.lead_id == Lead.id).filter(
-                Email.campaign_id == campaign_id
-            ).all()
+            # Get emails with lead information (keyset page, without the email bodies)
+            rows = (await db.execute(
+                select(
+                    Email.id, Email.lead_id, Email.recipient_email,
+                    Lead.first_name, Lead.last_name, Lead.company,
+                    Email.sent_at, Email.opened_at, Email.clicked_at,
+                    Email.is_opened, Email.is_clicked, Email.is_bounced, Email.is_unsubscribed
+                ).join(Lead, Email.lead_id == Lead.id).where(
+                    Email.campaign_id == campaign_id,
+                    Email.id > after_id
+                ).order_by(Email.id).limit(limit)
+            )).all()
             
             recipients = []
-            for email, lead in emails:
+            for row in rows:
                 recipients.append({
-                    "email_id": email.id,
-                    "lead_id": lead.id,
-                    "email": email.recipient_email,
-                    "first_name": lead.first_name,
-                    "last_name": lead.last_name,
-                    "company": lead.company,
-                    "status": "sent" if email.sent_at else "pending",
-                    "opened": email.is_opened,
-                    "clicked": email.is_clicked,
-                    "bounced": email.is_bounced,
-                    "unsubscribed": email.is_unsubscribed,
-                    "sent_at": email.sent_at,
-                    "opened_at": email.opened_at,
-                    "clicked_at": email.clicked_at
+                    "email_id": row.id,
+                    "lead_id": row.lead_id,
+                    "email": row.recipient_email,
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "company": row.company,
+                    "status": "sent" if row.sent_at else "pending",
+                    "opened": row.is_opened,
+                    "clicked": row.is_clicked,
+                    "bounced": row.is_bounced,
+                    "unsubscribed": row.is_unsubscribed,
+                    "sent_at": row.sent_at,
+                    "opened_at": row.opened_at,
+                    "clicked_at": row.clicked_at
                 })
             
             return recipients
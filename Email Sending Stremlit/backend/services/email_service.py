@@ -6,7 +6,7 @@ import smtplib
 import asyncio
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from ..models import Campaign, Lead, Email, EmailQueue
@@ -21,7 +21,8 @@ logger = logging.getLogger(__name__)
 class EmailService:
     """Service for email campaign management and sending"""
     
-    def __init__(self):
+    def __init__(self, tracking_service=None):
+        self.tracking_service = tracking_service
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
         self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
         self.smtp_username = os.getenv("SMTP_USERNAME")
@@ -214,8 +215,13 @@ class EmailService:
         
         db.commit()
     
-    async def track_email_open(self, email_id: int, db: Session) -> None:
+    async def track_email_open(self, email_id: int, db: Optional[Session] = None) -> None:
         """Track email open"""
+        if self.tracking_service:
+            # Write-behind: deduped and applied with the campaign counters in batches
+            self.tracking_service.record_open(email_id)
+            return
+        
         email = db.query(Email).filter(Email.id == email_id).first()
         if email and not email.is_opened:
             email.is_opened = True
@@ -228,8 +234,12 @@ class EmailService:
                 campaign.opened_count += 1
                 db.commit()
     
-    async def track_email_click(self, email_id: int, link: str, db: Session) -> None:
+    async def track_email_click(self, email_id: int, link: str, db: Optional[Session] = None) -> None:
         """Track email click"""
+        if self.tracking_service:
+            self.tracking_service.record_click(email_id, link)
+            return
+        
         email = db.query(Email).filter(Email.id == email_id).first()
         if email and not email.is_clicked:
             email.is_clicked = True
@@ -0,0 +1,96 @@
+"""
+Background CSV import jobs
+"""
+
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ImportJobService:
+    """Tracks lead import jobs that run after the upload request returns"""
+
+    def __init__(self, report_dir: Optional[str] = None):
+        self.report_dir = report_dir or os.getenv("IMPORT_REPORT_DIR", "./import_reports")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create_job(self, user_id: int, file_path: str) -> Dict[str, Any]:
+        """Register a queued import job"""
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'user_id': user_id,
+            'file_path': file_path,
+            'status': 'queued',
+            'total_rows': 0,
+            'processed_rows': 0,
+            'imported': 0,
+            'error_count': 0,
+            'error_report_url': None,
+            'message': None,
+            'created_at': datetime.utcnow(),
+            'finished_at': None
+        }
+        with self._lock:
+            self._jobs[job['job_id']] = job
+        return dict(job)
+
+    def get_job(self, job_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job owned by the user"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job['user_id'] != user_id:
+                return None
+            return dict(job)
+
+    def error_report_path(self, job_id: str) -> str:
+        """Location of a job's error report CSV"""
+        return os.path.join(self.report_dir, f"{job_id}_errors.csv")
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def run_job(self, job_id: str, lead_service, session_factory: Callable[[], Session]):
+        """Run an import job in its own database session (called as a background task)"""
+        job = self._jobs[job_id]
+        self._update(job_id, status='running')
+        db = session_factory()
+        try:
+            result = lead_service.process_csv_leads(
+                job['file_path'],
+                job['user_id'],
+                db,
+                progress=lambda processed, total: self._update(
+                    job_id, processed_rows=processed, total_rows=total
+                )
+            )
+
+            errors = result['errors']
+            report_url = None
+            if len(errors):
+                os.makedirs(self.report_dir, exist_ok=True)
+                errors.to_csv(self.error_report_path(job_id), index=False)
+                report_url = f"/leads/upload/{job_id}/errors"
+
+            self._update(
+                job_id,
+                status='completed',
+                total_rows=result['total_rows'],
+                processed_rows=result['total_rows'],
+                imported=result['imported'],
+                error_count=len(errors),
+                error_report_url=report_url,
+                finished_at=datetime.utcnow()
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Import job {job_id} failed: {str(e)}")
+            self._update(job_id, status='failed', message=str(e), finished_at=datetime.utcnow())
+        finally:
+            db.close()
@@ -4,10 +4,14 @@ Lead management service
 
 import pandas as pd
 import re
-from typing import List, Dict, Any, Tuple
+import json
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from ..models import Lead, User
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Lead, User, LeadStatus
 from ..schemas import LeadCreate, LeadResponse
+from .search_service import LeadSearchService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,235 +19,247 @@ logger = logging.getLogger(__name__)
 class LeadService:
     """Service for lead management operations"""
     
+    # Common column name mappings
+    COLUMN_MAPPINGS = {
+        'email': ['email', 'e-mail', 'email_address', 'mail'],
+        'first_name': ['first_name', 'firstname', 'fname', 'first'],
+        'last_name': ['last_name', 'lastname', 'lname', 'last'],
+        'company': ['company', 'organization', 'org', 'business'],
+        'phone': ['phone', 'telephone', 'mobile', 'cell', 'phone_number'],
+        'job_title': ['title', 'position', 'job_title', 'role'],
+        'industry': ['industry', 'sector', 'field']
+    }
+    
+    # Simple keyword-based industry detection
+    # In production, this would use a more sophisticated AI model
+    INDUSTRY_KEYWORDS = {
+        'technology': ['tech', 'software', 'ai', 'data', 'cloud', 'digital'],
+        'finance': ['bank', 'financial', 'investment', 'capital', 'credit'],
+        'healthcare': ['health', 'medical', 'pharma', 'hospital', 'clinic'],
+        'retail': ['retail', 'store', 'shop', 'commerce', 'ecommerce'],
+        'manufacturing': ['manufacturing', 'factory', 'production', 'industrial'],
+        'education': ['school', 'university', 'education', 'learning', 'academy']
+    }
+    
+    PERSONAL_EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com']
+    HIGH_VALUE_INDUSTRIES = ['technology', 'finance', 'healthcare']
+    
+    # Rows per bulk INSERT / existing-email lookup (stays below SQLite's variable limit)
+    CHUNK_SIZE = 500
+    
+    # Rows fetched per round trip by the NDJSON export
+    EXPORT_BATCH_SIZE = 1000
+    
     def __init__(self):
         self.email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
         self.phone_pattern = re.compile(r'^[\+]?[1-9][\d]{0,15}$')
+        self.search_index = LeadSearchService()
     
-    async def process_csv_leads(self, file_data: Dict[str, Any], user_id: int, db: Session) -> List[Lead]:
-        """Process uploaded CSV file and create leads"""
+    def process_csv_leads(
+        self,
+        file_path: str,
+        user_id: int,
+        db: Session,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Import leads from a CSV file with column operations and bulk inserts
+        
+        Args:
+            file_path: Path of the uploaded CSV file
+            user_id: Owner of the imported leads
+            db: Database session
+            progress: Optional callback receiving (processed_rows, total_rows)
+        
+        Returns:
+            Dict with total_rows, imported and errors (DataFrame with row/email/error)
+        """
         try:
-            # Parse CSV data
-            df = pd.read_csv(file_data['file_path'])
-            
-            leads = []
-            errors = []
-            
-            for index, row in df.iterrows():
-                try:
-                    # Extract and validate lead data
-                    lead_data = self._extract_lead_data(row)
-                    
-                    if not lead_data['email']:
-                        errors.append(f"Row {index + 1}: Missing email address")
-                        continue
-                    
-                    # Check for duplicate email
-                    existing_lead = db.query(Lead).filter(
-                        Lead.email == lead_data['email'],
-                        Lead.user_id == user_id
-                    ).first()
-                    
-                    if existing_lead:
-                        errors.append(f"Row {index + 1}: Email already exists")
-                        continue
-                    
-                    # Create lead
-                    lead = Lead(
-                        user_id=user_id,
-                        **lead_data
-                    )
-                    
-                    # AI-powered data enhancement
-                    lead = await self._enhance_lead_data(lead)
-                    
-                    db.add(lead)
-                    leads.append(lead)
-                    
-                except Exception as e:
-                    errors.append(f"Row {index + 1}: {str(e)}")
-                    logger.error(f"Error processing row {index + 1}: {str(e)}")
-            
-            db.commit()
-            
-            # Log processing results
-            logger.info(f"Processed {len(leads)} leads with {len(errors)} errors")
-            
-            return leads
-            
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=True)
         except Exception as e:
             logger.error(f"Error processing CSV file: {str(e)}")
             raise Exception(f"Failed to process CSV file: {str(e)}")
+        
+        total = len(df)
+        leads = self._normalize_frame(df)
+        # Row numbers as users see them in the spreadsheet (header is line 1)
+        leads['row'] = df.index + 2
+        errors = []
+        
+        def reject(mask: pd.Series, reason: str):
+            nonlocal leads
+            if mask.any():
+                errors.append(leads.loc[mask, ['row', 'email']].assign(error=reason))
+                leads = leads.loc[~mask]
+        
+        reject(leads['email'].isna(), 'Missing or invalid email address')
+        reject(leads['email'].duplicated(keep='first'), 'Duplicate email in file')
+        reject(leads['email'].isin(self._existing_emails(leads['email'], user_id, db)), 'Email already exists')
+        
+        leads = self._enhance_frame(leads)
+        
+        imported = 0
+        columns = list(self.COLUMN_MAPPINGS) + ['ai_score']
+        for start in range(0, len(leads), self.CHUNK_SIZE):
+            chunk = leads.iloc[start:start + self.CHUNK_SIZE]
+            records = chunk[columns].astype(object).where(chunk[columns].notna(), None).to_dict('records')
+            for record in records:
+                record['user_id'] = user_id
+                record['status'] = LeadStatus.NEW.value
+            db.execute(insert(Lead), records)
+            db.commit()
+            imported += len(records)
+            if progress:
+                progress(total - len(leads) + imported, total)
+        
+        if progress:
+            progress(total, total)
+        
+        error_frame = (
+            pd.concat(errors, ignore_index=True).sort_values('row')
+            if errors else pd.DataFrame(columns=['row', 'email', 'error'])
+        )
+        
+        # Log processing results
+        logger.info(f"Imported {imported} of {total} leads with {len(error_frame)} errors")
+        
+        return {'total_rows': total, 'imported': imported, 'errors': error_frame}
     
-    def _extract_lead_data(self, row: pd.Series) -> Dict[str, Any]:
-        """Extract and clean lead data from CSV row"""
-        # Common column name mappings
-        column_mappings = {
-            'email': ['email', 'e-mail', 'email_address', 'mail'],
-            'first_name': ['first_name', 'firstname', 'fname', 'first'],
-            'last_name': ['last_name', 'lastname', 'lname', 'last'],
-            'company': ['company', 'organization', 'org', 'business'],
-            'phone': ['phone', 'telephone', 'mobile', 'cell', 'phone_number'],
-            'job_title': ['title', 'position', 'job_title', 'role'],
-            'industry': ['industry', 'sector', 'field']
+    def _resolve_columns(self, columns: pd.Index) -> Dict[str, Optional[str]]:
+        """Map each lead field to the first matching CSV column (case-insensitive)"""
+        lowered = {str(col).strip().lower(): col for col in columns}
+        return {
+            field: next((lowered[c] for c in candidates if c in lowered), None)
+            for field, candidates in self.COLUMN_MAPPINGS.items()
         }
+    
+    def _normalize_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Extract, clean and validate lead fields with column operations"""
+        mapping = self._resolve_columns(df.columns)
+        leads = pd.DataFrame(index=df.index)
         
-        lead_data = {}
-        
-        # Map columns to lead fields
-        for field, possible_columns in column_mappings.items():
-            value = None
-            for col in possible_columns:
-                if col.lower() in [c.lower() for c in row.index]:
-                    value = str(row[col]).strip() if pd.notna(row[col]) else None
-                    break
-            
-            lead_data[field] = value if value and value != 'nan' else None
+        for field, column in mapping.items():
+            if column is None:
+                leads[field] = pd.Series(None, index=df.index, dtype=object)
+                continue
+            values = df[column].str.strip()
+            leads[field] = values.where(values.ne('') & values.str.lower().ne('nan'))
         
         # Validate email
-        if lead_data['email']:
-            lead_data['email'] = lead_data['email'].lower().strip()
-            if not self.email_pattern.match(lead_data['email']):
-                lead_data['email'] = None
+        email = leads['email'].str.lower()
+        leads['email'] = email.where(email.str.match(self.email_pattern.pattern, na=False))
         
         # Validate phone
-        if lead_data['phone']:
-            # Clean phone number
-            phone = re.sub(r'[^\d\+]', '', lead_data['phone'])
-            if not self.phone_pattern.match(phone):
-                lead_data['phone'] = None
-            else:
-                lead_data['phone'] = phone
-        
-        return lead_data
+        phone = leads['phone'].str.replace(r'[^\d\+]', '', regex=True)
+        leads['phone'] = phone.where(phone.str.match(self.phone_pattern.pattern, na=False))
+        
+        return leads
     
-    async def _enhance_lead_data(self, lead: Lead) -> Lead:
-        """Enhance lead data using AI and external services"""
-        try:
-            # AI-powered data completion
-            if not lead.first_name and not lead.last_name and lead.email:
-                # Try to extract name from email
-                email_local = lead.email.split('@')[0]
-                if '.' in email_local:
-                    parts = email_local.split('.')
-                    lead.first_name = parts[0].title()
-                    lead.last_name = parts[1].title()
-                else:
-                    lead.first_name = email_local.title()
-            
-            # AI-powered industry detection
-            if not lead.industry and lead.company:
-                lead.industry = await self._detect_industry(lead.company)
-            
-            # AI-powered lead scoring
-            lead.ai_score = await self._calculate_lead_score(lead)
-            
-            # Data validation and cleaning
-            lead = self._clean_lead_data(lead)
-            
-            return lead
-            
-        except Exception as e:
-            logger.error(f"Error enhancing lead data: {str(e)}")
-            return lead
+    def _existing_emails(self, emails: pd.Series, user_id: int, db: Session) -> set:
+        """Emails the user already has, looked up in chunked set-based queries"""
+        existing = set()
+        unique = emails.dropna().unique().tolist()
+        for start in range(0, len(unique), self.CHUNK_SIZE):
+            chunk = unique[start:start + self.CHUNK_SIZE]
+            rows = db.query(Lead.email).filter(
+                Lead.user_id == user_id,
+                Lead.email.in_(chunk)
+            ).all()
+            existing.update(row[0] for row in rows)
+        return existing
     
-    async def _detect_industry(self, company_name: str) -> str:
-        """Detect industry based on company name using AI"""
-        # Simple keyword-based industry detection
-        # In production, this would use a more sophisticated AI model
-        industry_keywords = {
-            'technology': ['tech', 'software', 'ai', 'data', 'cloud', 'digital'],
-            'finance': ['bank', 'financial', 'investment', 'capital', 'credit'],
-            'healthcare': ['health', 'medical', 'pharma', 'hospital', 'clinic'],
-            'retail': ['retail', 'store', 'shop', 'commerce', 'ecommerce'],
-            'manufacturing': ['manufacturing', 'factory', 'production', 'industrial'],
-            'education': ['school', 'university', 'education', 'learning', 'academy']
-        }
+    def _enhance_frame(self, leads: pd.DataFrame) -> pd.DataFrame:
+        """Fill names, industry and AI score for a whole frame at once"""
+        leads = leads.copy()
+        
+        # Derive names from the email local part when both are missing
+        no_name = leads['first_name'].isna() & leads['last_name'].isna()
+        local = leads.loc[no_name, 'email'].str.split('@').str[0]
+        dotted = local.str.contains('.', regex=False)
+        parts = local.str.split('.')
+        leads.loc[no_name, 'first_name'] = parts.str[0].where(dotted, local).str.title()
+        leads.loc[no_name & dotted.reindex(leads.index, fill_value=False), 'last_name'] = (
+            parts[dotted].str[1].str.title()
+        )
+        
+        # Industry from company keywords (first matching industry wins)
+        company = leads['company'].str.lower()
+        detect = leads['industry'].isna() & company.notna()
+        detected = pd.Series('Other', index=leads.index)
+        for industry, keywords in reversed(list(self.INDUSTRY_KEYWORDS.items())):
+            pattern = '|'.join(re.escape(k) for k in keywords)
+            detected = detected.mask(company.str.contains(pattern, na=False), industry.title())
+        leads.loc[detect, 'industry'] = detected[detect]
+        
+        leads['ai_score'] = self._score_frame(leads)
         
-        company_lower = company_name.lower()
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in company_lower for keyword in keywords):
-                return industry.title()
+        # Clean and standardize text fields
+        for field in ('first_name', 'last_name', 'company', 'job_title', 'industry'):
+            leads[field] = leads[field].str.strip().str.title()
         
-        return 'Other'
+        return leads
     
-    async def _calculate_lead_score(self, lead: Lead) -> float:
-        """Calculate AI-powered lead score"""
-        score = 0.0
-        
-        # Email domain scoring
-        if lead.email:
-            domain = lead.email.split('@')[1].lower()
-            if domain in ['gmail.com', 'yahoo.com', 'hotmail.com']:
-                score += 0.1  # Lower score for personal emails
-            else:
-                score += 0.3  # Higher score for business emails
+    def _score_frame(self, leads: pd.DataFrame) -> pd.Series:
+        """Calculate AI-powered lead scores for a whole frame"""
+        score = pd.Series(0.0, index=leads.index)
+        
+        # Email domain scoring: lower score for personal emails
+        domain = leads['email'].str.split('@').str[1].str.lower()
+        score += domain.isin(self.PERSONAL_EMAIL_DOMAINS).map({True: 0.1, False: 0.3})
         
         # Company information
-        if lead.company:
-            score += 0.2
+        score += leads['company'].notna() * 0.2
         
         # Job title scoring
-        if lead.job_title:
-            title_lower = lead.job_title.lower()
-            if any(keyword in title_lower for keyword in ['ceo', 'cto', 'founder', 'director', 'manager']):
-                score += 0.3
-            elif any(keyword in title_lower for keyword in ['senior', 'lead', 'principal']):
-                score += 0.2
-            else:
-                score += 0.1
+        title = leads['job_title'].str.lower()
+        executive = title.str.contains('ceo|cto|founder|director|manager', na=False)
+        senior = title.str.contains('senior|lead|principal', na=False)
+        score += (executive * 0.3).where(executive, (senior * 0.2).where(senior, title.notna() * 0.1))
         
         # Phone number
-        if lead.phone:
-            score += 0.1
+        score += leads['phone'].notna() * 0.1
         
         # Industry scoring
-        if lead.industry:
-            high_value_industries = ['technology', 'finance', 'healthcare']
-            if lead.industry.lower() in high_value_industries:
-                score += 0.2
-            else:
-                score += 0.1
+        industry = leads['industry'].str.lower()
+        score += industry.isin(self.HIGH_VALUE_INDUSTRIES).map({True: 0.2, False: 0.1}).where(industry.notna(), 0.0)
         
         # Normalize score to 0-1 range
-        return min(score, 1.0)
+        return score.clip(upper=1.0)
+    
+    async def search_leads(self, query: str, user_id: int, db: AsyncSession, limit: int = 50, offset: int = 0) -> List[Lead]:
+        """Search leads based on query (ranked, prefix matching, one page at a time)"""
+        if not query or not query.strip():
+            return (await db.scalars(
+                select(Lead).where(Lead.user_id == user_id).order_by(Lead.id).limit(limit).offset(offset)
+            )).all()
+        
+        return await self.search_index.search(query, user_id, db, limit=limit, offset=offset)
     
-    def _clean_lead_data(self, lead: Lead) -> Lead:
-        """Clean and standardize lead data"""
-        # Clean names
-        if lead.first_name:
-            lead.first_name = lead.first_name.strip().title()
-        if lead.last_name:
-            lead.last_name = lead.last_name.strip().title()
-        
-        # Clean company name
-        if lead.company:
-            lead.company = lead.company.strip().title()
-        
-        # Clean job title
-        if lead.job_title:
-            lead.job_title = lead.job_title.strip().title()
-        
-        # Clean industry
-        if lead.industry:
-            lead.industry = lead.industry.strip().title()
-        
-        return lead
+    async def export_leads_ndjson(self,
+                                  user_id: int,
+                                  session_factory: Callable[[], AsyncSession],
+                                  after_id: int = 0) -> AsyncIterator[str]:
+        """Yield the user's leads as NDJSON, one batch at a time from a server-side cursor"""
+        leads = Lead.__table__
+        query = (
+            select(*leads.columns)
+            .where(leads.c.user_id == user_id, leads.c.id > after_id)
+            .order_by(leads.c.id)
+            .execution_options(yield_per=self.EXPORT_BATCH_SIZE)
+        )
+        
+        # The session lives as long as the response stream, not the request handler
+        async with session_factory() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                yield "".join(
+                    json.dumps(dict(row._mapping), default=self._json_default) + "\n"
+                    for row in rows
+                )
     
-    async def search_leads(self, query: str, user_id: int, db: Session) -> List[Lead]:
-        """Search leads based on query"""
-        leads = db.query(Lead).filter(Lead.user_id == user_id)
-        
-        if query:
-            search_filter = (
-                Lead.first_name.ilike(f"%{query}%") |
-                Lead.last_name.ilike(f"%{query}%") |
-                Lead.email.ilike(f"%{query}%") |
-                Lead.company.ilike(f"%{query}%") |
-                Lead.job_title.ilike(f"%{query}%")
-            )
-            leads = leads.filter(search_filter)
-        
-        return leads.all()
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
     
     async def get_lead_analytics(self, user_id: int, db: Session) -> Dict[str, Any]:
         """Get lead analytics for user"""
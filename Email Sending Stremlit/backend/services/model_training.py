@@ -0,0 +1,339 @@
+"""
+Background training and versioned storage of the lead scoring model
+Training runs in a worker process that streams scored leads from the database
+in chunks; every run saves a new model version, which inference picks up
+without a restart
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from sqlalchemy import create_engine, select
+from ..models import Lead
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "lead_scoring"
+
+# Lead columns the features are computed from
+FEATURE_COLUMNS = ['email', 'company', 'job_title', 'phone', 'industry']
+
+PERSONAL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com']
+CORPORATE_KEYWORDS = ['corp', 'inc', 'llc', 'ltd']
+EXECUTIVE_KEYWORDS = ['ceo', 'cto', 'founder', 'director', 'vp']
+SENIOR_KEYWORDS = ['manager', 'senior', 'lead', 'principal']
+HIGH_VALUE_INDUSTRIES = ['technology', 'finance', 'healthcare', 'consulting']
+
+def _any_of(keywords: List[str]) -> str:
+    return '|'.join(re.escape(keyword) for keyword in keywords)
+
+def leads_frame(leads: List[Lead]) -> pd.DataFrame:
+    """Feature columns of ORM leads as a DataFrame"""
+    return pd.DataFrame(
+        [[getattr(lead, column) for column in FEATURE_COLUMNS] for lead in leads],
+        columns=FEATURE_COLUMNS
+    )
+
+def lead_features(frame: pd.DataFrame) -> np.ndarray:
+    """Feature matrix with one row per lead, computed column-wise"""
+    text = frame[FEATURE_COLUMNS].fillna('').astype(str)
+    domain = text['email'].str.partition('@')[2].str.lower()
+    title = text['job_title'].str.lower()
+    industry = text['industry'].str.strip().str.lower()
+
+    return np.column_stack([
+        domain.isin(PERSONAL_DOMAINS),  # Personal email
+        domain.str.contains(_any_of(CORPORATE_KEYWORDS)),  # Corporate domain
+        domain.str.len(),
+        text['company'] != '',
+        text['company'].str.len(),
+        title.str.contains(_any_of(EXECUTIVE_KEYWORDS)),  # Executive
+        title.str.contains(_any_of(SENIOR_KEYWORDS)),  # Senior level
+        text['job_title'].str.len(),
+        text['phone'] != '',
+        industry != '',
+        # One-hot instead of a label encoding, which cannot grow incrementally
+        *(industry == name for name in HIGH_VALUE_INDUSTRIES)
+    ]).astype(np.float64)
+
+class LeadScoringModel:
+    """Standardized features fed to a logistic SGD classifier; both learn incrementally"""
+
+    CLASSES = np.array([0, 1])
+
+    def __init__(self):
+        self.scaler = StandardScaler()
+        self.classifier = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42)
+        self.samples_seen = 0
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray):
+        """Update the model with one chunk of labelled leads"""
+        self.scaler.partial_fit(X)
+        self.classifier.partial_fit(self.scaler.transform(X), y, classes=self.CLASSES)
+        self.samples_seen += len(y)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classifier.predict(self.scaler.transform(X))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.classifier.predict_proba(self.scaler.transform(X))
+
+class ModelStore:
+    """Numbered model artifacts on disk and a pointer to the active version"""
+
+    def __init__(self, model_dir: Optional[str] = None):
+        self.model_dir = model_dir or os.getenv("MODEL_DIR", "./models")
+        self.pointer_path = os.path.join(self.model_dir, f"{MODEL_NAME}.current")
+
+    def _path(self, version: int, extension: str) -> str:
+        return os.path.join(self.model_dir, f"{MODEL_NAME}-v{version:04d}.{extension}")
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Metadata of every saved version, oldest first"""
+        if not os.path.isdir(self.model_dir):
+            return []
+        pattern = re.compile(rf"^{MODEL_NAME}-v(\d+)\.json$")
+        versions = []
+        for name in os.listdir(self.model_dir):
+            if pattern.match(name):
+                with open(os.path.join(self.model_dir, name)) as f:
+                    try:
+                        versions.append(json.load(f))
+                    except ValueError:
+                        continue  # Reserved by a save still in progress
+        return sorted(versions, key=lambda meta: meta['version'])
+
+    def active_version(self) -> Optional[int]:
+        """Version inference should use, or None before the first training run"""
+        try:
+            with open(self.pointer_path) as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def pointer_stamp(self) -> Tuple[int, int]:
+        """Changes whenever a version is activated (the pointer is replaced, not rewritten)"""
+        try:
+            stat = os.stat(self.pointer_path)
+            return stat.st_ino, stat.st_mtime_ns
+        except FileNotFoundError:
+            return 0, 0
+
+    def _write_atomic(self, path: str, write: Callable[[str], None]):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def save(self, model: LeadScoringModel, metadata: Dict[str, Any]) -> int:
+        """Persist a model as the next version and return its number"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        version = max((meta['version'] for meta in self.versions()), default=0) + 1
+        # Reserve the number so concurrent trainers never share one
+        while True:
+            try:
+                os.close(os.open(self._path(version, 'json'), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                version += 1
+
+        metadata = dict(metadata, version=version)
+        self._write_atomic(self._path(version, 'joblib'), lambda path: joblib.dump(model, path))
+
+        def write_metadata(path: str):
+            with open(path, 'w') as f:
+                json.dump(metadata, f, indent=2, default=str)
+        self._write_atomic(self._path(version, 'json'), write_metadata)
+        return version
+
+    def activate(self, version: int):
+        """Point inference at a saved version"""
+        if not os.path.exists(self._path(version, 'joblib')):
+            raise FileNotFoundError(f"Model version {version} not found")
+
+        def write_pointer(path: str):
+            with open(path, 'w') as f:
+                f.write(str(version))
+        self._write_atomic(self.pointer_path, write_pointer)
+
+    def load(self, version: Optional[int] = None) -> Tuple[Optional[LeadScoringModel], Optional[Dict[str, Any]]]:
+        """Model and metadata of a version (default: the active one)"""
+        version = version if version is not None else self.active_version()
+        if version is None or not os.path.exists(self._path(version, 'joblib')):
+            return None, None
+        with open(self._path(version, 'json')) as f:
+            metadata = json.load(f)
+        return joblib.load(self._path(version, 'joblib')), metadata
+
+def train_model(database_url: str, model_dir: str, mode: str, chunk_size: int) -> Dict[str, Any]:
+    """
+    Train the lead scoring model in a worker process and save it as a new version
+
+    Args:
+        database_url: Database to read scored leads from
+        model_dir: ModelStore directory
+        mode: 'full' retrains from scratch, 'incremental' updates the active
+            model with leads added since it was trained
+        chunk_size: Leads fetched and learned per partial_fit call
+
+    Returns:
+        Run summary; status is success, up_to_date or insufficient_data
+    """
+    store = ModelStore(model_dir)
+    model, base = (store.load() if mode == 'incremental' else (None, None))
+    if model is None:
+        mode, model, base = 'full', LeadScoringModel(), None
+    trained_through_id = base['trained_through_id'] if base else 0
+
+    query = select(Lead.id, *(getattr(Lead, c) for c in FEATURE_COLUMNS), Lead.ai_score).where(
+        Lead.ai_score.isnot(None),
+        Lead.id > trained_through_id
+    ).order_by(Lead.id)
+
+    samples = evaluated = correct = 0
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for rows in result.partitions():
+                frame = pd.DataFrame(rows, columns=['id', *FEATURE_COLUMNS, 'ai_score'])
+                X = lead_features(frame)
+                y = (frame['ai_score'] > 0.5).to_numpy(dtype=int)  # Binary classification
+
+                # Progressive validation: score each chunk before learning from it
+                if model.samples_seen:
+                    correct += int((model.predict(X) == y).sum())
+                    evaluated += len(y)
+
+                model.partial_fit(X, y)
+                samples += len(y)
+                trained_through_id = int(frame['id'].iloc[-1])
+    finally:
+        engine.dispose()
+
+    if mode == 'full' and samples < 100:  # Need sufficient data
+        return {"status": "insufficient_data", "message": "Need at least 100 leads with scores", "samples": samples}
+    if samples == 0:
+        return {"status": "up_to_date", "message": "No new scored leads", "version": base['version']}
+
+    version = store.save(model, {
+        "mode": mode,
+        "base_version": base['version'] if base else None,
+        "trained_at": datetime.utcnow().isoformat(),
+        "samples": samples,
+        "total_samples": model.samples_seen,
+        "trained_through_id": trained_through_id,
+        "accuracy": correct / evaluated if evaluated else None,
+        "evaluated_samples": evaluated
+    })
+    store.activate(version)
+    return {"status": "success", "version": version, "samples": samples,
+            "accuracy": correct / evaluated if evaluated else None}
+
+class ModelTrainer:
+    """Runs training jobs in a separate process, one at a time"""
+
+    def __init__(self,
+                 store: ModelStore,
+                 database_url: str,
+                 on_model_ready: Optional[Callable[[int], None]] = None,
+                 chunk_size: Optional[int] = None):
+        """
+        Args:
+            store: Where trained versions are saved
+            database_url: Database the worker process reads leads from
+            on_model_ready: Called with the version number after a successful run
+            chunk_size: Leads per training chunk (MODEL_TRAIN_CHUNK_SIZE, default 5000)
+        """
+        self.store = store
+        self.database_url = database_url
+        self.on_model_ready = on_model_ready
+        self.chunk_size = chunk_size or int(os.getenv("MODEL_TRAIN_CHUNK_SIZE", "5000"))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active_job_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def submit(self, mode: str = 'incremental') -> Dict[str, Any]:
+        """Queue a training run; returns the running job instead if there is one"""
+        with self._lock:
+            if self._active_job_id:
+                return dict(self._jobs[self._active_job_id])
+
+            if self._executor is None:
+                # spawn: the API process has threads (tracking flusher, pools) that fork would copy
+                self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'mode': mode,
+                'status': 'running',
+                'version': None,
+                'samples': 0,
+                'accuracy': None,
+                'message': None,
+                'created_at': datetime.utcnow(),
+                'finished_at': None
+            }
+            self._jobs[job['job_id']] = job
+            self._active_job_id = job['job_id']
+
+            future = self._executor.submit(
+                train_model, self.database_url, self.store.model_dir, mode, self.chunk_size
+            )
+        future.add_done_callback(lambda f: self._finish(job['job_id'], f))
+        return dict(job)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a training job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _finish(self, job_id: str, future: Future):
+        try:
+            result = future.result()
+            fields = {
+                'status': 'completed' if result['status'] in ('success', 'up_to_date') else 'failed',
+                'version': result.get('version'),
+                'samples': result.get('samples', 0),
+                'accuracy': result.get('accuracy'),
+                'message': result.get('message')
+            }
+        except Exception as e:
+            logger.error(f"Model training job {job_id} failed: {str(e)}")
+            result = {'status': 'error'}
+            fields = {'status': 'failed', 'message': str(e)}
+            if isinstance(e, BrokenProcessPool):
+                # The worker died (e.g. OOM); the next run starts a fresh one
+                with self._lock:
+                    broken, self._executor = self._executor, None
+                if broken:
+                    broken.shutdown(wait=False)
+
+        with self._lock:
+            self._jobs[job_id].update(fields, finished_at=datetime.utcnow())
+            self._active_job_id = None
+
+        if result['status'] == 'success':
+            logger.info(f"Trained {MODEL_NAME} v{result['version']} on {result['samples']} leads")
+            if self.on_model_ready:
+                self.on_model_ready(result['version'])
+
+    def shutdown(self):
+        """Stop the worker process, abandoning a queued run"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,149 @@
+"""
+Full-text lead search
+SQLite uses an FTS5 index kept in sync by triggers, PostgreSQL a generated
+tsvector column with a GIN index; other databases fall back to ILIKE
+"""
+
+import re
+from typing import List, Optional
+from sqlalchemy import text, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Lead
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LeadSearchService:
+    """Ranked, prefix-matching search over lead names, email, company and job title"""
+
+    SEARCH_COLUMNS = ['first_name', 'last_name', 'email', 'company', 'job_title']
+
+    def __init__(self):
+        # 'fts5', 'tsvector' or None (ILIKE fallback) once ensure() has run
+        self.backend: Optional[str] = None
+
+    def ensure(self, engine: Engine):
+        """Create the search index for the engine's dialect if it is missing"""
+        try:
+            if engine.dialect.name == 'sqlite':
+                self._ensure_fts5(engine)
+                self.backend = 'fts5'
+            elif engine.dialect.name == 'postgresql':
+                self._ensure_tsvector(engine)
+                self.backend = 'tsvector'
+        except OperationalError as e:
+            logger.warning(f"Full-text search unavailable, falling back to ILIKE: {str(e)}")
+            self.backend = None
+
+    def _ensure_fts5(self, engine: Engine):
+        # user_id is indexed too, so a search only ranks the user's own matches
+        indexed = self.SEARCH_COLUMNS + ['user_id']
+        columns = ', '.join(indexed)
+        new_values = ', '.join(f"new.{c}" for c in indexed)
+        old_values = ', '.join(f"old.{c}" for c in indexed)
+
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leads_fts'")
+            ).first()
+
+            # External-content table: the index stores tokens only, rows stay in leads
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5("
+                f"{columns}, content='leads', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS leads_fts_ai AFTER INSERT ON leads BEGIN "
+                f"INSERT INTO leads_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS leads_fts_ad AFTER DELETE ON leads BEGIN "
+                f"INSERT INTO leads_fts(leads_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS leads_fts_au AFTER UPDATE OF {columns} ON leads BEGIN "
+                f"INSERT INTO leads_fts(leads_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO leads_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+
+            if not exists:
+                # Index the leads that existed before the search table
+                conn.execute(text("INSERT INTO leads_fts(leads_fts) VALUES ('rebuild')"))
+                logger.info("Built lead full-text index")
+
+    def _ensure_tsvector(self, engine: Engine):
+        # Email parts become separate words so 'acme' matches 'john@acme.com'
+        document = " || ' ' || ".join(
+            f"coalesce(translate({c}, '@.', '  '), '')" if c == 'email' else f"coalesce({c}, '')"
+            for c in self.SEARCH_COLUMNS
+        )
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"ALTER TABLE leads ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_leads_search_vector ON leads USING GIN (search_vector)"
+            ))
+
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        """Word tokens of the query (also strips any search syntax)"""
+        return re.findall(r'\w+', query.lower())
+
+    async def search(self, query: str, user_id: int, db: AsyncSession, limit: int = 50, offset: int = 0) -> List[Lead]:
+        """
+        Find the user's leads matching every word of the query as a prefix
+
+        Args:
+            query: Search text, e.g. "jo acme"
+            user_id: Owner of the leads
+            db: Database session
+            limit: Page size
+            offset: Results to skip
+
+        Returns:
+            Leads, best match first
+        """
+        terms = self._terms(query)
+        if not terms:
+            return []
+
+        if self.backend == 'fts5':
+            # Weight 0 keeps the user_id column out of the relevance score
+            weights = ', '.join(['1.0'] * len(self.SEARCH_COLUMNS) + ['0.0'])
+            ids = (await db.execute(text(
+                f"SELECT rowid FROM leads_fts WHERE leads_fts MATCH :match "
+                f"ORDER BY bm25(leads_fts, {weights}) LIMIT :limit OFFSET :offset"
+            ), {
+                'match': f'user_id : "{int(user_id)}" AND ' + ' AND '.join(f'"{term}"*' for term in terms),
+                'limit': limit, 'offset': offset
+            })).scalars().all()
+        elif self.backend == 'tsvector':
+            ids = (await db.execute(text(
+                "SELECT id FROM leads, to_tsquery('simple', :match) AS q "
+                "WHERE search_vector @@ q AND user_id = :user_id "
+                "ORDER BY ts_rank(search_vector, q) DESC, id LIMIT :limit OFFSET :offset"
+            ), {
+                'match': ' & '.join(f"{term}:*" for term in terms),
+                'user_id': user_id, 'limit': limit, 'offset': offset
+            })).scalars().all()
+        else:
+            return await self._search_ilike(terms, user_id, db, limit, offset)
+
+        if not ids:
+            return []
+        leads = {lead.id: lead for lead in (await db.scalars(select(Lead).where(Lead.id.in_(ids)))).all()}
+        return [leads[lead_id] for lead_id in ids if lead_id in leads]
+
+    async def _search_ilike(self, terms: List[str], user_id: int, db: AsyncSession, limit: int, offset: int) -> List[Lead]:
+        """Unindexed fallback: every term must appear in one of the search columns"""
+        query = select(Lead).where(Lead.user_id == user_id)
+        for term in terms:
+            query = query.where(or_(*(
+                getattr(Lead, column).ilike(f"%{term}%") for column in self.SEARCH_COLUMNS
+            )))
+        return (await db.scalars(query.order_by(Lead.id).limit(limit).offset(offset))).all()
@@ -0,0 +1,269 @@
+"""
+Write-behind ingestion of email open/click tracking events
+Pixel and click hits only append to an on-disk journal; a flusher thread
+applies them to the database in batches
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, update, bindparam, func
+from sqlalchemy.orm import Session
+from ..models import Campaign, Email
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TrackingService:
+    """Buffers tracking events and applies them in batched UPDATEs"""
+
+    # Largest IN list per SELECT
+    CHUNK_SIZE = 500
+
+    def __init__(self,
+                 session_factory: Callable[[], Session],
+                 journal_dir: Optional[str] = None,
+                 flush_interval_ms: Optional[int] = None,
+                 max_pending: int = 10000):
+        """
+        Args:
+            session_factory: Creates the sessions batches are applied with
+            journal_dir: Directory holding the event journal segments
+            flush_interval_ms: Time between flushes
+            max_pending: Buffered events that trigger an early flush
+        """
+        self.session_factory = session_factory
+        self.journal_dir = journal_dir or os.getenv("TRACKING_JOURNAL_DIR", "./tracking_journal")
+        self.flush_interval = (flush_interval_ms or int(os.getenv("TRACKING_FLUSH_INTERVAL_MS", "500"))) / 1000
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        # Segments whose events are in _pending or being applied, deleted once committed
+        self._sealed: List[str] = []
+        self._segment = None
+        self._segment_path = None
+        self._seq = 0
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {'received': 0, 'applied_opens': 0, 'applied_clicks': 0, 'flushes': 0}
+
+    def start(self):
+        """Replay unapplied journal segments and start the flusher thread"""
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._recover()
+        with self._lock:
+            self._open_segment()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tracking-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher after applying everything buffered"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._segment:
+                self._segment.close()
+                self._segment = None
+                if not os.path.getsize(self._segment_path):
+                    os.remove(self._segment_path)
+
+    def record_open(self, email_id: int):
+        """Buffer an email open"""
+        self._record({'type': 'open', 'email_id': email_id, 'ts': datetime.utcnow().isoformat()})
+
+    def record_click(self, email_id: int, link: str):
+        """Buffer an email click"""
+        self._record({'type': 'click', 'email_id': email_id, 'link': link, 'ts': datetime.utcnow().isoformat()})
+
+    def _record(self, event: Dict[str, Any]):
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            if self._segment is None:
+                self._open_segment()
+            self._segment.write(line)
+            self._segment.flush()
+            self._pending.append(event)
+            self.stats['received'] += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wakeup.set()
+
+    def _segment_name(self, seq: int) -> str:
+        return os.path.join(self.journal_dir, f"events-{os.getpid()}-{seq:08d}.jsonl")
+
+    def _open_segment(self):
+        """Start a new journal segment (caller holds the lock)"""
+        self._seq += 1
+        self._segment_path = self._segment_name(self._seq)
+        self._segment = open(self._segment_path, "a", encoding="utf-8")
+
+    def _seal_segment(self) -> List[Dict[str, Any]]:
+        """Close the current segment and take the buffered events"""
+        with self._lock:
+            if self._pending:
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+                self._segment.close()
+                self._sealed.append(self._segment_path)
+                self._open_segment()
+            events, self._pending = self._pending, []
+            return events
+
+    def _recover(self):
+        """Load segments left by processes that stopped before applying them"""
+        for name in sorted(os.listdir(self.journal_dir)):
+            if not name.endswith(".jsonl") or not name.startswith(("events-", "recovered-")):
+                continue
+            owner, origin = name.split("-", 2)[1:]
+            if int(owner) != os.getpid() and self._pid_alive(int(owner)):
+                continue
+            if name.startswith("events-"):
+                origin = f"{owner}-{origin}"
+
+            # Rename first so only one worker replays a segment
+            claimed = os.path.join(self.journal_dir, f"recovered-{os.getpid()}-{origin}")
+            try:
+                os.replace(os.path.join(self.journal_dir, name), claimed)
+            except OSError:
+                continue
+
+            with open(claimed, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._pending.append(json.loads(line))
+                    except ValueError:
+                        pass  # Torn last line from a crash
+            self._sealed.append(claimed)
+
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} tracking events from the journal")
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Tracking flush failed, will retry: {str(e)}")
+
+    def flush(self) -> int:
+        """Apply buffered events in one transaction; returns the number applied"""
+        events = self._seal_segment()
+        with self._lock:
+            sealed = list(self._sealed)
+        if not events:
+            self._remove(sealed)
+            return 0
+
+        try:
+            opens, clicks = self._dedupe(events)
+            self._apply(opens, clicks)
+        except Exception:
+            # Keep the events (their segments stay on disk) for the next flush
+            with self._lock:
+                self._pending[:0] = events
+            raise
+
+        self._remove(sealed)
+        self.stats['flushes'] += 1
+        return len(events)
+
+    def _remove(self, paths: List[str]):
+        with self._lock:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._sealed.remove(path)
+
+    @staticmethod
+    def _dedupe(events: List[Dict[str, Any]]) -> Tuple[Dict[int, Dict], Dict[int, Dict]]:
+        """First open and first click per email"""
+        opens: Dict[int, Dict] = {}
+        clicks: Dict[int, Dict] = {}
+        for event in events:
+            target = opens if event['type'] == 'open' else clicks
+            email_id = int(event['email_id'])
+            if email_id not in target or event['ts'] < target[email_id]['ts']:
+                target[email_id] = event
+        return opens, clicks
+
+    def _apply(self, opens: Dict[int, Dict], clicks: Dict[int, Dict]):
+        """Mark first opens/clicks and bump campaign counters in one transaction"""
+        db = self.session_factory()
+        try:
+            opened = self._unmarked(db, opens, Email.is_opened)
+            clicked = self._unmarked(db, clicks, Email.is_clicked)
+
+            if opened:
+                db.execute(update(Email), [
+                    {'id': email_id, 'is_opened': True, 'opened_at': datetime.fromisoformat(opens[email_id]['ts'])}
+                    for email_id in opened
+                ])
+            if clicked:
+                db.execute(update(Email), [
+                    {'id': email_id, 'is_clicked': True, 'clicked_link': clicks[email_id].get('link'),
+                     'clicked_at': datetime.fromisoformat(clicks[email_id]['ts'])}
+                    for email_id in clicked
+                ])
+
+            self._bump_counters(db, Counter(opened.values()), 'opened_count')
+            self._bump_counters(db, Counter(clicked.values()), 'clicked_count')
+            db.commit()
+
+            self.stats['applied_opens'] += len(opened)
+            self.stats['applied_clicks'] += len(clicked)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _unmarked(self, db: Session, events: Dict[int, Dict], flag) -> Dict[int, int]:
+        """Email id -> campaign id for emails not yet flagged (replays become no-ops)"""
+        ids = list(events)
+        unmarked = {}
+        for start in range(0, len(ids), self.CHUNK_SIZE):
+            rows = db.execute(
+                select(Email.id, Email.campaign_id).where(
+                    Email.id.in_(ids[start:start + self.CHUNK_SIZE]),
+                    flag.isnot(True)
+                )
+            ).all()
+            unmarked.update((row.id, row.campaign_id) for row in rows)
+        return unmarked
+
+    @staticmethod
+    def _bump_counters(db: Session, increments: Counter, column: str):
+        if not increments:
+            return
+        campaigns = Campaign.__table__
+        counter = campaigns.c[column]
+        db.execute(
+            campaigns.update()
+            .where(campaigns.c.id == bindparam('campaign_id'))
+            .values({column: func.coalesce(counter, 0) + bindparam('increment')}),
+            [{'campaign_id': campaign_id, 'increment': n} for campaign_id, n in increments.items()]
+        )
@@ -0,0 +1,200 @@
+"""
+Short-lived cache of authenticated users
+Saves get_current_user a database round trip on every API call; entries are
+dropped as soon as a user row is updated or deleted through the ORM
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import DateTime, event
+from ..models import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Never leaves the database
+EXCLUDED_COLUMNS = {'hashed_password'}
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Read-only snapshot of the authenticated user, the same on cache hits and misses"""
+
+    id: int
+    email: str
+    full_name: str
+    role: Optional[str] = None
+    subscription_plan: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CurrentUser':
+        return cls(**{f.name: data.get(f.name) for f in fields(cls)})
+
+    @classmethod
+    def from_user(cls, user: User) -> 'CurrentUser':
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+class _LocalBackend:
+    """Per-process LRU with expiry"""
+
+    name = "local"
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return data
+
+    def set(self, user_id: int, data: Dict[str, Any], ttl: float):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, data)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class _RedisBackend:
+    """Cache shared by every worker, so an invalidation reaches all of them"""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        # Short timeouts: a slow cache must not be slower than the database
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.2)
+        self.prefix = "leadai:user:"
+        self._datetime_columns = {
+            c.key for c in User.__table__.columns if isinstance(c.type, DateTime)
+        }
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(f"{self.prefix}{user_id}")
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        for key in self._datetime_columns:
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        return data
+
+    def set(self, user_id: int, data: Dict[str, Any], ttl: float):
+        payload = json.dumps(data, default=lambda v: v.isoformat() if hasattr(v, 'isoformat') else str(v))
+        self.client.set(f"{self.prefix}{user_id}", payload, px=int(ttl * 1000))
+
+    def delete(self, user_id: int):
+        self.client.delete(f"{self.prefix}{user_id}")
+
+    def size(self) -> int:
+        return -1  # Not tracked for a shared cache
+
+class UserCache:
+    """Caches users by id for a few seconds, with hit-rate counters"""
+
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 10000, redis_url: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (USER_CACHE_TTL, default 30)
+            max_size: Entries kept by the in-process backend
+            redis_url: Shared backend for multi-worker deployments (USER_CACHE_REDIS_URL)
+        """
+        self.ttl = ttl if ttl is not None else float(os.getenv("USER_CACHE_TTL", "30"))
+        redis_url = redis_url or os.getenv("USER_CACHE_REDIS_URL")
+        if redis_url and redis is None:
+            logger.warning("USER_CACHE_REDIS_URL is set but redis is not installed; using the in-process user cache")
+        self.backend = _RedisBackend(redis_url) if redis_url and redis else _LocalBackend(max_size)
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._stats_lock = threading.Lock()
+
+        # Any ORM change to a user drops its entry
+        event.listen(User, "after_update", self._on_user_changed)
+        event.listen(User, "after_delete", self._on_user_changed)
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, user_id: int) -> Optional[CurrentUser]:
+        """Cached user snapshot (without the password hash) or None"""
+        try:
+            data = self.backend.get(user_id)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"User cache read failed: {str(e)}")
+            data = None
+
+        if data is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return CurrentUser.from_dict(data)
+
+    def set(self, user: User) -> CurrentUser:
+        """Cache a user loaded from the database and return its snapshot"""
+        data = {
+            c.key: getattr(user, c.key)
+            for c in User.__table__.columns if c.key not in EXCLUDED_COLUMNS
+        }
+        try:
+            self.backend.set(user.id, data, self.ttl)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"User cache write failed: {str(e)}")
+        return CurrentUser.from_dict(data)
+
+    def invalidate(self, user_id: int):
+        """Drop a user's entry, e.g. after it was changed outside the ORM"""
+        try:
+            self.backend.delete(user_id)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"User cache invalidation failed: {str(e)}")
+
+    def _on_user_changed(self, mapper, connection, target: User):
+        self.invalidate(target.id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and size for monitoring"""
+        with self._stats_lock:
+            hits, misses, errors = self.hits, self.misses, self.errors
+        lookups = hits + misses
+        return {
+            "backend": self.backend.name,
+            "hits": hits,
+            "misses": misses,
+            "errors": errors,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "size": self.backend.size(),
+            "ttl_seconds": self.ttl
+        }
@@ -76,6 +76,14 @@ class Config:
                 'cache_enabled': True,
                 'cache_duration': 3600
             },
+            'http': {
+                'pool_hosts': 50,
+                'max_per_host': 4,
+                'connect_timeout': 5,
+                'read_timeout': 15,
+                'retries': 2,
+                'backoff_factor': 0.5
+            },
             'enrichment': {
                 'osm_enabled': False,
                 'overpass_url': 'https://overpass-api.de/api/interpreter',
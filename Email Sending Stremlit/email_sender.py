@@ -4,21 +4,84 @@ Compatibility bridge for Email Sender.
 import os
 import json
 import time
+import threading
 from datetime import datetime
 
 class EmailSender:
     def __init__(self):
         self.tracking_file = os.path.join(os.path.dirname(__file__), "email_tracking.json")
+        # Open/click hits are appended here and folded into tracking_file in batches
+        self.events_file = os.path.join(os.path.dirname(__file__), "email_tracking_events.jsonl")
+        self._events_lock = threading.Lock()
         self.sender_email = os.environ.get("SMTP_USERNAME", "")
         self.sender_password = os.environ.get("SMTP_PASSWORD", "")
 
     def get_all_emails(self):
+        self.apply_tracking_events()
+        return self._read_tracking_file()
+
+    def _read_tracking_file(self):
         try:
             with open(self.tracking_file, 'r') as f:
                 return json.load(f)
         except:
             return []
 
+    def track_email_open(self, email_id):
+        self._append_tracking_event({'type': 'open', 'email_id': email_id})
+
+    def track_email_click(self, email_id, url):
+        self._append_tracking_event({'type': 'click', 'email_id': email_id, 'url': url})
+
+    def _append_tracking_event(self, event):
+        # One appended line per hit instead of rewriting the whole tracking file
+        event['ts'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._events_lock:
+            with open(self.events_file, 'a') as f:
+                f.write(json.dumps(event) + "\n")
+
+    def apply_tracking_events(self):
+        """Fold journaled opens/clicks into the tracking file with a single rewrite."""
+        applying = self.events_file + ".applying"
+        with self._events_lock:
+            # A leftover .applying file is a batch interrupted by a restart; apply it first
+            if not os.path.exists(applying):
+                if not os.path.exists(self.events_file):
+                    return
+                os.replace(self.events_file, applying)
+
+            events = []
+            with open(applying, 'r') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        pass
+
+            all_tracking = self._read_tracking_file()
+            by_id = {str(e.get('id')): e for e in all_tracking}
+            for event in events:
+                record = by_id.get(str(event['email_id']))
+                if not record:
+                    continue
+                # Repeated opens/clicks keep the first timestamp
+                if not record.get('opened_at'):
+                    record['opened_at'] = event['ts']
+                if record.get('status') in ('sent', 'delivered'):
+                    record['status'] = 'opened'
+                if event['type'] == 'click':
+                    if not record.get('clicked_at'):
+                        record['clicked_at'] = event['ts']
+                        record['clicked_url'] = event.get('url')
+                    if record.get('status') == 'opened':
+                        record['status'] = 'clicked'
+
+            tmp_file = self.tracking_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(all_tracking, f)
+            os.replace(tmp_file, self.tracking_file)
+            os.remove(applying)
+
     def send_bulk_emails_generator(self, recipients, subject, body, campaign_id, delay_seconds=1, subject_b=None):
         all_tracking = self.get_all_emails()
         
@@ -0,0 +1,228 @@
+"""
+Email and social link extraction.
+
+Shared by website enrichment and the scrapers package. All patterns are
+compiled once at import. Social links are found in a single regex pass
+over the raw text (href attributes and bare URLs alike) and classified with
+a domain -> network lookup table instead of parsing the document with
+BeautifulSoup. Common email obfuscations ("name [at] domain [dot] com",
+HTML entities, Cloudflare email protection) are decoded.
+"""
+
+import html
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+
+SOCIAL_NETWORKS = ('facebook', 'instagram', 'twitter', 'linkedin', 'youtube', 'tiktok', 'whatsapp')
+
+# Registered domain -> network
+SOCIAL_DOMAINS = {
+    'facebook.com': 'facebook',
+    'fb.com': 'facebook',
+    'fb.me': 'facebook',
+    'instagram.com': 'instagram',
+    'instagr.am': 'instagram',
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'linkedin.com': 'linkedin',
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'tiktok.com': 'tiktok',
+    'wa.me': 'whatsapp',
+    'whatsapp.com': 'whatsapp',
+}
+
+# Paths that are share buttons, tracking pixels or login pages rather than profiles
+SKIP_PATHS = (
+    '/sharer', '/share', '/intent/', '/tr?', '/tr/', '/plugins/', '/dialog/',
+    '/login', '/embed/', '/hashtag/', '/sharearticle'
+)
+
+# Networks whose profile links must live under one of these paths
+PROFILE_PATHS = {
+    'linkedin': ('/company/', '/in/', '/school/'),
+}
+
+EMAIL_BLOCKLIST = (
+    'example.com', 'test.com', 'sample.com',
+    'wix.com', 'wordpress.com', 'yourdomain.com',
+    'sentry.io', 'privacy@', 'noreply@', '.png', '.jpg', '.jpeg', '.gif'
+)
+
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Emails are scanned outward from each '@' (or "[at]") instead of running a
+# pattern that can start at every character of the page
+EMAIL_USER_RE = re.compile(r'[a-zA-Z0-9._%+-]+$')
+EMAIL_DOMAIN_RE = re.compile(r'[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+EMAIL_USER_WINDOW = 64
+
+# name [at] domain [dot] com, name(at)domain.com, name {at} domain {dot} co {dot} uk
+_DOT = r'\s*(?:\.|[\[\(\{]\s*dot\s*[\]\)\}])\s*'
+OBFUSCATED_AT_RE = re.compile(r'[\[\(\{]\s*at\s*[\]\)\}]', re.IGNORECASE)
+OBFUSCATED_USER_RE = re.compile(r'([a-zA-Z0-9._%+-]+)\s*$')
+OBFUSCATED_DOMAIN_RE = re.compile(r'\s*([a-zA-Z0-9-]+(?:' + _DOT + r'[a-zA-Z0-9-]+)+)', re.IGNORECASE)
+OBFUSCATED_DOT_RE = re.compile(_DOT, re.IGNORECASE)
+
+# Cloudflare email protection: data-cfemail="<hex>" or /cdn-cgi/l/email-protection#<hex>
+CFEMAIL_RE = re.compile(r'(?:data-cfemail=["\']|email-protection#)([0-9a-fA-F]{8,})')
+
+# Anchored on the registered domain so the scan only does work near social hosts;
+# subdomains (www., m.) are dropped and the scheme is normalized to https
+# (case-sensitive and without lookbehind, both of which would disable the regex
+# engine's first-character prefilter; it runs on lowered text and the host
+# boundary is checked in Python)
+SOCIAL_URL_RE = re.compile(
+    r'('
+    + '|'.join(re.escape(domain) for domain in sorted(SOCIAL_DOMAINS, key=len, reverse=True))
+    + r')(/[^\s"\'<>)\\]+)'
+)
+HOST_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@-')
+
+WHATSAPP_NUMBER_RES = (
+    re.compile(r'wa\.me/(\d+)'),                      # wa.me/NUMBER
+    re.compile(r'phone=(\d+)'),                       # api.whatsapp.com/send?phone=NUMBER
+    re.compile(r'whatsapp\.com.*?(\d{10,})'),         # whatsapp.com ...
+)
+
+
+def decode_cfemail(encoded: str) -> Optional[str]:
+    """Decode a Cloudflare-protected email (hex string XORed with its first byte)."""
+    try:
+        key = int(encoded[:2], 16)
+        return ''.join(
+            chr(int(encoded[i:i + 2], 16) ^ key) for i in range(2, len(encoded), 2)
+        )
+    except ValueError:
+        return None
+
+
+def extract_emails(text: str, blocklist: Iterable[str] = EMAIL_BLOCKLIST) -> List[str]:
+    """
+    Find email addresses in page text, decoding common obfuscations.
+
+    Args:
+        text: Raw HTML or plain text
+        blocklist: Substrings that disqualify an address
+
+    Returns:
+        Unique addresses in order of appearance (plain before decoded)
+    """
+    if not text:
+        return []
+
+    if '&#' in text or '&commat;' in text:
+        text = html.unescape(text)
+
+    candidates = []
+    at = text.find('@')
+    while at != -1:
+        user = EMAIL_USER_RE.search(text, max(0, at - EMAIL_USER_WINDOW), at)
+        domain = EMAIL_DOMAIN_RE.match(text, at + 1)
+        if user and domain:
+            candidates.append(f"{user.group(0)}@{domain.group(0)}")
+        at = text.find('@', at + 1)
+
+    for token in OBFUSCATED_AT_RE.finditer(text):
+        user = OBFUSCATED_USER_RE.search(text, max(0, token.start() - EMAIL_USER_WINDOW), token.start())
+        domain = OBFUSCATED_DOMAIN_RE.match(text, token.end())
+        if user and domain:
+            candidates.append(f"{user.group(1)}@{OBFUSCATED_DOT_RE.sub('.', domain.group(1))}")
+
+    if 'cfemail' in text or 'email-protection' in text:
+        for encoded in CFEMAIL_RE.findall(text):
+            decoded = decode_cfemail(encoded)
+            if decoded and EMAIL_RE.fullmatch(decoded):
+                candidates.append(decoded)
+
+    blocklist = tuple(blocklist)
+    seen = set()
+    emails = []
+    for email in candidates:
+        key = email.lower()
+        if key in seen or any(x in key for x in blocklist):
+            continue
+        seen.add(key)
+        emails.append(email)
+    return emails
+
+
+def classify_social_url(url: str) -> Optional[str]:
+    """
+    Map a URL to its social network.
+
+    Args:
+        url: Absolute, protocol-relative or scheme-less URL
+
+    Returns:
+        Network name, or None if the URL is not a profile link
+    """
+    if '//' not in url:
+        url = '//' + url
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().split(':')[0]
+
+    network = None
+    parts = host.split('.')
+    for i in range(len(parts) - 1):
+        network = SOCIAL_DOMAINS.get('.'.join(parts[i:]))
+        if network:
+            break
+    if not network:
+        return None
+
+    path = (parsed.path + ('?' + parsed.query if parsed.query else '')).lower()
+    if network != 'whatsapp' and (len(path) <= 1 or path.startswith(SKIP_PATHS)):
+        return None
+    if network in PROFILE_PATHS and not path.startswith(PROFILE_PATHS[network]):
+        return None
+    return network
+
+
+def whatsapp_number(url: str) -> str:
+    """Extract the phone number from a WhatsApp link, or return the link."""
+    for pattern in WHATSAPP_NUMBER_RES:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return url
+
+
+def extract_social_links(text: str, networks: Iterable[str] = SOCIAL_NETWORKS) -> Dict[str, Optional[str]]:
+    """
+    Find the first profile link per social network in one pass.
+
+    Args:
+        text: Raw HTML or plain text
+        networks: Networks to report
+
+    Returns:
+        Dict network -> URL (WhatsApp -> number when present), None if not found
+    """
+    links = {network: None for network in networks}
+    if not text:
+        return links
+
+    lowered = text.lower()
+    # Profile paths keep their original case unless lowering changed offsets
+    source = text if len(lowered) == len(text) else lowered
+
+    missing = len(links)
+    for match in SOCIAL_URL_RE.finditer(lowered):
+        if match.start() and lowered[match.start() - 1] in HOST_CHARS:
+            continue
+        network = SOCIAL_DOMAINS[match.group(1)]
+        if network not in links or links[network]:
+            continue
+
+        url = 'https://' + match.group(1) + source[match.start(2):match.end(2)].rstrip('.,;:')
+        if classify_social_url(url) != network:
+            continue
+        links[network] = whatsapp_number(url) if network == 'whatsapp' else url
+
+        missing -= 1
+        if not missing:
+            break
+    return links
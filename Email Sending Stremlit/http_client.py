@@ -0,0 +1,175 @@
+"""
+Shared pooled HTTP client.
+
+Website enrichment, robots.txt checks and the scrapers package all talk to
+many small hosts. Instead of a bare requests.get per call, they share one
+requests Session whose HTTPAdapter keeps a bounded keep-alive pool per host
+(so TCP and TLS sessions are reused), blocks when a host's connection limit
+is reached, retries idempotent requests with exponential backoff, and
+reports how often connections were reused.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+class HttpClient:
+    """
+    Process-wide pooled HTTP client.
+
+    Per-host limits come from the adapter pool itself: each host gets at
+    most max_per_host connections and further requests wait for a free
+    one (pool_block) instead of opening throwaway connections.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_hosts: int = 50,
+        max_per_host: int = 4,
+        connect_timeout: float = 5,
+        read_timeout: float = 15,
+        retries: int = 2,
+        backoff_factor: float = 0.5
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            pool_hosts: Number of hosts whose connection pools are kept alive
+            max_per_host: Concurrent connections allowed per host
+            connect_timeout: Default connect timeout in seconds
+            read_timeout: Default read timeout in seconds
+            retries: Retries for connection errors and 429/5xx responses
+            backoff_factor: Exponential backoff base between retries in seconds
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._elapsed = 0.0
+        # Counters of pools that were evicted from the adapter
+        self._retired = {'connections': 0, 'requests': 0}
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=max_per_host,
+            pool_block=True,
+            max_retries=retry
+        )
+        self.adapter.poolmanager.pools.dispose_func = self._retire_pool
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+    @classmethod
+    def shared(cls, config=None) -> 'HttpClient':
+        """Return the process-wide client, creating it from config on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                http = config.http if config is not None else {}
+                cls._shared = cls(
+                    pool_hosts=http.get('pool_hosts', 50),
+                    max_per_host=http.get('max_per_host', 4),
+                    connect_timeout=http.get('connect_timeout', 5),
+                    read_timeout=http.get('read_timeout', 15),
+                    retries=http.get('retries', 2),
+                    backoff_factor=http.get('backoff_factor', 0.5)
+                )
+            return cls._shared
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET a URL through the shared pool.
+
+        Args:
+            url: URL to fetch
+            **kwargs: Passed to requests.Session.get (timeout defaults to the client's)
+
+        Returns:
+            Response object
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        started = time.monotonic()
+        try:
+            return self.session.get(url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._requests += 1
+                self._elapsed += time.monotonic() - started
+
+    def _retire_pool(self, pool):
+        """Keep an evicted host pool's counters before closing it."""
+        with self._lock:
+            self._retired['connections'] += pool.num_connections
+            self._retired['requests'] += pool.num_requests
+        pool.close()
+
+    def metrics(self) -> Dict:
+        """
+        Connection reuse metrics.
+
+        Returns:
+            Dict with requests, errors, connections opened, reuse_rate,
+            average latency and the number of hosts with a live pool
+        """
+        pools = self.adapter.poolmanager.pools
+        with self._lock:
+            connections = self._retired['connections']
+            pool_requests = self._retired['requests']
+            hosts = 0
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                hosts += 1
+                connections += pool.num_connections
+                pool_requests += pool.num_requests
+
+            return {
+                'requests': self._requests,
+                'errors': self._errors,
+                'connections': connections,
+                'reuse_rate': 1 - connections / pool_requests if pool_requests else 0.0,
+                'avg_latency': self._elapsed / self._requests if self._requests else 0.0,
+                'hosts': hosts
+            }
+
+    def summary(self) -> str:
+        """One-line connection reuse summary."""
+        m = self.metrics()
+        return (
+            f"HTTP client: {m['requests']} requests over {m['connections']} connections "
+            f"to {m['hosts']} hosts ({m['reuse_rate']:.0%} reused, {m['errors']} errors, "
+            f"avg {m['avg_latency'] * 1000:.0f}ms)"
+        )
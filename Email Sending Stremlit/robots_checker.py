@@ -12,6 +12,8 @@ import requests
 from typing import Optional
 import time
 
+from http_client import HttpClient
+
 
 class RobotsChecker:
     """
@@ -35,6 +37,7 @@ class RobotsChecker:
         self.logger = logging.getLogger(__name__)
         self.cache = {}
         self.cache_duration = config.robots.get('cache_duration', 3600)
+        self.http = HttpClient.shared(config)
     
     def can_fetch(self, url: str, user_agent: str = '*') -> bool:
         """
@@ -83,7 +86,7 @@ class RobotsChecker:
         try:
             self.logger.debug(f"Fetching robots.txt from {robots_url}")
             
-            response = requests.get(
+            response = self.http.get(
                 robots_url,
                 timeout=10,
                 headers={'User-Agent': 'Mozilla/5.0 (compatible)'}
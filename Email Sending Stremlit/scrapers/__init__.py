@@ -9,4 +9,12 @@ from .google_maps_scraper import GoogleMapsScraper
 __all__ = [
     'BaseScraper',
     'GoogleMapsScraper'
-]
\ No newline at end of file
+]
+
+# Async scrapers need httpx
+try:
+    from .async_base_scraper import AsyncBaseScraper, AsyncRateLimiter
+    from .async_google_maps_scraper import AsyncGoogleMapsScraper
+    __all__ += ['AsyncBaseScraper', 'AsyncRateLimiter', 'AsyncGoogleMapsScraper']
+except ImportError:
+    pass
\ No newline at end of file
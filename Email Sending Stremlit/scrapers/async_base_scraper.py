@@ -0,0 +1,181 @@
+"""
+Async variant of the base scraper
+Runs many searches concurrently over one shared httpx connection pool while a
+per-source rate limiter (separate from retries) keeps each source within budget
+"""
+
+import asyncio
+import random
+import time
+from abc import abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential, retry_if_exception
+
+from .base_scraper import BaseScraper, LeadData, logger
+
+# Same statuses the sync HttpClient's urllib3 Retry retries; other 4xx never succeed on retry
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Transport errors, rate limiting and server errors are worth another attempt"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+class AsyncRateLimiter:
+    """Spaces requests to one source; shared by every scraper of that source"""
+
+    _limiters: Dict[str, 'AsyncRateLimiter'] = {}
+
+    def __init__(self, min_interval: float, jitter: float = 0.5):
+        """
+        Args:
+            min_interval: Seconds between two requests to the source
+            jitter: Extra random fraction of the interval added per request
+        """
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_time = 0.0
+
+    @classmethod
+    def for_source(cls, name: str, min_interval: float) -> 'AsyncRateLimiter':
+        """Get the limiter for a source, creating it on first use"""
+        if name not in cls._limiters:
+            cls._limiters[name] = cls(min_interval)
+        return cls._limiters[name]
+
+    async def acquire(self) -> float:
+        """Wait for the source's next request slot and reserve it"""
+        # No await between reading and updating _next_time, so this is
+        # atomic within the event loop
+        now = time.monotonic()
+        start = max(now, self._next_time)
+        self._next_time = start + self.min_interval * (1 + random.uniform(0, self.jitter))
+        delay = start - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class AsyncBaseScraper(BaseScraper):
+    """Base class for scrapers that search concurrently with asyncio"""
+
+    # One connection pool per event loop, shared by all async scrapers
+    _clients: Dict[int, httpx.AsyncClient] = {}
+
+    max_connections = 50
+    max_keepalive_connections = 20
+    request_timeout = 30.0
+    max_attempts = 3
+
+    def __init__(self, name: str, rate_limit_delay: float = 1.0):
+        super().__init__(name, rate_limit_delay)
+        self._setup_async()
+
+    def _setup_async(self):
+        """Attach the per-source rate limiter"""
+        self.rate_limiter = AsyncRateLimiter.for_source(self.name, self.rate_limit_delay)
+
+    @classmethod
+    def _client(cls) -> httpx.AsyncClient:
+        """Shared AsyncClient for the running event loop"""
+        loop_id = id(asyncio.get_running_loop())
+        client = cls._clients.get(loop_id)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=cls.max_connections,
+                    max_keepalive_connections=cls.max_keepalive_connections
+                ),
+                timeout=cls.request_timeout,
+                follow_redirects=True
+            )
+            cls._clients[loop_id] = client
+        return client
+
+    @classmethod
+    async def aclose(cls):
+        """Close the shared client of the running event loop"""
+        client = cls._clients.pop(id(asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.aclose()
+
+    async def _make_request_async(self, url: str, params: Optional[Dict] = None, **kwargs) -> httpx.Response:
+        """Make HTTP request within the source's rate budget, retrying transient failures with backoff"""
+        extra_headers = kwargs.pop('headers', {})
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_exponential(multiplier=1, min=4, max=10),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        ):
+            with attempt:
+                await self.rate_limiter.acquire()
+
+                # Rotate user agent occasionally
+                if random.random() < 0.3:
+                    self._rotate_user_agent()
+
+                headers = {**self.headers, **extra_headers}
+                logger.info(f"Making async request to {url} with params: {params}")
+                response = await self._client().get(url, params=params, headers=headers, **kwargs)
+                logger.info(f"Response status: {response.status_code}, content length: {len(response.content)}")
+                response.raise_for_status()
+                return response
+
+    @abstractmethod
+    async def search_leads_async(self,
+                                 city: str,
+                                 country: str,
+                                 niche: str,
+                                 business_name: Optional[str] = None,
+                                 limit: int = 50) -> List[LeadData]:
+        """Async counterpart of search_leads"""
+        pass
+
+    async def search_leads_many(self,
+                                combos: Iterable[Tuple[str, str, str]],
+                                limit: int = 50,
+                                concurrency: int = 10) -> Dict[Tuple[str, str, str], List[LeadData]]:
+        """
+        Run many searches concurrently within the source's rate budget
+
+        Args:
+            combos: (niche, city, country) tuples
+            limit: Maximum number of leads per search
+            concurrency: Searches in flight at the same time
+
+        Returns:
+            Dict mapping each combo to its leads (empty list if the search failed)
+        """
+        combos = list(dict.fromkeys(combos))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(combo: Tuple[str, str, str]) -> List[LeadData]:
+            niche, city, country = combo
+            async with semaphore:
+                try:
+                    return await self.search_leads_async(city, country, niche, limit=limit)
+                except Exception as e:
+                    logger.warning(f"{self.name} search failed for {combo}: {e}")
+                    return []
+
+        results = await asyncio.gather(*(run(combo) for combo in combos))
+        return dict(zip(combos, results))
+
+    def run_search_many(self,
+                        combos: Iterable[Tuple[str, str, str]],
+                        limit: int = 50,
+                        concurrency: int = 10) -> Dict[Tuple[str, str, str], List[LeadData]]:
+        """Blocking wrapper around search_leads_many for synchronous callers"""
+        async def main():
+            try:
+                return await self.search_leads_many(combos, limit, concurrency)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(main())
@@ -0,0 +1,35 @@
+"""
+Async Google Maps scraper
+Runs many (niche, city) searches concurrently with the same parsing as GoogleMapsScraper
+"""
+
+import asyncio
+from typing import List, Optional
+
+from .async_base_scraper import AsyncBaseScraper
+from .base_scraper import LeadData
+from .google_maps_scraper import GoogleMapsScraper
+
+
+class AsyncGoogleMapsScraper(AsyncBaseScraper, GoogleMapsScraper):
+    """Google Maps scraper with asyncio search and a shared connection pool"""
+    
+    def __init__(self):
+        GoogleMapsScraper.__init__(self)
+        self._setup_async()
+    
+    async def search_leads_async(self,
+                                 city: str,
+                                 country: str,
+                                 niche: str,
+                                 business_name: Optional[str] = None,
+                                 limit: int = 50) -> List[LeadData]:
+        """Search for leads on Google Maps without blocking the event loop"""
+        params = self._build_search_params(city, country, niche, business_name)
+        self._logger.info(f"Searching Google Maps for: {params['q']}")
+        
+        response = await self._make_request_async(self.base_url, params=params)
+        # BeautifulSoup parsing is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(
+            self._parse_search_response, response.content, niche, city, country, limit
+        )
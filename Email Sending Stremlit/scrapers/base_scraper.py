@@ -10,8 +10,14 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from fake_useragent import UserAgent
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
+import sys
+import os
+
+# http_client and extraction live in the app directory, next to this package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import HttpClient
+from extraction import EMAIL_RE, extract_social_links
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -79,13 +85,16 @@ class BaseScraper(ABC):
                 "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0",
             ]
         
-        self.session = requests.Session()
+        # Pooled keep-alive connections are shared by every scraper; headers stay per scraper
+        self.http = HttpClient.shared()
+        self.session = self.http.session
+        self.headers = {}
         self._setup_session()
     
     def _setup_session(self):
-        """Setup session with headers and retry strategy"""
+        """Setup per-scraper request headers"""
         ua_value = self.ua.random if self.ua else self._random_ua[0]
-        self.session.headers.update({
+        self.headers.update({
             'User-Agent': ua_value,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -102,18 +111,13 @@ class BaseScraper(ABC):
     def _rotate_user_agent(self):
         """Rotate user agent to avoid detection"""
         if self.ua:
-            self.session.headers['User-Agent'] = self.ua.random
+            self.headers['User-Agent'] = self.ua.random
         elif self._random_ua:
             import random
-            self.session.headers['User-Agent'] = random.choice(self._random_ua)
+            self.headers['User-Agent'] = random.choice(self._random_ua)
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((requests.exceptions.RequestException, requests.exceptions.Timeout))
-    )
     def _make_request(self, url: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
-        """Make HTTP request with retry logic"""
+        """Make HTTP request (the shared session retries connection errors, 429 and 5xx)"""
         try:
             # Add random delay
             time.sleep(self._get_random_delay())
@@ -123,7 +127,8 @@ class BaseScraper(ABC):
                 self._rotate_user_agent()
             
             logger.info(f"Making request to {url} with params: {params}")
-            response = self.session.get(url, params=params, timeout=30, **kwargs)
+            headers = {**self.headers, **kwargs.pop('headers', {})}
+            response = self.http.get(url, params=params, headers=headers, timeout=30, **kwargs)
             logger.info(f"Response status: {response.status_code}, content length: {len(response.content)}")
             response.raise_for_status()
             return response
@@ -161,133 +166,14 @@ class BaseScraper(ABC):
         if not text:
             return None
         
-        import re
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
+        match = EMAIL_RE.search(text)
         return match.group(0) if match else None
     
     def _extract_social_links(self, text: str, website_url: Optional[str] = None) -> Dict[str, Optional[str]]:
         """Extract social media links from text and website"""
-        social_links = {
-            'facebook': None,
-            'twitter': None,
-            'linkedin': None,
-            'instagram': None,
-            'youtube': None,
-            'tiktok': None
-        }
-        
-        if not text:
-            return social_links
-        
-        import re
-        text_lower = text.lower()
-        
-        # Facebook patterns
-        fb_patterns = [
-            r'facebook\.com/[^"\s\'\)]+',
-            r'fb\.com/[^"\s\'\)]+',
-            r'fb\.me/[^"\s\'\)]+'
-        ]
-        
-        for pattern in fb_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                social_links['facebook'] = 'https://' + match.group(0)
-                break
-        
-        # Twitter/X patterns
-        twitter_patterns = [
-            r'twitter\.com/[^"\s\'\)]+',
-            r'x\.com/[^"\s\'\)]+'
-        ]
-        
-        for pattern in twitter_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                social_links['twitter'] = 'https://' + match.group(0)
-                break
-        
-        # LinkedIn patterns
-        linkedin_patterns = [
-            r'linkedin\.com/[^"\s\'\)]+',
-            r'linkedin\.com/in/[^"\s\'\)]+'
-        ]
-        
-        for pattern in linkedin_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                social_links['linkedin'] = 'https://' + match.group(0)
-                break
-        
-        # Instagram patterns
-        ig_patterns = [
-            r'instagram\.com/[^"\s\'\)]+',
-            r'instagr\.am/[^"\s\'\)]+'
-        ]
-        
-        for pattern in ig_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                social_links['instagram'] = 'https://' + match.group(0)
-                break
-        
-        # YouTube patterns
-        yt_patterns = [
-            r'youtube\.com/[^"\s\'\)]+',
-            r'youtu\.be/[^"\s\'\)]+'
-        ]
-        
-        for pattern in yt_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                social_links['youtube'] = 'https://' + match.group(0)
-                break
-        
-        # TikTok patterns
-        tiktok_patterns = [
-            r'tiktok\.com/[^"\s\'\)]+',
-            r'@tiktok\.com/[^"\s\'\)]+'
-        ]
-        
-        for pattern in tiktok_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                social_links['tiktok'] = 'https://' + match.group(0)
-                break
-        
-        # Also check for common social media references in text
-        social_keywords = {
-            'facebook': ['facebook', 'fb.com'],
-            'twitter': ['twitter', 'x.com', '@twitter'],
-            'linkedin': ['linkedin', 'linkedin.com/in'],
-            'instagram': ['instagram', 'instagr.am', '@instagram'],
-            'youtube': ['youtube', 'youtu.be', '@youtube'],
-            'tiktok': ['tiktok', '@tiktok']
-        }
-        
-        for platform, keywords in social_keywords.items():
-            if social_links[platform] is None:
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        # Try to find handle/username after @ or in URL
-                        handle_pattern = r'[@/]' + re.escape(keyword.split('.')[-1] if '.' in keyword else keyword) + r'/([^\s"\']+)'
-                        match = re.search(handle_pattern, text, re.IGNORECASE)
-                        if match:
-                            username = match.group(1).strip('/')
-                            if username and len(username) > 2:
-                                base_url = {
-                                    'facebook': 'https://facebook.com/',
-                                    'twitter': 'https://twitter.com/',
-                                    'linkedin': 'https://linkedin.com/in/',
-                                    'instagram': 'https://instagram.com/',
-                                    'youtube': 'https://youtube.com/@',
-                                    'tiktok': 'https://tiktok.com/@'
-                                }
-                                social_links[platform] = base_url[platform] + username
-                                break
-        
-        return social_links
+        return extract_social_links(
+            text, networks=('facebook', 'twitter', 'linkedin', 'instagram', 'youtube', 'tiktok')
+        )
     
     def _validate_lead(self, lead: LeadData) -> bool:
         """Validate lead data before returning"""
@@ -322,4 +208,4 @@ class BaseScraper(ABC):
         pass
     
     def __str__(self):
-        return f"{self.name} Scraper"
\ No newline at end of file
+        return f"{self.name} Scraper"
\ No newline at end of file
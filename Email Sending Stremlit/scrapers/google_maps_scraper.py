@@ -25,64 +25,76 @@ class GoogleMapsScraper(BaseScraper):
                     business_name: Optional[str] = None,
                     limit: int = 50) -> List[LeadData]:
         """Search for leads on Google Maps with social media extraction"""
-        leads = []
-        
         try:
-            # Construct search query
-            query_parts = [niche]
-            if business_name:
-                query_parts.append(business_name)
-            query_parts.extend([city, country])
-            
-            search_query = " ".join(query_parts)
-            
-            # Search parameters
-            params = {
-                'q': search_query,
-                'hl': 'en',
-                'gl': country.lower()
-            }
-            
-            self._logger.info(f"Searching Google Maps for: {search_query}")
+            params = self._build_search_params(city, country, niche, business_name)
+            self._logger.info(f"Searching Google Maps for: {params['q']}")
             
             # Make request
             response = self._make_request(self.base_url, params=params)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract leads from search results
-            # Google Maps search results are typically in script tags with JSON data
-            script_tags = soup.find_all('script')
-            
-            for script in script_tags:
-                if script.string and 'window.APP_INITIALIZATION_STATE' in script.string:
-                    # Extract JSON data from script
-                    try:
-                        # Look for the data structure containing business information
-                        json_match = re.search(r'window\.APP_INITIALIZATION_STATE=(\[.*?\]);', script.string)
-                        if json_match:
-                            data = json.loads(json_match.group(1))
-                            
-                            # Parse the business data
-                            businesses = self._parse_google_maps_data(data, niche, city, country)
-                            leads.extend(businesses)
-                            
-                    except (json.JSONDecodeError, IndexError, KeyError) as e:
-                        self._logger.warning(f"Error parsing Google Maps data: {e}")
-                        continue
-            
-            # If no structured data found, try parsing HTML directly
-            if not leads:
-                leads = self._parse_google_maps_html(soup, niche, city, country)
-            
-            # Limit results
-            leads = leads[:limit]
-            
-            self._logger.info(f"Found {len(leads)} leads from Google Maps")
-            return leads
+            return self._parse_search_response(response.content, niche, city, country, limit)
             
         except Exception as e:
             self._logger.error(f"Error scraping Google Maps: {e}")
             return []
+    
+    def _build_search_params(self,
+                             city: str,
+                             country: str,
+                             niche: str,
+                             business_name: Optional[str] = None) -> Dict[str, str]:
+        """Build the Google Maps search query parameters"""
+        # Construct search query
+        query_parts = [niche]
+        if business_name:
+            query_parts.append(business_name)
+        query_parts.extend([city, country])
+        
+        return {
+            'q': " ".join(query_parts),
+            'hl': 'en',
+            'gl': country.lower()
+        }
+    
+    def _parse_search_response(self,
+                               content: bytes,
+                               niche: str,
+                               city: str,
+                               country: str,
+                               limit: int) -> List[LeadData]:
+        """Extract leads from a Google Maps search results page"""
+        leads = []
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Extract leads from search results
+        # Google Maps search results are typically in script tags with JSON data
+        script_tags = soup.find_all('script')
+        
+        for script in script_tags:
+            if script.string and 'window.APP_INITIALIZATION_STATE' in script.string:
+                # Extract JSON data from script
+                try:
+                    # Look for the data structure containing business information
+                    json_match = re.search(r'window\.APP_INITIALIZATION_STATE=(\[.*?\]);', script.string)
+                    if json_match:
+                        data = json.loads(json_match.group(1))
+                        
+                        # Parse the business data
+                        businesses = self._parse_google_maps_data(data, niche, city, country)
+                        leads.extend(businesses)
+                        
+                except (json.JSONDecodeError, IndexError, KeyError) as e:
+                    self._logger.warning(f"Error parsing Google Maps data: {e}")
+                    continue
+        
+        # If no structured data found, try parsing HTML directly
+        if not leads:
+            leads = self._parse_google_maps_html(soup, niche, city, country)
+        
+        # Limit results
+        leads = leads[:limit]
+        
+        self._logger.info(f"Found {len(leads)} leads from Google Maps")
+        return leads
 
     def _parse_google_maps_data(self, data: List, niche: str, city: str, country: str) -> List[LeadData]:
         """Parse Google Maps JSON data"""
@@ -181,4 +193,4 @@ class GoogleMapsScraper(BaseScraper):
         except Exception as e:
             self._logger.warning(f"Error extracting lead from text: {e}")
             
-        return None
\ No newline at end of file
+        return None
\ No newline at end of file
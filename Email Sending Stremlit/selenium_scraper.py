@@ -24,6 +24,7 @@ from selenium.common.exceptions import (
     WebDriverException
 )
 
+from http_client import HttpClient
 from robots_checker import RobotsChecker
 from utils import sleep_random
 
@@ -608,19 +609,15 @@ class SeleniumScraper:
     def _extract_email_from_website(self, website_url: str, timeout: int = 5) -> Optional[str]:
         """Extract email from business website."""
         try:
-            import requests
-            from requests.exceptions import RequestException
-            
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(
+            response = HttpClient.shared(self.config).get(
                 website_url,
                 headers=headers,
                 timeout=timeout,
-                allow_redirects=True,
-                verify=True
+                allow_redirects=True
             )
             
             if response.status_code == 200:
@@ -0,0 +1,161 @@
+"""
+Microbenchmark for email/social extraction.
+
+Compares the previous approach (uncompiled email regex plus a full
+BeautifulSoup html.parser pass and substring checks per link) with the
+shared extraction module over a corpus of saved pages.
+
+Usage:
+    python bench_extraction.py [pages_dir] [--repeat N]
+
+pages_dir holds saved *.html files (default: ./data/pages). When it is
+missing or empty, a synthetic corpus of business-site-like pages is used.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from extraction import extract_emails, extract_social_links
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+# (text, expected emails): obfuscations that must decode, and prose that must not
+EMAIL_CASES = [
+    ('<span>info [at] biz [dot] com</span>', ['info@biz.com']),
+    ('sales(at)shop.co.uk', ['sales@shop.co.uk']),
+    ('contact {at} firm {dot} io', ['contact@firm.io']),
+    ('Call us (at) 555.123.4567 today', []),
+    ('Open daily [at] 9.30 am', []),
+    ('Visit us at (at) main.st', []),
+]
+
+
+def legacy_extract(html_content: str) -> dict:
+    """Extraction as website enrichment did it before the shared module."""
+    details = {'email': None, 'social_media': {}}
+    emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', html_content)
+    if emails:
+        details['email'] = emails[0]
+
+    if BeautifulSoup:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        social = details['social_media']
+        for link in soup.find_all('a', href=True):
+            href = link['href'].lower()
+            if 'facebook.com' in href and 'facebook' not in social:
+                social['facebook'] = link['href']
+            elif 'instagram.com' in href and 'instagram' not in social:
+                social['instagram'] = link['href']
+            elif ('twitter.com' in href or 'x.com' in href) and 'twitter' not in social:
+                social['twitter'] = link['href']
+            elif 'linkedin.com' in href and 'linkedin' not in social:
+                social['linkedin'] = link['href']
+            elif 'youtube.com' in href and 'youtube' not in social:
+                social['youtube'] = link['href']
+            elif 'tiktok.com' in href and 'tiktok' not in social:
+                social['tiktok'] = link['href']
+    return details
+
+
+def shared_extract(html_content: str) -> dict:
+    """Extraction through the shared module."""
+    emails = extract_emails(html_content)
+    return {
+        'email': emails[0] if emails else None,
+        'social_media': extract_social_links(html_content)
+    }
+
+
+def synthetic_corpus(count: int = 50, seed: int = 7) -> List[str]:
+    """Build pages resembling small-business sites (nav, body text, footer links)."""
+    rng = random.Random(seed)
+    words = 'plumbing repair service quality local family owned since years call today free estimate'.split()
+    pages = []
+    for i in range(count):
+        paragraphs = ''.join(
+            f"<p class='text-{j}'>{' '.join(rng.choice(words) for _ in range(60))}</p>\n"
+            for j in range(rng.randint(40, 120))
+        )
+        nav = ''.join(f'<li><a href="/page-{j}">Page {j}</a></li>' for j in range(rng.randint(10, 40)))
+        footer = (
+            f'<a href="https://www.facebook.com/biz{i}">Facebook</a>'
+            f'<a href="https://instagram.com/biz{i}/">Instagram</a>'
+            f'<a href="https://www.linkedin.com/company/biz{i}">LinkedIn</a>'
+        )
+        contact = (
+            f'<a href="mailto:info@biz{i}.com">info@biz{i}.com</a>' if i % 3
+            else f'<span>info [at] biz{i} [dot] com</span>'
+        )
+        pages.append(
+            f'<html><head><title>Biz {i}</title></head><body><nav><ul>{nav}</ul></nav>'
+            f'{paragraphs}<footer>{contact}{footer}</footer></body></html>'
+        )
+    return pages
+
+
+def load_corpus(pages_dir: Path) -> List[str]:
+    """Load saved pages, falling back to the synthetic corpus."""
+    files = sorted(pages_dir.glob('*.html')) if pages_dir.exists() else []
+    if not files:
+        print(f"No saved pages in {pages_dir} - using synthetic corpus")
+        return synthetic_corpus()
+    return [f.read_text(encoding='utf-8', errors='ignore') for f in files]
+
+
+def check_cases() -> int:
+    """Run extract_emails over EMAIL_CASES and print mismatches; returns their number."""
+    failures = 0
+    for text, expected in EMAIL_CASES:
+        found = extract_emails(text)
+        if found != expected:
+            failures += 1
+            print(f"MISMATCH {text!r}: expected {expected}, got {found}")
+    print(f"Email cases: {len(EMAIL_CASES) - failures}/{len(EMAIL_CASES)} ok")
+    return failures
+
+
+def bench(name: str, func, pages: List[str], repeat: int) -> float:
+    """Run func over every page repeat times and print the best pass."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:<10} {best * 1000:9.1f} ms/pass  {best / len(pages) * 1000:7.2f} ms/page")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark email/social extraction')
+    parser.add_argument('pages_dir', nargs='?', default='./data/pages', help='Directory of saved *.html pages')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the corpus (best is reported)')
+    args = parser.parse_args()
+
+    pages = load_corpus(Path(args.pages_dir))
+    size = sum(len(p) for p in pages)
+    print(f"Corpus: {len(pages)} pages, {size / 1024:.0f} KB")
+    if not BeautifulSoup:
+        print("BeautifulSoup not installed - legacy timing covers the email regex only")
+
+    legacy = bench('legacy', legacy_extract, pages, args.repeat)
+    shared = bench('shared', shared_extract, pages, args.repeat)
+    print(f"Speedup: {legacy / shared:.1f}x")
+
+    found = sum(1 for p in pages if shared_extract(p)['email'])
+    print(f"Emails found: legacy {sum(1 for p in pages if legacy_extract(p)['email'])}, shared {found}")
+
+    return 1 if check_cases() else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+End-to-end benchmark of the Google Maps extractor against a replayed recording.
+
+Runs SeleniumScraper in headless Chrome against maps_replay.ReplayServer, so
+no request reaches Google, and reports leads/min plus the scraper's own
+RunMetrics: per-phase latency and WebDriver commands per lead. Without
+--recording a synthetic fixture is generated, which also lets the run check
+extracted values.
+
+Usage:
+    python bench_maps.py [--recording DIR] [--depth details] [--max N] [--repeat N]
+                         [--latency-scale 1.0] [--no-sleep] [--json report.json]
+                         [--min-leads-per-min N]
+
+CI on a plain Linux box needs Chrome or Chromium (Selenium Manager fetches a
+matching chromedriver). --min-leads-per-min makes the run exit non-zero on a
+throughput regression.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import selenium_scraper
+from config import Config
+from maps_replay import ReplayServer, synthesize
+from metrics import RunMetrics
+from selenium_scraper import SeleniumScraper
+
+# Fields compared against a synthetic recording's expected values
+CHECKED_FIELDS = ['address', 'phone', 'website', 'category', 'rating', 'reviews']
+
+
+def check_accuracy(leads: List[Dict], expected: List[Dict]) -> Dict[str, float]:
+    """Share of leads whose field matches the synthetic recording, per field."""
+    truth = {place['name']: place for place in expected}
+    matched = [lead for lead in leads if lead.get('name') in truth]
+    accuracy = {'names': round(len(matched) / len(leads), 3) if leads else 0.0}
+    for field in CHECKED_FIELDS:
+        hits = sum(
+            1 for lead in matched
+            if lead.get(field) is not None and str(lead[field]).rstrip('/') == str(truth[lead['name']][field])
+        )
+        accuracy[field] = round(hits / len(matched), 3) if matched else 0.0
+    return accuracy
+
+
+def run_once(args, recording_dir: str, manifest: Dict) -> Dict:
+    """One scrape against a fresh replay server and browser."""
+    config = Config(args.config)
+    server = ReplayServer(recording_dir, latency_scale=args.latency_scale).start()
+
+    # Offline and side-effect free: no persisted selector/rate state, no HTTP cache
+    config.scraping['maps_base_url'] = server.base_url
+    config.selectors['persist'] = False
+    config.rate['persist'] = False
+    config.http_cache['enabled'] = False
+    if args.no_sleep:
+        config.rate['enabled'] = False
+        config.scraping['scroll_delay'] = 0
+
+    metrics = RunMetrics()
+    try:
+        scraper = SeleniumScraper(
+            config,
+            headless=not args.headed,
+            delay=0 if args.no_sleep else args.delay,
+            metrics=metrics
+        )
+    except Exception:
+        server.stop()
+        raise
+
+    search = manifest['searches'][0]
+    started = time.perf_counter()
+    try:
+        leads = scraper.scrape_google_maps(search['query'], '', max_results=args.max, depth=args.depth)
+    finally:
+        elapsed = time.perf_counter() - started
+        scraper.close()
+        server.stop()
+
+    metrics.count('leads', len(leads))
+    report = metrics.report()
+    result = {
+        'leads': len(leads),
+        'elapsed_s': round(elapsed, 2),
+        'leads_per_min': round(len(leads) / elapsed * 60, 1) if elapsed else 0.0,
+        'webdriver': report['webdriver'],
+        'phases': report['phases'],
+        'counters': report['counters'],
+        'replay_requests': server.stats
+    }
+    if manifest.get('expected'):
+        result['accuracy'] = check_accuracy(leads, manifest['expected'])
+    return result
+
+
+def print_run(index: int, run: Dict):
+    webdriver = run['webdriver']
+    print(f"\nRun {index}: {run['leads']} leads in {run['elapsed_s']}s -> {run['leads_per_min']} leads/min, "
+          f"{webdriver['commands']} WebDriver commands ({webdriver['commands_per_lead']}/lead)")
+    print(f"  {'phase':<15} {'count':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for phase, stats in run['phases'].items():
+        print(f"  {phase:<15} {stats['count']:>6} {stats['total_s']:>9.2f} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+    print("  commands: " + ', '.join(
+        f"{name} {stats['count']}" for name, stats in webdriver['by_command'].items()
+    ))
+    if 'accuracy' in run:
+        print("  accuracy: " + ', '.join(f"{field} {share:.0%}" for field, share in run['accuracy'].items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SeleniumScraper against a replayed Maps recording')
+    parser.add_argument('--recording', help='Recording directory (default: generate a synthetic one)')
+    parser.add_argument('--places', type=int, default=60, help='Places in the synthetic recording (default: 60)')
+    parser.add_argument('--depth', choices=['list', 'details', 'website'], default='details',
+                        help='Scrape depth; website visits real sites (default: details)')
+    parser.add_argument('--max', type=int, default=1000, help='Maximum leads per run (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs to average (default: 1)')
+    parser.add_argument('--latency-scale', type=float, default=1.0,
+                        help='Multiplier for recorded response times, 0 for none (default: 1.0)')
+    parser.add_argument('--no-sleep', action='store_true',
+                        help="Skip the scraper's fixed waits and pacing to measure its own overhead")
+    parser.add_argument('--delay', type=float, default=1.5, help='Scraper delay between actions (default: 1.5)')
+    parser.add_argument('--headed', action='store_true', help='Show the browser')
+    parser.add_argument('--config', default='config.yaml', help='Base configuration (default: config.yaml)')
+    parser.add_argument('--json', help='Write the report to this file')
+    parser.add_argument('--min-leads-per-min', type=float, default=None,
+                        help='Exit with status 1 when the mean throughput is lower')
+    args = parser.parse_args()
+
+    if args.no_sleep:
+        # Panels are awaited by title after each click, so recorded latency still applies
+        selenium_scraper.sleep_random = lambda *a, **k: None
+
+    recording_dir = args.recording
+    if not recording_dir:
+        recording_dir = tempfile.mkdtemp(prefix='maps-replay-')
+        synthesize(recording_dir, places=args.places)
+        print(f"Synthetic recording: {args.places} places in {recording_dir}")
+    manifest = json.loads(open(f"{recording_dir}/manifest.json", encoding='utf-8').read())
+
+    runs = []
+    for index in range(1, args.repeat + 1):
+        runs.append(run_once(args, recording_dir, manifest))
+        print_run(index, runs[-1])
+
+    mean_rate = statistics.mean(run['leads_per_min'] for run in runs)
+    print(f"\nMean: {mean_rate:.1f} leads/min over {len(runs)} run(s) "
+          f"(depth {args.depth}, latency x{args.latency_scale}{', no sleeps' if args.no_sleep else ''})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'recording': recording_dir,
+                'depth': args.depth,
+                'latency_scale': args.latency_scale,
+                'no_sleep': args.no_sleep,
+                'mean_leads_per_min': round(mean_rate, 1),
+                'runs': runs
+            }, f, indent=2)
+
+    if any(run['leads'] == 0 for run in runs):
+        print("FAIL: a run extracted no leads")
+        return 1
+    if args.min_leads_per_min is not None and mean_rate < args.min_leads_per_min:
+        print(f"FAIL: {mean_rate:.1f} leads/min is below {args.min_leads_per_min}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
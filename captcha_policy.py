@@ -0,0 +1,256 @@
+"""
+Captcha handling policies.
+
+The scraper used to block on input() whenever a captcha appeared, which
+stalls background threads, Streamlit sessions and headless runs forever.
+This module decides what a single worker does instead:
+
+- manual:  wait for the user to solve it (interactive terminal only)
+- requeue: stop this worker and raise CaptchaBlocked so the job can be retried later
+- rotate:  restart the browser with a fresh profile, then requeue the job
+- backoff: cool down exponentially, reload, and continue if the captcha is gone
+- auto:    manual when interactive, backoff otherwise
+
+Captcha events are recorded per egress identity (Chrome profile / proxy)
+in a process-wide CaptchaTracker so callers can route new jobs around
+identities that are currently hot. Handling only ever blocks the calling
+worker; other workers keep running.
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class CaptchaBlocked(Exception):
+    """Raised when a worker must stop because its identity hit a captcha."""
+
+    def __init__(self, identity: str, retry_after: float, url: Optional[str] = None, rotated: bool = False):
+        super().__init__(
+            f"Captcha on identity '{identity}' - retry after {retry_after:.0f}s"
+        )
+        self.identity = identity
+        self.retry_after = retry_after
+        self.url = url
+        # The scraper already runs under a new identity and can retry right away
+        self.rotated = rotated
+        # Leads collected before the captcha, filled in by the scraper
+        self.partial_leads: List[Dict] = []
+
+
+class CaptchaTracker:
+    """
+    Thread-safe record of captcha events per egress identity.
+
+    Each captcha extends the identity's cool-down exponentially
+    (cooldown_base * 2^(streak-1), capped at cooldown_max). A clean page
+    resets the streak.
+    """
+
+    def __init__(self, cooldown_base: float = 60, cooldown_max: float = 1800):
+        """
+        Initialize the tracker.
+
+        Args:
+            cooldown_base: Cool-down after the first captcha in seconds
+            cooldown_max: Upper bound for the cool-down in seconds
+        """
+        self.cooldown_base = cooldown_base
+        self.cooldown_max = cooldown_max
+        self._lock = threading.Lock()
+        self._identities: Dict[str, Dict] = {}
+
+    def _entry(self, identity: str) -> Dict:
+        return self._identities.setdefault(identity, {
+            'events': [],
+            'streak': 0,
+            'blocked_until': 0.0
+        })
+
+    def record(self, identity: str, url: Optional[str] = None) -> float:
+        """
+        Record a captcha for an identity.
+
+        Args:
+            identity: Egress identity (profile / proxy)
+            url: Page where the captcha appeared
+
+        Returns:
+            Cool-down in seconds before the identity should be used again
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entry(identity)
+            entry['streak'] += 1
+            cooldown = min(self.cooldown_base * 2 ** (entry['streak'] - 1), self.cooldown_max)
+            entry['blocked_until'] = now + cooldown
+            entry['events'].append({'time': now, 'url': url, 'cooldown': cooldown})
+            return cooldown
+
+    def record_success(self, identity: str):
+        """Reset the captcha streak after a clean page."""
+        with self._lock:
+            if identity in self._identities:
+                self._identities[identity]['streak'] = 0
+
+    def cooldown_remaining(self, identity: str) -> float:
+        """Seconds until the identity is usable again (0 if usable now)."""
+        with self._lock:
+            entry = self._identities.get(identity)
+            if not entry:
+                return 0.0
+            return max(0.0, entry['blocked_until'] - time.time())
+
+    def is_hot(self, identity: str) -> bool:
+        """Whether the identity is still cooling down."""
+        return self.cooldown_remaining(identity) > 0
+
+    def pick(self, identities: Iterable[str]) -> Optional[str]:
+        """
+        Choose the identity least affected by captchas.
+
+        Identities that are cooling down come last; ties are broken by the
+        number of recorded events.
+
+        Args:
+            identities: Candidate identities
+
+        Returns:
+            Best identity, or None if no candidates were given
+        """
+        candidates = list(identities)
+        if not candidates:
+            return None
+
+        now = time.time()
+        with self._lock:
+            def sort_key(identity):
+                entry = self._identities.get(identity)
+                if not entry:
+                    return (0.0, 0)
+                return (max(0.0, entry['blocked_until'] - now), len(entry['events']))
+
+            return min(candidates, key=sort_key)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-identity captcha counts and remaining cool-down."""
+        now = time.time()
+        with self._lock:
+            return {
+                identity: {
+                    'captchas': len(entry['events']),
+                    'streak': entry['streak'],
+                    'cooldown_remaining': max(0.0, entry['blocked_until'] - now)
+                }
+                for identity, entry in self._identities.items()
+            }
+
+
+# Process-wide tracker shared by every scraper instance
+default_tracker = CaptchaTracker()
+
+
+class CaptchaPolicy:
+    """Decide how a scraper worker reacts to a detected captcha."""
+
+    ACTIONS = ('auto', 'manual', 'requeue', 'rotate', 'backoff')
+
+    def __init__(
+        self,
+        action: str = 'auto',
+        tracker: Optional[CaptchaTracker] = None,
+        on_captcha: Optional[Callable[[Dict], None]] = None,
+        max_backoff_wait: float = 300
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            action: One of ACTIONS
+            tracker: Captcha tracker (defaults to the process-wide tracker)
+            on_captcha: Optional callback receiving an event dict for every captcha
+            max_backoff_wait: Longest in-place cool-down before requeueing instead
+        """
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown captcha action '{action}', expected one of {self.ACTIONS}")
+
+        self.action = action
+        self.tracker = tracker or default_tracker
+        self.on_captcha = on_captcha
+        self.max_backoff_wait = max_backoff_wait
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, on_captcha: Optional[Callable[[Dict], None]] = None) -> 'CaptchaPolicy':
+        """Build a policy from the captcha section of the configuration."""
+        captcha = config.captcha
+        default_tracker.cooldown_base = captcha.get('cooldown_base', default_tracker.cooldown_base)
+        default_tracker.cooldown_max = captcha.get('cooldown_max', default_tracker.cooldown_max)
+        return cls(
+            action=captcha.get('policy', 'auto'),
+            on_captcha=on_captcha,
+            max_backoff_wait=captcha.get('max_backoff_wait', 300)
+        )
+
+    def resolve_action(self, scraper) -> str:
+        """Turn 'auto' into a concrete action for this worker."""
+        if self.action != 'auto':
+            return self.action
+
+        interactive = (
+            sys.stdin is not None and sys.stdin.isatty() and
+            not scraper.headless and
+            threading.current_thread() is threading.main_thread()
+        )
+        return 'manual' if interactive else 'backoff'
+
+    def handle(self, scraper):
+        """
+        React to a captcha detected by a scraper.
+
+        Args:
+            scraper: SeleniumScraper whose page shows a captcha
+
+        Raises:
+            CaptchaBlocked: When the worker should stop and its job be requeued
+        """
+        identity = scraper.identity
+        url = scraper.driver.current_url if scraper.driver else None
+        cooldown = self.tracker.record(identity, url)
+        action = self.resolve_action(scraper)
+
+        self.logger.warning(
+            f"Captcha on identity '{identity}' (action: {action}, cool-down: {cooldown:.0f}s)"
+        )
+
+        if self.on_captcha:
+            try:
+                self.on_captcha({
+                    'identity': identity,
+                    'url': url,
+                    'action': action,
+                    'cooldown': cooldown,
+                    'time': time.time()
+                })
+            except Exception as e:
+                self.logger.warning(f"Captcha callback failed: {e}")
+
+        if action == 'manual':
+            scraper._wait_for_manual_captcha()
+            return
+
+        if action == 'rotate':
+            scraper.rotate_identity(self.tracker)
+            raise CaptchaBlocked(identity, 0, url, rotated=True)
+
+        if action == 'backoff' and cooldown <= self.max_backoff_wait:
+            self.logger.info(f"Cooling down for {cooldown:.0f}s before retrying")
+            time.sleep(cooldown)
+            scraper.driver.refresh()
+            if not scraper._detect_captcha(force=True):
+                self.tracker.record_success(identity)
+                return
+
+        raise CaptchaBlocked(identity, self.tracker.cooldown_remaining(identity), url)
@@ -7,6 +7,7 @@ It respects robots.txt, handles captchas gracefully, and exports to multiple for
 """
 
 import argparse
+import json
 import sys
 import os
 import logging
@@ -16,10 +17,13 @@ import yaml
 from colorama import init, Fore, Style
 
 from selenium_scraper import SeleniumScraper
+from captcha_policy import CaptchaBlocked
 from exporter import DataExporter
 from dedupe import Deduplicator
 from config import Config
-from utils import setup_logging, validate_location
+from maps_replay import MapsRecorder
+from metrics import RunMetrics
+from utils import setup_logging, validate_location, filter_leads
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -35,19 +39,19 @@ Examples:
   %(prog)s --query "coffee shop" --location "Lahore, Pakistan" --max 50
   %(prog)s --query "restaurants" --location "New York" --tile-mode --max 200
   %(prog)s --query "hotels" --location "Paris" --guest-mode --format csv json
+  %(prog)s --query "dentist" --location "Austin, USA" --depth list --max 300
+  %(prog)s --hydrate data/leads_20250101_120000.json --min-rating 4.5 --depth website
         """
     )
     
-    # Required arguments
+    # Required arguments (unless hydrating a previous export)
     parser.add_argument(
         '--query', '-q',
-        required=True,
         help='Business type to search for (e.g., "coffee shop", "restaurant")'
     )
     
     parser.add_argument(
         '--location', '-l',
-        required=True,
         help='Geographic location (e.g., "Lahore, Pakistan", "New York, USA")'
     )
     
@@ -140,7 +144,51 @@ Examples:
         help='Path to configuration file (default: config.yaml)'
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        '--depth',
+        choices=['list', 'details', 'website'],
+        default='website',
+        help='list: feed cards only (fastest), details: open each place, '
+             'website: also visit business websites for emails (default: website)'
+    )
+    
+    parser.add_argument(
+        '--hydrate',
+        type=str,
+        default=None,
+        help='JSON export from a --depth list run to fill in details for (uses --depth details/website)'
+    )
+    
+    parser.add_argument(
+        '--min-rating',
+        type=float,
+        default=None,
+        help='Only keep leads with at least this rating'
+    )
+    
+    parser.add_argument(
+        '--min-reviews',
+        type=int,
+        default=None,
+        help='Only keep leads with at least this many reviews'
+    )
+    
+    parser.add_argument(
+        '--record',
+        type=str,
+        default=None,
+        metavar='DIR',
+        help='Record the Maps pages of this run into DIR for offline replay (see maps_replay.py)'
+    )
+    
+    args = parser.parse_args()
+    
+    if not args.hydrate and not (args.query and args.location):
+        parser.error('--query and --location are required unless --hydrate is given')
+    if args.hydrate and args.depth == 'list':
+        parser.error('--hydrate needs --depth details or --depth website')
+    
+    return args
 
 
 def print_banner():
@@ -160,14 +208,32 @@ def print_banner():
     print(banner)
 
 
-def print_summary(leads, elapsed_time):
-    """Print scraping summary."""
+def print_summary(leads, elapsed_time, metrics=None):
+    """Print scraping summary, with per-phase timings when metrics are given."""
     print(f"\n{Fore.GREEN}{'='*70}")
     print(f"{Fore.GREEN}  SCRAPING COMPLETE!")
     print(f"{Fore.GREEN}{'='*70}")
     print(f"{Fore.WHITE}  Total Leads Collected: {Fore.YELLOW}{len(leads)}")
     print(f"{Fore.WHITE}  Time Elapsed: {Fore.YELLOW}{elapsed_time:.2f} seconds")
     print(f"{Fore.WHITE}  Average Time per Lead: {Fore.YELLOW}{elapsed_time/len(leads):.2f} seconds" if leads else "")
+    
+    if metrics and metrics.phases:
+        # Phases nest (search includes navigation, details includes website), so totals overlap
+        print(f"{Fore.GREEN}{'-'*70}")
+        print(f"{Fore.WHITE}  {'Phase':<16}{'Count':>7}{'Total s':>10}{'Mean ms':>10}{'p95 ms':>10}{'Max ms':>10}")
+        for row in metrics.summary_rows():
+            print(
+                f"{Fore.WHITE}  {row['phase']:<16}{Fore.YELLOW}{row['count']:>7}{row['total_s']:>10.2f}"
+                f"{row['mean_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['max_ms']:>10.1f}"
+            )
+        
+        commands = sum(metrics.webdriver_calls.values())
+        per_lead = f" ({commands / len(leads):.1f} per lead)" if leads else ""
+        print(f"{Fore.WHITE}  WebDriver Commands: {Fore.YELLOW}{commands}{per_lead}")
+        if metrics.webdriver_calls:
+            top = ', '.join(f"{name} {n}" for name, n in metrics.webdriver_calls.most_common(5))
+            print(f"{Fore.WHITE}  Most Frequent: {Fore.YELLOW}{top}")
+    
     print(f"{Fore.GREEN}{'='*70}{Style.RESET_ALL}\n")
 
 
@@ -191,32 +257,56 @@ def main():
         logger = setup_logging(config)
         
         # Validate inputs
-        logger.info(f"Query: {args.query} | Location: {args.location}")
+        if args.hydrate:
+            logger.info(f"Hydrating leads from: {args.hydrate}")
+        else:
+            logger.info(f"Query: {args.query} | Location: {args.location}")
         
-        if not validate_location(args.location):
+        if not args.hydrate and not validate_location(args.location):
             logger.warning("Location format may not be optimal. Consider using 'City, Country' format.")
         
         # Initialize scraper
         logger.info("Initializing Selenium scraper...")
+        metrics = RunMetrics()
+        recorder = MapsRecorder(args.record) if args.record else None
+        if recorder:
+            logger.info(f"Recording Maps pages to: {args.record}")
         scraper = SeleniumScraper(
             config=config,
             headless=args.headless,
             guest_mode=args.guest_mode if not args.profile else False,
             profile=args.profile,
-            delay=args.delay
+            delay=args.delay,
+            recorder=recorder,
+            metrics=metrics
         )
         
         # Start scraping
         start_time = datetime.now()
         logger.info(f"Starting scraping session at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
-        leads = scraper.scrape_google_maps(
-            query=args.query,
-            location=args.location,
-            max_results=args.max,
-            tile_mode=args.tile_mode,
-            tile_size=args.tile_size
-        )
+        try:
+            if args.hydrate:
+                with open(args.hydrate, 'r', encoding='utf-8') as f:
+                    leads = filter_leads(json.load(f), args.min_rating, args.min_reviews)
+                logger.info(f"Hydrating {len(leads)} leads that pass filters (depth: {args.depth})")
+                leads = scraper.hydrate_details(leads, depth=args.depth)
+            else:
+                leads = scraper.scrape_google_maps(
+                    query=args.query,
+                    location=args.location,
+                    max_results=args.max,
+                    tile_mode=args.tile_mode,
+                    tile_size=args.tile_size,
+                    depth=args.depth
+                )
+        except CaptchaBlocked as e:
+            leads = e.partial_leads
+            print(f"{Fore.YELLOW}⚠ {e} - keeping {len(leads)} leads collected so far{Style.RESET_ALL}")
+            logger.warning(f"Stopped by captcha: {e}")
+        if not args.hydrate:
+            # Hydration counts leads_hydrated itself
+            metrics.count('leads', len(leads))
         
         # Close scraper
         scraper.close()
@@ -227,10 +317,14 @@ def main():
         
         # Deduplicate
         logger.info("Deduplicating results...")
-        deduplicator = Deduplicator(config)
+        deduplicator = Deduplicator(config, metrics=metrics)
         unique_leads = deduplicator.deduplicate(leads)
         logger.info(f"✓ {len(unique_leads)} unique leads after deduplication")
         
+        if args.min_rating is not None or args.min_reviews is not None:
+            unique_leads = filter_leads(unique_leads, args.min_rating, args.min_reviews)
+            logger.info(f"✓ {len(unique_leads)} leads pass rating/review filters")
+        
         # Optional OSM enrichment
         if args.enrich_osm:
             logger.info("Enriching with OpenStreetMap data...")
@@ -240,7 +334,7 @@ def main():
         
         # Export results
         logger.info("Exporting results...")
-        exporter = DataExporter(config, output_dir=args.output_dir)
+        exporter = DataExporter(config, output_dir=args.output_dir, metrics=metrics)
         
         formats = args.format if 'all' not in args.format else ['csv', 'json', 'sqlite']
         
@@ -253,10 +347,19 @@ def main():
             filename=base_filename
         )
         
+        exported_files += exporter.export_run_report(
+            base_filename,
+            query=args.query,
+            location=args.location,
+            hydrate=args.hydrate,
+            depth=args.depth,
+            unique_leads=len(unique_leads)
+        )
+        
         # Print summary
         end_time = datetime.now()
         elapsed = (end_time - start_time).total_seconds()
-        print_summary(unique_leads, elapsed)
+        print_summary(unique_leads, elapsed, metrics)
         
         # Print exported files
         print(f"{Fore.CYAN}Exported Files:{Style.RESET_ALL}")
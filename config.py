@@ -31,7 +31,10 @@ class Config:
                 'request_timeout': 30,
                 'retry_attempts': 3,
                 'backoff_multiplier': 2,
-                'max_leads_per_session': 500
+                'max_leads_per_session': 500,
+                'search_mode': 'url',
+                'search_zoom': 13,
+                'stream_results': True
             },
             'selenium': {
                 'page_load_timeout': 60,
@@ -70,17 +73,76 @@ class Config:
                 'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 'console': True
             },
+            'captcha': {
+                'check_every': 5,
+                'policy': 'auto',
+                'cooldown_base': 60,
+                'cooldown_max': 1800,
+                'max_backoff_wait': 300,
+                'max_requeues': 2,
+                'profiles': []
+            },
+            'rate': {
+                'enabled': True,
+                'min_rate': 0.05,
+                'max_rate': 1.0,
+                'additive_increase': 0.02,
+                'decrease_factor': 0.5,
+                'jitter': 0.3,
+                'persist': True,
+                'state_file': './data/rate_state.json'
+            },
+            'selectors': {
+                'persist': True,
+                'stats_file': './data/selector_stats.json'
+            },
+            'crawler': {
+                'max_pages': 5,
+                'workers': 3,
+                'use_sitemap': True,
+                'min_social_links': 2
+            },
+            'http': {
+                'pool_hosts': 50,
+                'max_per_host': 4,
+                'connect_timeout': 5,
+                'read_timeout': 15,
+                'retries': 2,
+                'backoff_factor': 0.5
+            },
+            'politeness': {
+                'default_delay': 1.0,
+                'max_delay': 30,
+                'use_robots': True,
+                'workers': 8
+            },
+            'http_cache': {
+                'enabled': True,
+                'path': './data/http_cache.sqlite',
+                'ttl': 604800,
+                'max_size_mb': 200
+            },
             'robots': {
                 'enabled': True,
                 'user_agent': '*',
                 'cache_enabled': True,
-                'cache_duration': 3600
+                'cache_duration': 3600,
+                'negative_cache_duration': 3600,
+                'error_cache_duration': 300,
+                'cache_file': './data/robots_cache.json',
+                'flush_every': 50,
+                'flush_interval': 30,
+                'max_hosts': 10000
             },
             'enrichment': {
                 'osm_enabled': False,
                 'overpass_url': 'https://overpass-api.de/api/interpreter',
                 'nominatim_url': 'https://nominatim.openstreetmap.org',
                 'osm_delay': 1.0
+            },
+            'metrics': {
+                'report': True,
+                'prometheus_file': None
             }
         }
         
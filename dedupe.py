@@ -9,6 +9,8 @@ import logging
 from typing import List, Dict, Set, Tuple
 from difflib import SequenceMatcher
 
+from metrics import RunMetrics, timed
+
 
 class Deduplicator:
     """
@@ -20,18 +22,21 @@ class Deduplicator:
     3. Coordinate-based proximity matching
     """
     
-    def __init__(self, config):
+    def __init__(self, config, metrics=None):
         """
         Initialize the deduplicator.
         
         Args:
             config: Configuration object
+            metrics: RunMetrics shared with the rest of the run (optional)
         """
         self.config = config
+        self.metrics = metrics or RunMetrics()
         self.logger = logging.getLogger(__name__)
         self.threshold = config.deduplication['fuzzy_threshold']
         self.prefer_place_id = config.deduplication['prefer_place_id']
     
+    @timed('dedupe')
     def deduplicate(self, leads: List[Dict]) -> List[Dict]:
         """
         Deduplicate a list of business leads.
@@ -76,6 +81,7 @@ class Deduplicator:
             unique_leads.append(lead)
         
         removed_count = len(leads) - len(unique_leads)
+        self.metrics.count('duplicates_removed', removed_count)
         self.logger.info(f"Removed {removed_count} duplicates")
         
         return unique_leads
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """
 Diagnostic script to check Google Maps page structure
+
+By default this prints the selector report recorded by the scraper
+(see selector_registry.py). Pass --live to probe Google Maps manually.
 """
 
+import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -97,5 +101,17 @@ def diagnose_google_maps():
     finally:
         driver.quit()
 
+def print_selector_report():
+    """Print hit/miss/latency stats recorded by previous scraper runs"""
+    from config import Config
+    from selector_registry import SelectorRegistry
+    
+    config = Config()
+    registry = SelectorRegistry(config.selectors.get('stats_file', './data/selector_stats.json'))
+    print(registry.report())
+
 if __name__ == "__main__":
-    diagnose_google_maps()
+    if '--live' in sys.argv:
+        diagnose_google_maps()
+    else:
+        print_selector_report()
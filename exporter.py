@@ -12,6 +12,8 @@ import logging
 from pathlib import Path
 from typing import List, Dict
 import pandas as pd
+
+from metrics import RunMetrics
 try:
     import gspread
     from oauth2client.service_account import ServiceAccountCredentials
@@ -23,15 +25,17 @@ except ImportError:
 class DataExporter:
     """Export business leads to multiple formats."""
     
-    def __init__(self, config, output_dir='./data'):
+    def __init__(self, config, output_dir='./data', metrics=None):
         """
         Initialize the data exporter.
         
         Args:
             config: Configuration object
             output_dir: Directory for output files
+            metrics: RunMetrics shared with the rest of the run (optional)
         """
         self.config = config
+        self.metrics = metrics or RunMetrics()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
@@ -51,29 +55,60 @@ class DataExporter:
         exported_files = []
         
         for fmt in formats:
-            if fmt == 'csv':
-                file_path = self._export_csv(data, filename)
-            elif fmt == 'json':
-                file_path = self._export_json(data, filename)
-            elif fmt == 'sqlite':
-                file_path = self._export_sqlite(data, filename)
-            elif fmt == 'excel':
-                file_path = self._export_excel(data, filename)
-            elif fmt == 'google_sheets':
-                # credentials should be passed in config or as extra param
-                # For now, we expect gsheets_creds in config.scraping or passed via extra param
-                creds = self.config._config.get('google_sheets_creds')
-                file_path = self._export_google_sheets(data, filename, creds)
-            else:
-                self.logger.warning(f"Unknown format: {fmt}")
-                continue
+            with self.metrics.span(f'export_{fmt}'):
+                if fmt == 'csv':
+                    file_path = self._export_csv(data, filename)
+                elif fmt == 'json':
+                    file_path = self._export_json(data, filename)
+                elif fmt == 'sqlite':
+                    file_path = self._export_sqlite(data, filename)
+                elif fmt == 'excel':
+                    file_path = self._export_excel(data, filename)
+                elif fmt == 'google_sheets':
+                    # credentials should be passed in config or as extra param
+                    # For now, we expect gsheets_creds in config.scraping or passed via extra param
+                    creds = self.config._config.get('google_sheets_creds')
+                    file_path = self._export_google_sheets(data, filename, creds)
+                else:
+                    self.logger.warning(f"Unknown format: {fmt}")
+                    continue
             
             if file_path:
                 exported_files.append(file_path)
+                self.metrics.count('files_exported')
                 self.logger.info(f"✓ Exported to {fmt.upper()}: {file_path}")
         
+        if exported_files:
+            self.metrics.count('rows_exported', len(data))
         return exported_files
     
+    def export_run_report(self, filename: str, **context) -> List[str]:
+        """
+        Write the run's metrics next to the exported data.
+        
+        Writes {filename}_metrics.json unless metrics.report is false, and
+        Prometheus text to metrics.prometheus_file when configured (e.g. a
+        node_exporter textfile collector directory).
+        
+        Args:
+            filename: Base filename of the exported data (without extension)
+            **context: Extra report fields (query, location, depth, ...)
+            
+        Returns:
+            List of created file paths
+        """
+        settings = self.config.metrics
+        written = []
+        
+        if settings.get('report', True):
+            written.append(self.metrics.write_report(self.output_dir / f"{filename}_metrics.json", **context))
+        if settings.get('prometheus_file'):
+            written.append(self.metrics.write_prometheus(settings['prometheus_file']))
+        
+        for file_path in written:
+            self.logger.info(f"✓ Wrote run metrics: {file_path}")
+        return written
+    
     def _export_csv(self, data: List[Dict], filename: str) -> str:
         """Export to CSV format with email field."""
         file_path = self.output_dir / f"{filename}.csv"
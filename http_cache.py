@@ -0,0 +1,229 @@
+"""
+Persistent HTTP cache for website enrichment.
+
+Re-scraping a city re-visits the same business websites, and chains share
+one website across many places. This module keeps fetched pages in a
+SQLite file keyed by URL, revalidates stale pages with ETag/Last-Modified
+conditional requests, evicts least-recently-used entries once the store
+grows past its size bound, and remembers the extracted email/social result
+per domain so duplicate websites cost nothing.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class HttpCache:
+    """
+    SQLite-backed page and per-domain result cache.
+
+    Pages younger than the TTL are served without touching the network;
+    older pages are kept for conditional revalidation until evicted.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: str, ttl: float = 604800, max_size_mb: float = 200):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite file holding the cache
+            ttl: Seconds a page or domain result is served without revalidation
+            max_size_mb: Size bound for stored page bodies before LRU eviction
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'result_hits': 0,
+            'evicted': 0
+        }
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT,
+                size INTEGER,
+                fetched_at REAL,
+                accessed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at);
+            CREATE TABLE IF NOT EXISTS results (
+                domain TEXT PRIMARY KEY,
+                data TEXT,
+                fetched_at REAL,
+                accessed_at REAL
+            );
+        ''')
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls, config) -> Optional['HttpCache']:
+        """Return the process-wide cache from config (None when disabled)."""
+        settings = config.http_cache
+        if not settings.get('enabled', True):
+            return None
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                try:
+                    cls._shared = cls(
+                        db_path=settings.get('path', './data/http_cache.sqlite'),
+                        ttl=settings.get('ttl', 604800),
+                        max_size_mb=settings.get('max_size_mb', 200)
+                    )
+                except Exception as e:
+                    logging.getLogger(__name__).warning(f"HTTP cache disabled: {e}")
+                    return None
+            return cls._shared
+
+    def get_page(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached page.
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Dict with final_url, etag, last_modified, body and 'fresh'
+            (younger than the TTL), or None if the URL is not cached
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT final_url, etag, last_modified, body, fetched_at FROM pages WHERE url = ?',
+                (url,)
+            ).fetchone()
+            if not row:
+                return None
+            self._conn.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (now, url))
+            self._conn.commit()
+
+        final_url, etag, last_modified, body, fetched_at = row
+        return {
+            'final_url': final_url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+            'fresh': now - fetched_at < self.ttl
+        }
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a stale entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put_page(
+        self,
+        url: str,
+        final_url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Store a freshly downloaded page and evict old entries if over budget."""
+        now = time.time()
+        size = len(body.encode('utf-8', 'ignore'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages '
+                '(url, final_url, etag, last_modified, body, size, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, final_url, etag, last_modified, body, size, now, now)
+            )
+            self._conn.commit()
+            self._evict()
+
+    def touch_page(self, url: str):
+        """Mark a page as fresh again after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?',
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def get_result(self, domain: str) -> Optional[Dict]:
+        """Return the extracted email/social result for a domain if still fresh."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, fetched_at FROM results WHERE domain = ?', (domain,)
+            ).fetchone()
+            if not row or now - row[1] >= self.ttl:
+                return None
+            self._conn.execute('UPDATE results SET accessed_at = ? WHERE domain = ?', (now, domain))
+            self._conn.commit()
+            self.stats['result_hits'] += 1
+        return json.loads(row[0])
+
+    def put_result(self, domain: str, data: Dict):
+        """Store the extracted email/social result for a domain."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (domain, data, fetched_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (domain, json.dumps(data), now, now)
+            )
+            self._conn.commit()
+
+    def record(self, outcome: str):
+        """Count a page lookup outcome ('hits', 'revalidated' or 'misses')."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _evict(self):
+        """Drop least-recently-used pages until the store fits its size bound (lock held)."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for url, size in self._conn.execute('SELECT url, size FROM pages ORDER BY accessed_at'):
+            victims.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self._conn.executemany('DELETE FROM pages WHERE url = ?', victims)
+        self._conn.commit()
+        self.stats['evicted'] += len(victims)
+        self.logger.debug(f"Evicted {len(victims)} cached pages ({freed / 1024:.0f} KB)")
+
+    def summary(self) -> str:
+        """One-line hit/miss summary."""
+        s = self.stats
+        return (
+            f"HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated, {s['misses']} misses, "
+            f"{s['result_hits']} domain results reused, {s['evicted']} evicted"
+        )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
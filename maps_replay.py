@@ -0,0 +1,665 @@
+"""
+Record and replay Google Maps pages for offline scraper runs.
+
+MapsRecorder hooks into a live SeleniumScraper run (cli.py --record DIR) and
+saves what the scraper saw: the search page shell, the feed cards in the
+batches Maps loaded them in, every opened place panel, and the XHR/fetch
+payloads Chrome received meanwhile, with their latencies.
+
+ReplayServer serves such a recording over plain HTTP. Pointing
+scraping.maps_base_url at it makes SeleniumScraper run unchanged and
+offline: the search URL renders the feed, scrolling the feed loads the next
+recorded batch, and clicking a card opens its recorded place panel and
+pushes the place URL, the way Maps does. Replayed pages are DOM snapshots
+with scripts stripped; the Maps JavaScript app itself is not replayed.
+
+Usage:
+    python maps_replay.py serve RECORDING_DIR [--port 8765] [--latency-scale 1.0]
+    python maps_replay.py synthesize RECORDING_DIR [--places 120] [--batch 20]
+
+synthesize writes a Maps-like fixture recording, for CI machines that have
+no recording of their own.
+"""
+
+import argparse
+import base64
+import json
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, quote_plus, unquote, urlsplit
+
+RECORDING_VERSION = 1
+
+# Absolute Maps links become server-relative so they stay on the replay server
+MAPS_LINK = re.compile(r'(?:https?:)?//(?:www\.)?google\.[a-z.]+(?=/maps)')
+
+# Nothing outside the replay server is fetched (fonts, tiles, photos)
+CONTENT_SECURITY_POLICY = "default-src 'self' 'unsafe-inline' data:"
+
+
+def place_key(href: str) -> str:
+    """Recording key of a place link: its decoded path, without host or query."""
+    return unquote(urlsplit(href).path).rstrip('/')
+
+
+def rewrite_links(html: str) -> str:
+    """Point absolute Google Maps links at the replay server."""
+    return MAPS_LINK.sub('', html)
+
+
+class MapsRecorder:
+    """Snapshots the Maps pages and XHR payloads of a live scrape into a directory."""
+
+    # Whole page without scripts or feed cards (the cards are recorded as batches)
+    SHELL_JS = """
+        const doc = document.documentElement.cloneNode(true);
+        doc.querySelectorAll('script, noscript, iframe, link[rel="preload"], link[rel="prefetch"]')
+            .forEach(node => node.remove());
+        doc.querySelectorAll('[data-lead-idx]').forEach(node => node.removeAttribute('data-lead-idx'));
+        const feed = doc.querySelector('div[role="feed"]');
+        if (feed) feed.innerHTML = '';
+        return {html: '<!DOCTYPE html>' + doc.outerHTML, url: location.href, has_feed: !!feed};
+    """
+
+    # Feed children not captured yet; the scraper's data-lead-idx tags are stripped
+    # so the replayed cards look unseen to its feed observer
+    FEED_JS = """
+        const feed = document.querySelector('div[role="feed"]');
+        if (!feed) return null;
+        const fresh = [];
+        Array.from(feed.children).forEach(child => {
+            if (child.dataset.replaySeen) return;
+            child.dataset.replaySeen = '1';
+            const copy = child.cloneNode(true);
+            copy.removeAttribute('data-replay-seen');
+            copy.querySelectorAll('script').forEach(node => node.remove());
+            copy.querySelectorAll('[data-lead-idx]').forEach(node => node.removeAttribute('data-lead-idx'));
+            fresh.push(copy.outerHTML);
+        });
+        return {fresh: fresh, ended: !!feed.querySelector('.HlvSq')};
+    """
+
+    # The open place panel: the main pane holding the place title, not the feed
+    PLACE_JS = """
+        const titles = Array.from(document.querySelectorAll('h1')).filter(title => {
+            const main = title.closest('[role="main"]');
+            return !(main && main.querySelector('div[role="feed"]'));
+        });
+        const title = titles[titles.length - 1];
+        if (!title) return null;
+        const panel = title.closest('[role="main"]') || title.parentElement;
+        const copy = panel.cloneNode(true);
+        copy.querySelectorAll('script').forEach(node => node.remove());
+        return {html: copy.outerHTML, url: location.href};
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            output_dir: Directory the recording is written to (created if missing)
+        """
+        self.output_dir = Path(output_dir)
+        self.logger = logging.getLogger(__name__)
+        self.manifest = {
+            'version': RECORDING_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'searches': [],
+            'places': [],
+            'xhr': []
+        }
+        self._search = None
+        self._place_keys = set()
+
+    def configure_options(self, options):
+        """Enable the Chrome performance log that XHR capture reads."""
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def _write(self, relative_path: str, data) -> str:
+        path = self.output_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            path.write_text(data, encoding='utf-8')
+        return relative_path
+
+    def record_search(self, driver, query: str):
+        """Save the search page shell once the results are showing."""
+        latency = self._drain_xhr(driver)
+        shell = driver.execute_script(self.SHELL_JS)
+        if not shell:
+            return
+
+        search_id = f"search-{len(self.manifest['searches']):03d}"
+        self._search = {
+            'id': search_id,
+            'query': query,
+            'url': shell['url'],
+            'shell': self._write(f"{search_id}/shell.html", shell['html']),
+            'latency_ms': latency,
+            'batches': [],
+            'ended': False
+        }
+        self.manifest['searches'].append(self._search)
+        self.record_feed(driver)
+
+    def record_feed(self, driver):
+        """Save the feed cards rendered since the last call as one batch."""
+        if not self._search:
+            return
+        latency = self._drain_xhr(driver)
+        captured = driver.execute_script(self.FEED_JS)
+        if not captured:
+            return
+
+        self._search['ended'] = self._search['ended'] or captured.get('ended', False)
+        if not captured['fresh']:
+            return
+
+        batches = self._search['batches']
+        batches.append({
+            'file': self._write(
+                f"{self._search['id']}/feed-{len(batches):03d}.html",
+                '\n'.join(captured['fresh'])
+            ),
+            'cards': len(captured['fresh']),
+            'latency_ms': latency
+        })
+
+    def record_place(self, driver, card: Dict):
+        """Save the place panel opened from a card (each place once)."""
+        latency = self._drain_xhr(driver)
+        key = place_key(card.get('href') or driver.current_url)
+        if not key or key in self._place_keys:
+            return
+
+        snapshot = driver.execute_script(self.PLACE_JS)
+        if not snapshot:
+            return
+
+        self._place_keys.add(key)
+        self.manifest['places'].append({
+            'key': key,
+            'url': snapshot['url'],
+            'file': self._write(f"places/{len(self.manifest['places']):05d}.html", snapshot['html']),
+            'latency_ms': latency
+        })
+
+    def _drain_xhr(self, driver) -> float:
+        """
+        Save the XHR/fetch responses logged since the last call.
+
+        Returns:
+            The slowest response time among them in ms (0 when there were none)
+        """
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            self.logger.debug(f"Performance log unavailable: {e}")
+            return 0.0
+
+        slowest = 0.0
+        for entry in entries:
+            message = json.loads(entry['message']).get('message', {})
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            params = message['params']
+            if params.get('type') not in ('XHR', 'Fetch'):
+                continue
+
+            response = params['response']
+            try:
+                body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+            except Exception:
+                continue  # Evicted from Chrome's buffer, or a redirect without a body
+
+            data = base64.b64decode(body['body']) if body.get('base64Encoded') else body['body'].encode('utf-8')
+            latency = max((response.get('timing') or {}).get('receiveHeadersEnd', 0.0), 0.0)
+            slowest = max(slowest, latency)
+            self.manifest['xhr'].append({
+                'url': response['url'],
+                'status': response.get('status', 200),
+                'mime_type': response.get('mimeType') or 'application/octet-stream',
+                'file': self._write(f"xhr/{len(self.manifest['xhr']):05d}.body", data),
+                'latency_ms': round(latency, 1)
+            })
+        return round(slowest, 1)
+
+    def close(self, driver=None):
+        """Capture the last XHR payloads and write manifest.json."""
+        if driver:
+            self._drain_xhr(driver)
+        self._write('manifest.json', json.dumps(self.manifest, indent=2))
+        self.logger.info(
+            f"Recorded {len(self.manifest['searches'])} searches, {len(self.manifest['places'])} places "
+            f"and {len(self.manifest['xhr'])} XHR payloads to {self.output_dir}"
+        )
+
+
+class Recording:
+    """A recording directory loaded for replay, with links already rewritten."""
+
+    def __init__(self, recording_dir: str):
+        self.path = Path(recording_dir)
+        self.manifest = json.loads((self.path / 'manifest.json').read_text(encoding='utf-8'))
+        if self.manifest.get('version') != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {self.manifest.get('version')}")
+
+        self.searches = self.manifest['searches']
+        self.places = {
+            place['key']: {
+                'url': rewrite_links(place['url']),
+                'html': rewrite_links(self.read(place['file'])),
+                'latency_ms': place.get('latency_ms', 0)
+            }
+            for place in self.manifest['places']
+        }
+        self.xhr = {}
+        for entry in self.manifest['xhr']:
+            parts = urlsplit(entry['url'])
+            # First recorded response wins for both the exact and the path-only lookup
+            self.xhr.setdefault(f"{parts.path}?{parts.query}", entry)
+            self.xhr.setdefault(parts.path, entry)
+
+    def read(self, relative_path: str) -> str:
+        return (self.path / relative_path).read_text(encoding='utf-8')
+
+    def find_search(self, path: str) -> Optional[Dict]:
+        """Search recorded for a /maps/search/ path (any search when none matches)."""
+        if not self.searches:
+            return None
+        for search in self.searches:
+            if urlsplit(search['url']).path.startswith(path.split('/@')[0]):
+                return search
+            if path.startswith(f"/maps/search/{quote_plus(search['query'])}"):
+                return search
+        return self.searches[0]
+
+    def find_place(self, key: str) -> Optional[Dict]:
+        """Place recorded under a key, else the first one with the same name segment."""
+        if key in self.places:
+            return self.places[key]
+        # Saved lead URLs can differ from the recorded link after the name (@lat,lon, data=)
+        name = key.split('/')[3:4]
+        for recorded_key, place in self.places.items():
+            if name and recorded_key.split('/')[3:4] == name:
+                return place
+        return None
+
+
+class ReplayServer:
+    """
+    Serves a recording to Chrome over HTTP.
+
+    The latency scale multiplies the recorded response times of feed batches,
+    place panels and XHR payloads (0 serves everything immediately and inlines
+    the place panels so a click opens them synchronously).
+    """
+
+    # Loads the next recorded feed batch when the feed is scrolled to the bottom
+    # and opens recorded place panels on card clicks, like the Maps app
+    REPLAY_JS = """
+        (function () {
+            const config = window.__replay;
+            const feed = document.querySelector('div[role="feed"]');
+            const pane = document.getElementById('__replay_pane');
+            let next = 1;
+            let loading = false;
+
+            const nearBottom = () => feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 200;
+            const loadNext = () => {
+                if (loading || next >= config.batches) return;
+                loading = true;
+                fetch(config.feed + next).then(response => response.text()).then(html => {
+                    feed.insertAdjacentHTML('beforeend', html);
+                    next++;
+                    loading = false;
+                    if (nearBottom()) loadNext();
+                });
+            };
+            if (feed) {
+                feed.addEventListener('scroll', () => { if (nearBottom()) loadNext(); });
+                if (nearBottom()) loadNext();
+            }
+
+            const show = place => {
+                pane.innerHTML = place.html;
+                history.pushState({}, '', place.url);
+            };
+            document.addEventListener('click', event => {
+                const link = event.target.closest && event.target.closest('a[href*="/maps/place/"]');
+                if (!link) return;
+                event.preventDefault();
+                const key = decodeURIComponent(new URL(link.href, location.href).pathname).replace(/\\/+$/, '');
+                if (config.places) {
+                    if (config.places[key]) show(config.places[key]);
+                    return;
+                }
+                fetch('/__replay/place?key=' + encodeURIComponent(key))
+                    .then(response => response.ok ? response.json() : null)
+                    .then(place => { if (place) show(place); });
+            }, true);
+        })();
+    """
+
+    # Minimal Maps home page for the typed-search fallback
+    HOME_HTML = """<!DOCTYPE html>
+<html><head><title>Google Maps</title></head><body>
+<form id="searchbox-form" onsubmit="location.href = '/maps/search/' +
+    encodeURIComponent(this.q.value).replace(/%20/g, '+'); return false;">
+<input id="searchboxinput" name="q" aria-label="Search Google Maps">
+</form>
+</body></html>"""
+
+    def __init__(self, recording_dir: str, host: str = '127.0.0.1', port: int = 0, latency_scale: float = 1.0):
+        """
+        Initialize the server (call start() to begin serving).
+
+        Args:
+            recording_dir: Directory written by MapsRecorder or synthesize()
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency_scale: Multiplier for recorded response times
+        """
+        self.recording = Recording(recording_dir)
+        self.latency_scale = latency_scale
+        self.logger = logging.getLogger(__name__)
+        self.stats = {'pages': 0, 'feed_batches': 0, 'places': 0, 'xhr': 0, 'not_found': 0}
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """Value for scraping.maps_base_url."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'ReplayServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='maps-replay', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Replaying {self.recording.path} at {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _delay(self, latency_ms: Optional[float]):
+        if latency_ms and self.latency_scale > 0:
+            time.sleep(latency_ms * self.latency_scale / 1000)
+
+    def search_page(self, search: Dict) -> str:
+        """Search shell with the first feed batch in place and the replay script."""
+        html = rewrite_links(self.recording.read(search['shell']))
+        batches = search['batches']
+        if batches:
+            first = rewrite_links(self.recording.read(batches[0]['file']))
+            html = re.sub(r'(<div[^>]*role="feed"[^>]*>)', lambda m: m.group(1) + first, html, count=1)
+
+        config = {'feed': f"/__replay/{search['id']}/feed/", 'batches': len(batches), 'places': None}
+        if self.latency_scale == 0:
+            config['places'] = {key: {'url': p['url'], 'html': p['html']} for key, p in self.recording.places.items()}
+
+        # Place panels may contain "</script>"-like text; keep the JSON inside its tag
+        config_json = json.dumps(config).replace('</', '<\\/')
+        replay = (
+            '<div id="__replay_pane"></div>'
+            '<style>div[role="feed"]{overflow-y:auto;max-height:100vh}</style>'
+            f'<script>window.__replay = {config_json};</script>'
+            f'<script>{self.REPLAY_JS}</script>'
+        )
+        if '</body>' in html:
+            return html.replace('</body>', replay + '</body>', 1)
+        return html + replay
+
+    def place_page(self, place: Dict) -> str:
+        """Place panel on its own, for hydration runs that open place URLs directly."""
+        return f"<!DOCTYPE html><html><head><title>Google Maps</title></head><body>{place['html']}</body></html>"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                server.logger.debug(f"replay: {format % args}")
+
+            def _send(self, status: int, body, content_type: str = 'text/html; charset=utf-8'):
+                data = body.encode('utf-8') if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('Cache-Control', 'no-store')
+                self.send_header('Content-Security-Policy', CONTENT_SECURITY_POLICY)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path
+                recording = server.recording
+
+                if path in ('/maps', '/maps/'):
+                    server._count('pages')
+                    return self._send(200, server.HOME_HTML)
+
+                if path.startswith('/maps/search/'):
+                    search = recording.find_search(path)
+                    if search:
+                        server._count('pages')
+                        server._delay(search.get('latency_ms'))
+                        return self._send(200, server.search_page(search))
+
+                match = re.fullmatch(r'/__replay/([\w-]+)/feed/(\d+)', path)
+                if match:
+                    search = next((s for s in recording.searches if s['id'] == match.group(1)), None)
+                    index = int(match.group(2))
+                    if search and index < len(search['batches']):
+                        batch = search['batches'][index]
+                        server._count('feed_batches')
+                        server._delay(batch.get('latency_ms'))
+                        return self._send(200, rewrite_links(recording.read(batch['file'])))
+
+                if path == '/__replay/place':
+                    place = recording.find_place(parse_qs(parts.query).get('key', [''])[0])
+                    if place:
+                        server._count('places')
+                        server._delay(place['latency_ms'])
+                        return self._send(200, json.dumps({'url': place['url'], 'html': place['html']}),
+                                          'application/json')
+
+                if path.startswith('/maps/place/'):
+                    place = recording.find_place(place_key(path))
+                    if place:
+                        server._count('pages')
+                        server._delay(place['latency_ms'])
+                        return self._send(200, server.place_page(place))
+
+                entry = recording.xhr.get(f"{path}?{parts.query}") or recording.xhr.get(path)
+                if entry:
+                    server._count('xhr')
+                    server._delay(entry.get('latency_ms'))
+                    return self._send(entry['status'], (recording.path / entry['file']).read_bytes(),
+                                      entry['mime_type'])
+
+                server._count('not_found')
+                return self._send(404, 'Not recorded')
+
+        return Handler
+
+
+SYNTHETIC_WORDS = ['Blue', 'Corner', 'Golden', 'Harbor', 'Maple', 'North', 'Olive', 'Red', 'Silver', 'Urban']
+SYNTHETIC_CATEGORIES = ['Coffee shop', 'Cafe', 'Bakery', 'Espresso bar', 'Tea house']
+
+
+def synthesize(
+    output_dir: str,
+    places: int = 120,
+    batch_size: int = 20,
+    query: str = 'coffee shops Springfield',
+    seed: int = 7
+) -> Dict:
+    """
+    Write a fixture recording with Maps-like markup.
+
+    The cards and place panels use the structure SeleniumScraper's selectors
+    expect; manifest['expected'] lists the true values per place so a replay
+    run can be checked for extraction accuracy.
+
+    Args:
+        output_dir: Directory for the recording
+        places: Number of places in the feed
+        batch_size: Cards per feed batch (Maps loads about 20 per scroll)
+        query: Search the recording answers
+        seed: Random seed for names, values and latencies
+
+    Returns:
+        The manifest
+    """
+    rng = random.Random(seed)
+    recorder = MapsRecorder(output_dir)
+    manifest = recorder.manifest
+    manifest['synthetic'] = True
+    manifest['expected'] = []
+
+    cards = []
+    for i in range(places):
+        name = f"{rng.choice(SYNTHETIC_WORDS)} {rng.choice(SYNTHETIC_WORDS)} Coffee {i + 1}"
+        category = rng.choice(SYNTHETIC_CATEGORIES)
+        address = f"{rng.randint(1, 999)} {rng.choice(SYNTHETIC_WORDS)} St"
+        phone = f"+1 217-555-{i:04d}"
+        rating = round(rng.uniform(3.5, 5.0), 1)
+        reviews = rng.randint(5, 4000)
+        lat, lon = 39.78 + rng.uniform(-0.05, 0.05), -89.65 + rng.uniform(-0.05, 0.05)
+        cid = f"0x{rng.getrandbits(48):x}:0x{rng.getrandbits(60):x}"
+        slug = quote_plus(name)
+        url = f"https://www.google.com/maps/place/{slug}/data=!4m7!3m6!1s{cid}!8m2!3d{lat:.7f}!4d{lon:.7f}!16s"
+        website = f"https://{slug.lower().replace('+', '')}.example"
+        manifest['expected'].append({
+            'name': name, 'address': address, 'phone': phone, 'website': website,
+            'category': category, 'rating': rating, 'reviews': reviews
+        })
+
+        label = escape(name, quote=True)
+        cards.append(
+            f'<div><div role="article" aria-label="{label}">'
+            f'<a class="hfpxzc" aria-label="{label}" href="{escape(url)}"></a>'
+            f'<div class="fontHeadlineSmall">{label}</div>'
+            f'<div>{rating}({reviews:,})</div>'
+            f'<div>{category} · $$ · {address}</div>'
+            f'<div>Open ⋅ Closes 7 PM</div>'
+            f'</div></div>'
+        )
+        manifest['places'].append({
+            'key': place_key(url),
+            'url': url,
+            'file': recorder._write(
+                f"places/{i:05d}.html",
+                f'<div role="main" aria-label="{label}"><h1 class="DUwDvf">{label}</h1>'
+                f'<div class="F7nice"><span aria-hidden="true">{rating}</span>'
+                f'<span><span><span aria-label="{reviews:,} reviews">({reviews:,})</span></span></span></div>'
+                f'<button jsaction="pane.rating.category">{category}</button>'
+                f'<button data-item-id="address" data-tooltip="Copy address">'
+                f'<div class="fontBodyMedium">{address}</div></button>'
+                f'<a data-item-id="authority" data-tooltip="Open website" href="{website}">{website[8:]}</a>'
+                f'<button data-item-id="phone:tel:{phone}" data-tooltip="Copy phone number" '
+                f'aria-label="Phone: {phone}"></button>'
+                f'<div aria-label="Open ⋅ Closes 7 PM"></div></div>'
+            ),
+            'latency_ms': round(rng.uniform(150, 500), 1)
+        })
+
+    search = {
+        'id': 'search-000',
+        'query': query,
+        'url': f"https://www.google.com/maps/search/{quote_plus(query)}",
+        'shell': recorder._write(
+            'search-000/shell.html',
+            f'<!DOCTYPE html><html><head><title>{escape(query)} - Google Maps</title></head><body>'
+            f'<div role="main" aria-label="Results for {escape(query, quote=True)}">'
+            f'<div role="feed" aria-label="Results for {escape(query, quote=True)}"></div></div></body></html>'
+        ),
+        'latency_ms': round(rng.uniform(400, 900), 1),
+        'batches': [],
+        'ended': True
+    }
+    for start in range(0, places, batch_size):
+        html = '\n'.join(cards[start:start + batch_size])
+        if start + batch_size >= places:
+            html += '\n<div><div class="HlvSq">You\'ve reached the end of the list.</div></div>'
+        search['batches'].append({
+            'file': recorder._write(f"search-000/feed-{len(search['batches']):03d}.html", html),
+            'cards': len(cards[start:start + batch_size]),
+            'latency_ms': round(rng.uniform(300, 800), 1)
+        })
+    manifest['searches'].append(search)
+
+    recorder.close()
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded Google Maps pages for offline scraper runs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='Serve a recording until interrupted')
+    serve.add_argument('recording_dir', help='Directory written by cli.py --record or synthesize')
+    serve.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+    serve.add_argument('--latency-scale', type=float, default=1.0,
+                       help='Multiplier for recorded response times, 0 for none (default: 1.0)')
+
+    synth = commands.add_parser('synthesize', help='Write a Maps-like fixture recording')
+    synth.add_argument('recording_dir', help='Directory for the recording')
+    synth.add_argument('--places', type=int, default=120, help='Places in the feed (default: 120)')
+    synth.add_argument('--batch', type=int, default=20, help='Cards per feed batch (default: 20)')
+    synth.add_argument('--seed', type=int, default=7, help='Random seed (default: 7)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'synthesize':
+        manifest = synthesize(args.recording_dir, args.places, args.batch, seed=args.seed)
+        print(f"Wrote {len(manifest['places'])} places in {len(manifest['searches'][0]['batches'])} "
+              f"feed batches to {args.recording_dir}")
+        return
+
+    server = ReplayServer(args.recording_dir, args.host, args.port, args.latency_scale).start()
+    print(f"Set scraping.maps_base_url: {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Served: {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
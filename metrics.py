@@ -0,0 +1,302 @@
+"""
+Per-phase timing and counters for scrape runs.
+
+A RunMetrics object is shared by the scraper, deduplicator and exporter of
+one run. Phases are timed with spans (or the timed method decorator) into
+fixed-bucket latency histograms, events are counted, and WebDriver commands
+are counted and timed per command. The result is written as a JSON run
+report next to the exported data, or rendered as Prometheus text for the
+web UI's /metrics endpoint and node_exporter's textfile collector.
+
+Usage:
+    metrics = RunMetrics()
+    with metrics.span('search'):
+        ...
+    metrics.count('leads')
+    metrics.write_report('data/leads_20250101_120000_metrics.json')
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Upper bounds in seconds: WebDriver round trips are milliseconds, website visits several seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets; quantiles are estimated from them."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One count per bucket plus the +Inf overflow, not cumulative
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds: float):
+        """Record one duration."""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: 'Histogram'):
+        """Add another histogram with the same buckets into this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated duration in seconds, clamped to the observed min/max
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """Summary for the JSON run report, durations in ms."""
+        def ms(seconds):
+            return round(seconds * 1000, 1) if seconds is not None else None
+
+        return {
+            'count': self.count,
+            'total_s': round(self.sum, 3),
+            'mean_ms': ms(self.sum / self.count) if self.count else None,
+            'p50_ms': ms(self.quantile(0.5)),
+            'p95_ms': ms(self.quantile(0.95)),
+            'max_ms': ms(self.max),
+            'buckets': {
+                ('+Inf' if i == len(self.buckets) else str(self.buckets[i])): n
+                for i, n in enumerate(self.counts) if n
+            }
+        }
+
+
+class RunMetrics:
+    """
+    Phase histograms, event counters and WebDriver command counts of a run.
+
+    Thread-safe: website crawls and the web UI's /metrics requests run on
+    other threads than the scrape.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize empty metrics.
+
+        Args:
+            buckets: Histogram upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.started_at = datetime.now()
+        self.phases: Dict[str, Histogram] = {}
+        self.counters = Counter()
+        self.webdriver_calls = Counter()
+        self.webdriver_seconds = Counter()
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, phase: str):
+        """Time the enclosed block as one observation of phase (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started)
+
+    def observe(self, phase: str, seconds: float):
+        """Record a duration for phase."""
+        with self._lock:
+            if phase not in self.phases:
+                self.phases[phase] = Histogram(self.buckets)
+            self.phases[phase].observe(seconds)
+
+    def count(self, event: str, n: int = 1):
+        """Increment an event counter."""
+        with self._lock:
+            self.counters[event] += n
+
+    def instrument_driver(self, driver):
+        """
+        Count and time every WebDriver command sent by driver.
+
+        Wraps the instance's execute method, which every command (get,
+        find_element, execute_script, ...) goes through.
+        """
+        if getattr(driver, '_run_metrics', None) is self:
+            return
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.webdriver_calls[driver_command] += 1
+                    self.webdriver_seconds[driver_command] += elapsed
+
+        driver.execute = counted_execute
+        driver._run_metrics = self
+
+    def merge(self, other: 'RunMetrics'):
+        """Add another run's metrics into these (service-wide totals)."""
+        with other._lock:
+            phases = dict(other.phases)
+            counters = Counter(other.counters)
+            calls = Counter(other.webdriver_calls)
+            seconds = Counter(other.webdriver_seconds)
+
+        with self._lock:
+            for name, histogram in phases.items():
+                if name not in self.phases:
+                    self.phases[name] = Histogram(self.buckets)
+                self.phases[name].merge(histogram)
+            self.counters.update(counters)
+            self.webdriver_calls.update(calls)
+            self.webdriver_seconds.update(seconds)
+
+    def report(self, **context) -> Dict:
+        """
+        Build the JSON run report.
+
+        Args:
+            **context: Extra top-level fields (query, location, depth, ...)
+
+        Returns:
+            Report dict with phases, counters and WebDriver command stats
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            total_calls = sum(self.webdriver_calls.values())
+            # Hydration runs produce hydrated leads rather than new ones
+            leads = self.counters.get('leads') or self.counters.get('leads_hydrated', 0)
+            return {
+                **context,
+                'started_at': self.started_at.isoformat(),
+                'finished_at': datetime.now().isoformat(),
+                'elapsed_s': round(elapsed, 2),
+                'leads_per_min': round(leads / elapsed * 60, 1) if elapsed and leads else None,
+                'phases': {name: self.phases[name].to_dict() for name in sorted(self.phases)},
+                'counters': dict(sorted(self.counters.items())),
+                'webdriver': {
+                    'commands': total_calls,
+                    'commands_per_lead': round(total_calls / leads, 1) if leads else None,
+                    'seconds': round(sum(self.webdriver_seconds.values()), 3),
+                    'by_command': {
+                        command: {'count': n, 'total_s': round(self.webdriver_seconds[command], 3)}
+                        for command, n in self.webdriver_calls.most_common()
+                    }
+                }
+            }
+
+    def write_report(self, path: str, **context) -> str:
+        """Write the JSON run report to path and return the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**context), f, indent=2)
+        return str(path)
+
+    def to_prometheus(self, prefix: str = 'lead_scraper') -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent per scrape phase",
+            f"# TYPE {prefix}_phase_seconds histogram"
+        ]
+        with self._lock:
+            for name in sorted(self.phases):
+                histogram = self.phases[name]
+                cumulative = 0
+                for bound, n in zip(self.buckets + ('+Inf',), histogram.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_phase_seconds_bucket{{phase="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {histogram.sum:.6f}')
+                lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {histogram.count}')
+
+            lines += [
+                f"# HELP {prefix}_events_total Scrape events (leads, cards, duplicates, captchas, ...)",
+                f"# TYPE {prefix}_events_total counter"
+            ]
+            for event, n in sorted(self.counters.items()):
+                lines.append(f'{prefix}_events_total{{event="{event}"}} {n}')
+
+            lines += [
+                f"# HELP {prefix}_webdriver_commands_total WebDriver commands sent",
+                f"# TYPE {prefix}_webdriver_commands_total counter"
+            ]
+            for command, n in sorted(self.webdriver_calls.items()):
+                lines.append(f'{prefix}_webdriver_commands_total{{command="{command}"}} {n}')
+
+            lines += [
+                f"# HELP {prefix}_webdriver_seconds_total Time spent in WebDriver commands",
+                f"# TYPE {prefix}_webdriver_seconds_total counter"
+            ]
+            for command, seconds in sorted(self.webdriver_seconds.items()):
+                lines.append(f'{prefix}_webdriver_seconds_total{{command="{command}"}} {seconds:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str, prefix: str = 'lead_scraper') -> str:
+        """Write Prometheus text atomically (as node_exporter's textfile collector expects)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(self.to_prometheus(prefix), encoding='utf-8')
+        os.replace(tmp_path, path)
+        return str(path)
+
+    def summary_rows(self) -> List[Dict]:
+        """Per-phase rows for console summaries, slowest total first."""
+        with self._lock:
+            rows = [{'phase': name, **histogram.to_dict()} for name, histogram in self.phases.items()]
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+
+def timed(phase: str):
+    """Method decorator timing each call as a span of phase in self.metrics."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(phase):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,174 @@
+"""
+Per-host politeness scheduling for website fetches.
+
+Enriching thousands of business websites must not hammer any single host.
+The scheduler keeps a next-allowed-time per host, derived from the host's
+robots.txt Crawl-delay / Request-rate or a configured default, and:
+
+- wait(url) blocks a single fetch until its host's next slot
+- run(urls, fn) works through a batch with a priority queue keyed by each
+  host's next-allowed-time, so many hosts are fetched in parallel while
+  each individual host only sees one job at a time
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait as wait_futures
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from robots_checker import RobotsChecker
+
+
+class PolitenessScheduler:
+    """Space requests per host while interleaving hosts."""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        robots_checker: Optional[RobotsChecker] = None,
+        default_delay: float = 1.0,
+        max_delay: float = 30.0,
+        user_agent: str = '*'
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            robots_checker: Source of robots.txt crawl delays (None = default delay only)
+            default_delay: Seconds between requests to a host without a crawl delay
+            max_delay: Upper bound for crawl delays taken from robots.txt
+            user_agent: User agent used to look up robots.txt rules
+        """
+        self.robots_checker = robots_checker
+        self.default_delay = default_delay
+        self.max_delay = max_delay
+        self.user_agent = user_agent
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._delays: Dict[str, float] = {}
+        self._next_time: Dict[str, float] = {}
+
+    @classmethod
+    def shared(cls, config) -> 'PolitenessScheduler':
+        """Return the process-wide scheduler, creating it from config on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                politeness = config.politeness
+                cls._shared = cls(
+                    robots_checker=RobotsChecker(config) if politeness.get('use_robots', True) else None,
+                    default_delay=politeness.get('default_delay', 1.0),
+                    max_delay=politeness.get('max_delay', 30.0),
+                    user_agent=config.robots.get('user_agent', '*')
+                )
+            return cls._shared
+
+    @staticmethod
+    def host(url: str) -> str:
+        """Scheduling key for a URL."""
+        return urlparse(url).netloc.lower()
+
+    def delay_for(self, url: str) -> float:
+        """Seconds between requests to the URL's host."""
+        host = self.host(url)
+        with self._lock:
+            if host in self._delays:
+                return self._delays[host]
+
+        delay = None
+        if self.robots_checker:
+            try:
+                delay = self.robots_checker.crawl_delay(url, self.user_agent)
+            except Exception as e:
+                self.logger.debug(f"Could not read crawl delay for {host}: {e}")
+
+        delay = self.default_delay if delay is None else min(delay, self.max_delay)
+        with self._lock:
+            self._delays[host] = delay
+        return delay
+
+    def wait(self, url: str) -> float:
+        """
+        Block until the URL's host may be fetched again and reserve the slot.
+
+        Args:
+            url: URL about to be fetched
+
+        Returns:
+            Seconds slept
+        """
+        host = self.host(url)
+        delay = self.delay_for(url)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time.get(host, 0.0))
+            self._next_time[host] = start + delay
+
+        slept = start - now
+        if slept > 0:
+            time.sleep(slept)
+        return slept
+
+    def next_allowed(self, url: str) -> float:
+        """Monotonic time at which the URL's host may be fetched again."""
+        with self._lock:
+            return self._next_time.get(self.host(url), 0.0)
+
+    def run(self, urls: List[str], fn: Callable[[str], object], workers: int = 8) -> List:
+        """
+        Apply fn to every URL, interleaving hosts.
+
+        Jobs for one host run one at a time; hosts are dispatched in order of
+        their next-allowed-time so workers always pick a host that is ready.
+        fn is expected to call wait() before each request it makes.
+
+        Args:
+            urls: URLs to process (duplicates are processed once)
+            fn: Job taking a URL
+            workers: Jobs running at the same time across hosts
+
+        Returns:
+            Results in the order of urls (None where fn raised)
+        """
+        queues: Dict[str, deque] = OrderedDict()
+        for url in dict.fromkeys(urls):
+            queues.setdefault(self.host(url), deque()).append(url)
+
+        heap = []
+        for seq, (host, pending) in enumerate(queues.items()):
+            heapq.heappush(heap, (self.next_allowed(pending[0]), seq, host))
+
+        results: Dict[str, object] = {}
+        seq = len(heap)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while heap or running:
+                now = time.monotonic()
+                while heap and len(running) < workers and heap[0][0] <= now:
+                    _, _, host = heapq.heappop(heap)
+                    url = queues[host].popleft()
+                    running[executor.submit(fn, url)] = (host, url)
+
+                if not running:
+                    time.sleep(max(0.0, heap[0][0] - now))
+                    continue
+
+                timeout = max(0.0, heap[0][0] - now) if heap and len(running) < workers else None
+                done, _ = wait_futures(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, url = running.pop(future)
+                    try:
+                        results[url] = future.result()
+                    except Exception as e:
+                        self.logger.warning(f"Job for {url} failed: {e}")
+                        results[url] = None
+                    if queues[host]:
+                        seq += 1
+                        heapq.heappush(heap, (self.next_allowed(url), seq, host))
+
+        return [results.get(url) for url in urls]
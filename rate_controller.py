@@ -0,0 +1,196 @@
+"""
+Adaptive (AIMD) rate control for scraper workers.
+
+Instead of a fixed delay guess, every egress identity (Chrome profile or
+guest) gets a request rate that grows additively while pages load cleanly
+and is cut multiplicatively on captchas, "unusual traffic" pages, empty
+feeds or timeouts. One controller is shared by all workers in the process,
+so workers using the same identity share its budget, and the learned rates
+are persisted so the next run starts at the last known safe speed.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class AdaptiveRateController:
+    """
+    Additive-increase / multiplicative-decrease rate limiter per identity.
+
+    Rates are in actions per second (an action is a place click, a detail
+    page load, ...). wait() reserves the next slot for an identity, so
+    concurrent workers on the same identity never exceed its rate together.
+    """
+
+    # Signals that cut the rate
+    PENALTIES = ('captcha', 'unusual_traffic', 'empty_feed', 'timeout')
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        min_rate: float = 0.05,
+        max_rate: float = 1.0,
+        additive_increase: float = 0.02,
+        decrease_factor: float = 0.5,
+        jitter: float = 0.3,
+        state_file: Optional[str] = None
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            min_rate: Slowest allowed rate (actions/second)
+            max_rate: Fastest allowed rate (actions/second)
+            additive_increase: Rate added after each clean action
+            decrease_factor: Multiplier applied on a penalty signal
+            jitter: Random +/- fraction applied to each interval
+            state_file: JSON file with learned rates (None = in-memory only)
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.jitter = jitter
+        self.state_file = Path(state_file) if state_file else None
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = {}
+        self._load()
+
+    @classmethod
+    def shared(cls, config) -> 'AdaptiveRateController':
+        """Return the process-wide controller, creating it from config on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                rate = config.rate
+                cls._shared = cls(
+                    min_rate=rate.get('min_rate', 0.05),
+                    max_rate=rate.get('max_rate', 1.0),
+                    additive_increase=rate.get('additive_increase', 0.02),
+                    decrease_factor=rate.get('decrease_factor', 0.5),
+                    jitter=rate.get('jitter', 0.3),
+                    state_file=rate.get('state_file') if rate.get('persist', True) else None
+                )
+            return cls._shared
+
+    def _entry(self, identity: str, initial_rate: Optional[float] = None) -> Dict:
+        entry = self._state.get(identity)
+        if entry is None:
+            rate = initial_rate if initial_rate else self.min_rate
+            entry = self._state[identity] = {
+                'rate': min(self.max_rate, max(self.min_rate, rate)),
+                'next_time': 0.0,
+                'successes': 0,
+                'penalties': {}
+            }
+        entry.setdefault('next_time', 0.0)
+        return entry
+
+    def wait(self, identity: str, initial_rate: Optional[float] = None) -> float:
+        """
+        Block until the identity may perform its next action.
+
+        Args:
+            identity: Egress identity
+            initial_rate: Rate to start from if the identity is unknown
+
+        Returns:
+            Seconds slept
+        """
+        with self._lock:
+            entry = self._entry(identity, initial_rate)
+            interval = 1.0 / entry['rate']
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            now = time.monotonic()
+            start = max(now, entry['next_time'])
+            entry['next_time'] = start + interval
+
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def success(self, identity: str):
+        """Additively raise the identity's rate after a clean action."""
+        with self._lock:
+            entry = self._entry(identity)
+            entry['rate'] = min(self.max_rate, entry['rate'] + self.additive_increase)
+            entry['successes'] += 1
+
+    def penalize(self, identity: str, reason: str):
+        """
+        Multiplicatively cut the identity's rate.
+
+        Args:
+            identity: Egress identity
+            reason: One of PENALTIES
+        """
+        with self._lock:
+            entry = self._entry(identity)
+            old_rate = entry['rate']
+            entry['rate'] = max(self.min_rate, old_rate * self.decrease_factor)
+            entry['penalties'][reason] = entry['penalties'].get(reason, 0) + 1
+            # Nothing else goes out on this identity for one new interval
+            entry['next_time'] = time.monotonic() + 1.0 / entry['rate']
+
+        self.logger.info(
+            f"Rate for '{identity}' cut on {reason}: "
+            f"{old_rate:.3f} -> {entry['rate']:.3f} actions/s"
+        )
+
+    def current_delay(self, identity: str) -> Optional[float]:
+        """Current seconds between actions for an identity (None if unknown)."""
+        with self._lock:
+            entry = self._state.get(identity)
+            return 1.0 / entry['rate'] if entry else None
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-identity rate, delay and signal counts."""
+        with self._lock:
+            return {
+                identity: {
+                    'rate': entry['rate'],
+                    'delay': 1.0 / entry['rate'],
+                    'successes': entry['successes'],
+                    'penalties': dict(entry['penalties'])
+                }
+                for identity, entry in self._state.items()
+            }
+
+    def _load(self):
+        """Load learned rates, ignoring a missing or corrupt file."""
+        if not self.state_file or not self.state_file.exists():
+            return
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for identity, saved in data.get('identities', {}).items():
+                entry = self._entry(identity, saved.get('rate'))
+                entry['successes'] = saved.get('successes', 0)
+                entry['penalties'] = saved.get('penalties', {})
+            self.logger.debug(f"Loaded learned rates from {self.state_file}")
+        except Exception as e:
+            self.logger.warning(f"Could not load rate state: {e}")
+
+    def save(self):
+        """Persist learned rates to the state file."""
+        if not self.state_file:
+            return
+
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            data = {'updated': time.time(), 'identities': self.summary()}
+            tmp_file = self.state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            tmp_file.replace(self.state_file)
+        except Exception as e:
+            self.logger.warning(f"Could not save rate state: {e}")
@@ -5,107 +5,355 @@ This module handles fetching and parsing robots.txt files to ensure
 compliant scraping behavior.
 """
 
+import asyncio
+import atexit
+import json
 import logging
+import os
+import threading
+from pathlib import Path
 from urllib.parse import urlparse, urljoin
 from urllib.robotparser import RobotFileParser
 import requests
-from typing import Optional
+from typing import Dict, Iterable, Optional
 import time
 
+from http_client import HttpClient
+
 
 class RobotsChecker:
     """
     Check and enforce robots.txt rules.
-    
+
     This class:
     - Fetches robots.txt from target domains
     - Parses disallow rules
-    - Caches robots.txt files
+    - Caches robots.txt files, including missing ones and failed fetches
     - Determines if scraping is allowed for specific paths
+
+    The cache is shared by every checker in the process and persisted to a
+    JSON file so other processes and later runs skip the fetch too. New
+    entries are written in batches (every flush_every hosts or
+    flush_interval seconds), on close() and at interpreter exit; each write
+    drops expired entries and keeps at most max_hosts.
+    Concurrent checks for the same host wait for a single fetch.
     """
-    
+
+    # Process-wide cache: robots_url -> {'status', 'text', 'fetched'}
+    _cache: Dict[str, Dict] = {}
+    _parsers: Dict[str, RobotFileParser] = {}
+    _inflight: Dict[str, Dict] = {}
+    _lock = threading.Lock()
+    _loaded_files = set()
+    # Entries fetched since the last write, and when that write happened
+    _dirty = 0
+    _last_flush = time.time()
+    _flush_lock = threading.Lock()
+    _exit_hooks = set()
+
     def __init__(self, config):
         """
         Initialize the robots.txt checker.
-        
+
         Args:
             config: Configuration object
         """
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.cache = {}
-        self.cache_duration = config.robots.get('cache_duration', 3600)
-    
+        robots = config.robots
+        self.cache_enabled = robots.get('cache_enabled', True)
+        self.cache_duration = robots.get('cache_duration', 3600)
+        self.negative_cache_duration = robots.get('negative_cache_duration', 3600)
+        self.error_cache_duration = robots.get('error_cache_duration', 300)
+        cache_file = robots.get('cache_file')
+        self.cache_file = Path(cache_file) if cache_file and self.cache_enabled else None
+        self.flush_every = robots.get('flush_every', 50)
+        self.flush_interval = robots.get('flush_interval', 30)
+        self.max_hosts = robots.get('max_hosts', 10000)
+        self.http = HttpClient.shared(config)
+        self._load()
+
+        if self.cache_file:
+            with self._lock:
+                if str(self.cache_file) not in self._exit_hooks:
+                    self._exit_hooks.add(str(self.cache_file))
+                    atexit.register(self.flush)
+
     def can_fetch(self, url: str, user_agent: str = '*') -> bool:
         """
         Check if fetching the URL is allowed by robots.txt.
-        
+
         Args:
             url: URL to check
             user_agent: User agent string (default: '*')
-            
+
         Returns:
             True if fetching is allowed, False otherwise
         """
         if not self.config.robots.get('enabled', True):
             return True
-        
+
+        parser = self.get_parser(url)
+
+        # If robots.txt not found or unreachable, allow by default
+        return parser.can_fetch(user_agent, url) if parser else True
+
+    async def can_fetch_many(
+        self,
+        urls: Iterable[str],
+        user_agent: str = '*',
+        concurrency: int = 10
+    ) -> Dict[str, bool]:
+        """
+        Check a batch of URLs, fetching each host's robots.txt at most once.
+
+        Args:
+            urls: URLs to check
+            user_agent: User agent string (default: '*')
+            concurrency: Hosts fetched at the same time
+
+        Returns:
+            Dict mapping each URL to whether fetching it is allowed
+        """
+        urls = list(urls)
+        if not self.config.robots.get('enabled', True):
+            return {url: True for url in urls}
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm(robots_url: str):
+            async with semaphore:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._get_entry, robots_url
+                )
+
+        hosts = {self._robots_url(url) for url in urls}
+        await asyncio.gather(*(warm(robots_url) for robots_url in hosts))
+        return {url: self.can_fetch(url, user_agent) for url in urls}
+
+    def crawl_delay(self, url: str, user_agent: str = '*') -> Optional[float]:
+        """
+        Seconds robots.txt asks crawlers to wait between requests to a host.
+
+        Uses Crawl-delay, or Request-rate (requests/seconds) when only that
+        is given.
+
+        Args:
+            url: Any URL on the host
+            user_agent: User agent string (default: '*')
+
+        Returns:
+            Delay in seconds, or None if robots.txt does not ask for one
+        """
+        if not self.config.robots.get('enabled', True):
+            return None
+
+        parser = self.get_parser(url)
+        if not parser:
+            return None
+
+        delay = parser.crawl_delay(user_agent)
+        if delay is not None:
+            return float(delay)
+
+        rate = parser.request_rate(user_agent)
+        if rate and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+    def get_parser(self, url: str) -> Optional[RobotFileParser]:
+        """
+        Get the parsed robots.txt for a URL's host.
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            RobotFileParser, or None if the host has no usable robots.txt
+        """
+        robots_url = self._robots_url(url)
+        entry = self._get_entry(robots_url)
+        if entry['status'] != 'ok':
+            return None
+
+        with self._lock:
+            parser = self._parsers.get(robots_url)
+            if parser is None:
+                parser = RobotFileParser()
+                parser.parse(entry['text'].splitlines())
+                self._parsers[robots_url] = parser
+            return parser
+
+    @staticmethod
+    def _robots_url(url: str) -> str:
         parsed_url = urlparse(url)
         domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
-        robots_url = urljoin(domain, '/robots.txt')
-        
-        # Check cache
-        if robots_url in self.cache:
-            parser, timestamp = self.cache[robots_url]
-            if time.time() - timestamp < self.cache_duration:
-                return parser.can_fetch(user_agent, url)
-        
-        # Fetch and parse robots.txt
-        parser = self._fetch_robots(robots_url)
-        
-        if parser:
-            self.cache[robots_url] = (parser, time.time())
-            return parser.can_fetch(user_agent, url)
-        
-        # If robots.txt not found, allow by default
-        return True
-    
-    def _fetch_robots(self, robots_url: str) -> Optional[RobotFileParser]:
+        return urljoin(domain, '/robots.txt')
+
+    def _ttl(self, status: str) -> float:
+        if status == 'ok':
+            return self.cache_duration
+        if status == 'missing':
+            return self.negative_cache_duration
+        return self.error_cache_duration
+
+    def _get_entry(self, robots_url: str) -> Dict:
+        """Return a fresh cache entry, fetching once per host when needed."""
+        with self._lock:
+            entry = self._cache.get(robots_url)
+            if entry and time.time() - entry['fetched'] < self._ttl(entry['status']):
+                return entry
+
+            flight = self._inflight.get(robots_url)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[robots_url] = {'event': threading.Event(), 'entry': None}
+
+        if not leader:
+            # Another thread is fetching this host; share its result
+            flight['event'].wait()
+            return flight['entry'] or self._fetch_robots(robots_url)
+
+        try:
+            entry = flight['entry'] = self._fetch_robots(robots_url)
+            with self._lock:
+                if self.cache_enabled:
+                    self._cache[robots_url] = entry
+                    RobotsChecker._dirty += 1
+                self._parsers.pop(robots_url, None)
+            self._maybe_flush()
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(robots_url, None)
+            flight['event'].set()
+
+    def _fetch_robots(self, robots_url: str) -> Dict:
         """
-        Fetch and parse robots.txt file.
-        
+        Fetch robots.txt file.
+
         Args:
             robots_url: URL of robots.txt file
-            
+
         Returns:
-            RobotFileParser object or None if fetch fails
+            Cache entry with status 'ok' (text holds the rules), 'missing'
+            (404) or 'error' (other status, timeout or connection error)
         """
+        entry = {'status': 'error', 'text': None, 'fetched': time.time()}
         try:
             self.logger.debug(f"Fetching robots.txt from {robots_url}")
-            
-            response = requests.get(
+
+            response = self.http.get(
                 robots_url,
                 timeout=10,
                 headers={'User-Agent': 'Mozilla/5.0 (compatible)'}
             )
-            
+
             if response.status_code == 200:
-                parser = RobotFileParser()
-                parser.parse(response.text.splitlines())
-                self.logger.debug(f"✓ Successfully parsed robots.txt")
-                return parser
-            
+                entry['status'] = 'ok'
+                entry['text'] = response.text
+                self.logger.debug(f"✓ Successfully fetched robots.txt")
+
             elif response.status_code == 404:
+                entry['status'] = 'missing'
                 self.logger.debug("robots.txt not found (404) - allowing by default")
-                return None
-            
+
             else:
                 self.logger.warning(f"robots.txt returned status {response.status_code}")
-                return None
-                
+
         except requests.RequestException as e:
             self.logger.warning(f"Failed to fetch robots.txt: {e}")
-            return None
         except Exception as e:
-            self.logger.error(f"Error parsing robots.txt: {e}")
-            return None
+            self.logger.error(f"Error fetching robots.txt: {e}")
+
+        return entry
+
+    def _load(self):
+        """Merge the persistent cache file into the process-wide cache once."""
+        if not self.cache_file:
+            return
+
+        with self._lock:
+            if str(self.cache_file) in self._loaded_files:
+                return
+            self._loaded_files.add(str(self.cache_file))
+
+        self._merge(self._read_file())
+
+    def _read_file(self) -> Dict[str, Dict]:
+        if not self.cache_file or not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('hosts', {})
+        except Exception as e:
+            self.logger.warning(f"Could not load robots cache: {e}")
+            return {}
+
+    def _merge(self, entries: Dict[str, Dict]):
+        """Keep the newer entry per host."""
+        with self._lock:
+            for robots_url, entry in entries.items():
+                current = self._cache.get(robots_url)
+                if not current or entry.get('fetched', 0) > current['fetched']:
+                    self._cache[robots_url] = entry
+                    self._parsers.pop(robots_url, None)
+
+    def _prune(self):
+        """Drop expired entries, then the oldest ones beyond max_hosts."""
+        now = time.time()
+        with self._lock:
+            expired = {
+                robots_url for robots_url, entry in self._cache.items()
+                if now - entry.get('fetched', 0) >= self._ttl(entry.get('status'))
+            }
+            live = [robots_url for robots_url in self._cache if robots_url not in expired]
+            if len(live) > self.max_hosts:
+                live.sort(key=lambda robots_url: self._cache[robots_url].get('fetched', 0))
+                expired.update(live[:len(live) - self.max_hosts])
+            for robots_url in expired:
+                del self._cache[robots_url]
+                self._parsers.pop(robots_url, None)
+
+    def _maybe_flush(self):
+        """Write the cache once enough new hosts or enough time has accumulated."""
+        with self._lock:
+            due = self._dirty and (
+                self._dirty >= self.flush_every
+                or time.time() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write pending entries to the cache file (no-op when nothing changed)."""
+        if not self.cache_file:
+            return
+        # One writer per process; a thread arriving meanwhile finds nothing left to write
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                RobotsChecker._dirty = 0
+                RobotsChecker._last_flush = time.time()
+            self._save()
+
+    def close(self):
+        """Write pending entries; call when the scrape ends."""
+        self.flush()
+
+    def _save(self):
+        """Persist the cache, merging entries other processes wrote meanwhile."""
+        try:
+            self._merge(self._read_file())
+            self._prune()
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                data = {'updated': time.time(), 'hosts': dict(self._cache)}
+            # Unique across processes sharing the file as well as threads
+            tmp_file = self.cache_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            tmp_file.replace(self.cache_file)
+        except Exception as e:
+            self.logger.warning(f"Could not save robots cache: {e}")
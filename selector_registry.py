@@ -0,0 +1,194 @@
+"""
+Adaptive selector registry.
+
+Google Maps changes its markup often, so the scraper keeps several fallback
+selectors for every logical field (search box, results panel, phone, ...).
+This module records hit/miss/latency statistics per selector, orders the
+candidates so the selector that works today is tried first, and persists
+the statistics between runs.
+
+Run this module directly to print the selector report:
+
+    python selector_registry.py [stats_file]
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class SelectorRegistry:
+    """
+    Track which fallback selectors work for each logical field.
+
+    Candidates are plain tuples such as ``(By.CSS_SELECTOR, 'div[role="feed"]')``
+    or ``(By.CSS_SELECTOR, 'a[data-item-id="authority"]', 'href')``. The
+    registry never looks inside them beyond building a stable key.
+    """
+
+    def __init__(self, stats_file: Optional[str] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            stats_file: JSON file used to persist statistics (None = in-memory only)
+        """
+        self.stats_file = Path(stats_file) if stats_file else None
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Dict]] = {}
+        self.load()
+
+    @staticmethod
+    def _key(candidate: Sequence) -> str:
+        """Build a stable string key for a candidate tuple."""
+        return '|'.join(str(part) for part in candidate)
+
+    def ordered(self, field: str, candidates: Sequence[Tuple]) -> List[Tuple]:
+        """
+        Order candidates so the current winner is tried first.
+
+        The winner is the candidate with the most recent hit that has not
+        missed since. The remaining candidates follow by hit rate, and
+        candidates without statistics keep their original order.
+
+        Args:
+            field: Logical field name (e.g. 'search_box')
+            candidates: Candidate selectors in their default order
+
+        Returns:
+            Reordered list of candidates
+        """
+        with self._lock:
+            field_stats = self._stats.get(field, {})
+
+            def sort_key(item):
+                index, candidate = item
+                stats = field_stats.get(self._key(candidate))
+                if not stats:
+                    return (0.0, 0.0, index)
+                last_hit = stats.get('last_hit') or 0.0
+                last_miss = stats.get('last_miss') or 0.0
+                recency = last_hit if last_hit >= last_miss else 0.0
+                return (-recency, -self._hit_rate(stats), index)
+
+            return [c for _, c in sorted(enumerate(candidates), key=sort_key)]
+
+    def record(self, field: str, candidate: Sequence, hit: bool, latency: float):
+        """
+        Record the outcome of one selector attempt.
+
+        Args:
+            field: Logical field name
+            candidate: Candidate selector that was tried
+            hit: Whether the selector matched
+            latency: Time spent on the attempt in seconds
+        """
+        now = time.time()
+        with self._lock:
+            stats = self._stats.setdefault(field, {}).setdefault(self._key(candidate), {
+                'hits': 0,
+                'misses': 0,
+                'hit_latency': 0.0,
+                'miss_latency': 0.0,
+                'last_hit': None,
+                'last_miss': None
+            })
+            if hit:
+                stats['hits'] += 1
+                stats['hit_latency'] += latency
+                stats['last_hit'] = now
+            else:
+                stats['misses'] += 1
+                stats['miss_latency'] += latency
+                stats['last_miss'] = now
+
+    def winner(self, field: str) -> Optional[str]:
+        """Return the key of the selector currently tried first for a field."""
+        with self._lock:
+            field_stats = dict(self._stats.get(field, {}))
+        live = [
+            (stats['last_hit'], key) for key, stats in field_stats.items()
+            if stats.get('last_hit') and stats['last_hit'] >= (stats.get('last_miss') or 0.0)
+        ]
+        return max(live)[1] if live else None
+
+    @staticmethod
+    def _hit_rate(stats: Dict) -> float:
+        attempts = stats['hits'] + stats['misses']
+        return stats['hits'] / attempts if attempts else 0.0
+
+    def load(self):
+        """Load persisted statistics, ignoring a missing or corrupt file."""
+        if not self.stats_file or not self.stats_file.exists():
+            return
+
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                self._stats = data.get('fields', {})
+            self.logger.debug(f"Loaded selector stats from {self.stats_file}")
+        except Exception as e:
+            self.logger.warning(f"Could not load selector stats: {e}")
+
+    def save(self):
+        """Persist statistics to the stats file."""
+        if not self.stats_file:
+            return
+
+        try:
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                data = {'updated': time.time(), 'fields': self._stats}
+                tmp_file = self.stats_file.with_suffix('.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                tmp_file.replace(self.stats_file)
+        except Exception as e:
+            self.logger.warning(f"Could not save selector stats: {e}")
+
+    def report(self) -> str:
+        """
+        Build a human-readable report of selector health.
+
+        Returns:
+            Multi-line report, one block per logical field
+        """
+        with self._lock:
+            fields = {name: dict(stats) for name, stats in self._stats.items()}
+
+        if not fields:
+            return "No selector statistics recorded yet."
+
+        lines = []
+        for field in sorted(fields):
+            winner = self.winner(field)
+            lines.append(f"=== {field} ===")
+            rows = sorted(
+                fields[field].items(),
+                key=lambda kv: (-self._hit_rate(kv[1]), -kv[1]['hits'])
+            )
+            for key, stats in rows:
+                avg_hit = stats['hit_latency'] / stats['hits'] if stats['hits'] else 0.0
+                avg_miss = stats['miss_latency'] / stats['misses'] if stats['misses'] else 0.0
+                marker = '*' if key == winner else ' '
+                lines.append(
+                    f" {marker} {self._hit_rate(stats):6.1%}  hits={stats['hits']:<5} "
+                    f"misses={stats['misses']:<5} avg_hit={avg_hit * 1000:7.1f}ms "
+                    f"avg_miss={avg_miss * 1000:7.1f}ms  {key}"
+                )
+            if not winner:
+                lines.append("   ✗ No working selector - markup may have changed")
+            lines.append("")
+
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    stats_path = sys.argv[1] if len(sys.argv) > 1 else './data/selector_stats.json'
+    print(SelectorRegistry(stats_path).report())
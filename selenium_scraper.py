@@ -12,11 +12,9 @@ from datetime import datetime
 from urllib.parse import quote_plus, urljoin
 import re
 import os
+import tempfile
+from collections import deque
 import platform
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    BeautifulSoup = None
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -33,26 +31,251 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 
 from robots_checker import RobotsChecker
+from captcha_policy import CaptchaPolicy, CaptchaBlocked
+from rate_controller import AdaptiveRateController
+from selector_registry import SelectorRegistry
+from website_crawler import WebsiteCrawler
+from metrics import RunMetrics, timed
 from utils import sleep_random
 
 
 class SeleniumScraper:
     """Selenium-based scraper for extracting business leads from Google Maps."""
     
-    def __init__(self, config, headless=False, guest_mode=True, profile=None, delay=1.5):
-        """Initialize the Selenium scraper."""
+    # How far scrape_google_maps goes per place: feed card only, place panel,
+    # or place panel plus a visit to the business website
+    DEPTHS = ('list', 'details', 'website')
+    
+    RATING_PREFIX = re.compile(r'^\d[.,]\d\s*\([\d,.]+\)\s*')
+    
+    # Fallback selectors per logical field, in their default order.
+    # The SelectorRegistry reorders them at runtime so today's winner goes first.
+    SEARCH_BOX_SELECTORS = [
+        (By.ID, 'searchboxinput'),
+        (By.NAME, 'q'),
+        (By.CSS_SELECTOR, 'input[id*="search"]'),
+        (By.CSS_SELECTOR, 'input[placeholder*="Search" i]'),
+        (By.CSS_SELECTOR, 'input[aria-label*="Search" i]'),
+        (By.CSS_SELECTOR, '#searchbox-form input, .searchbox input, [data-attr*="search"] input'),
+    ]
+    
+    RESULTS_PANEL_SELECTORS = [
+        (By.CSS_SELECTOR, 'div[role="feed"]'),
+        (By.CSS_SELECTOR, '.m6QErb[role="feed"]'),
+        (By.CSS_SELECTOR, '.m6QErb.DxyBCb.kA9KIf.dS8AEf.ecceSd'),
+        (By.CSS_SELECTOR, '.m6QErb[aria-label*="Results"]'),
+        (By.CSS_SELECTOR, '[role="main"] div[role="feed"], .search-results, .results-panel'),
+        (By.CSS_SELECTOR, '[jsaction*="search" i], [aria-label*="search" i] + div, div[role="main"]'),
+        (By.CSS_SELECTOR, 'div[aria-label*="results" i], div[data-section*="results" i], .scrollable-results'),
+    ]
+    
+    RESULT_LINK_SELECTORS = [
+        (By.CSS_SELECTOR, 'div[role="feed"] > div > div > a'),
+        (By.CSS_SELECTOR, 'a[data-value][href*="/place"], [data-result-index] a, [jsaction*="result" i] a'),
+        (By.CSS_SELECTOR, 'a[href*="/maps/place/"], [data-value*="place"], .result-item a, .search-result a'),
+        (By.CSS_SELECTOR, '[role="feed"] a, [role="main"] a[href*="/maps/"], .results-list a'),
+    ]
+    
+    # Returns {cards: [{href, aria_label, text, index}], selector, matched} for the
+    # first selector in arguments[0] that matches anything. Cards keep their
+    # data-lead-idx across calls so already-seen cards are cheap to skip.
+    CARD_SNAPSHOT_JS = """
+        const selectors = arguments[0];
+        window.__leadIdx = window.__leadIdx || 0;
+        for (let i = 0; i < selectors.length; i++) {
+            const nodes = document.querySelectorAll(selectors[i]);
+            if (!nodes.length) continue;
+            const cards = [];
+            const seen = new Set();
+            nodes.forEach(a => {
+                const href = a.href || a.getAttribute('href') || '';
+                if (!href || seen.has(href)) return;
+                seen.add(href);
+                if (!a.dataset.leadIdx) a.dataset.leadIdx = String(window.__leadIdx++);
+                const container = a.closest('[role="article"]') || a.parentElement || a;
+                cards.push({
+                    href: href,
+                    aria_label: a.getAttribute('aria-label') || '',
+                    text: (container.innerText || '').trim(),
+                    index: parseInt(a.dataset.leadIdx, 10)
+                });
+            });
+            return {cards: cards, selector: selectors[i], matched: i};
+        }
+        return {cards: [], selector: null, matched: null};
+    """
+    
+    # Attaches a MutationObserver to the feed (arguments[0]) that buffers
+    # every not-yet-seen card matching the first working selector in
+    # arguments[1]. Cards already in the feed are buffered immediately.
+    FEED_OBSERVER_JS = """
+        const feed = arguments[0];
+        const selectors = arguments[1];
+        if (window.__leadObserver) window.__leadObserver.disconnect();
+        window.__leadIdx = window.__leadIdx || 0;
+        window.__leadBuffer = [];
+        window.__leadEnded = false;
+        let selector = selectors.find(s => feed.querySelector(s)) || 'a[href*="/maps/place/"]';
+        const collect = () => {
+            feed.querySelectorAll(selector).forEach(a => {
+                if (a.dataset.leadIdx) return;
+                const href = a.href || a.getAttribute('href') || '';
+                if (!href) return;
+                a.dataset.leadIdx = String(window.__leadIdx++);
+                const container = a.closest('[role="article"]') || a.parentElement || a;
+                window.__leadBuffer.push({
+                    href: href,
+                    aria_label: a.getAttribute('aria-label') || '',
+                    text: (container.innerText || '').trim(),
+                    index: parseInt(a.dataset.leadIdx, 10)
+                });
+            });
+            if (feed.querySelector('.HlvSq') ||
+                /end of the list/i.test((feed.lastElementChild || {}).innerText || '')) {
+                window.__leadEnded = true;
+            }
+        };
+        window.__leadObserver = new MutationObserver(collect);
+        window.__leadObserver.observe(feed, {childList: true, subtree: true});
+        window.__leadFeed = feed;
+        collect();
+        return true;
+    """
+    
+    # Returns and clears the observer buffer; scrolls the feed when arguments[0] is true
+    FEED_DRAIN_JS = """
+        const cards = window.__leadBuffer || [];
+        window.__leadBuffer = [];
+        const feed = window.__leadFeed;
+        if (arguments[0] && feed && !window.__leadEnded) {
+            feed.scrollTo(0, feed.scrollHeight);
+        }
+        return {cards: cards, ended: !!window.__leadEnded};
+    """
+    
+    # Cheap captcha probe: interstitial URL, recaptcha widgets, or a tiny
+    # "unusual traffic" page. Returns the DOM size only when arguments[0] is true.
+    CAPTCHA_CHECK_JS = """
+        const href = location.href;
+        let reason = null;
+        if (href.includes('/sorry/')) {
+            reason = 'unusual_traffic';
+        } else if (href.includes('/recaptcha/') || document.querySelector(
+            'iframe[src*="recaptcha"], iframe[title*="reCAPTCHA" i], .g-recaptcha, #captcha-form, form[action*="sorry"]'
+        )) {
+            reason = 'captcha';
+        } else if (/unusual traffic/i.test(document.title || '')) {
+            reason = 'unusual_traffic';
+        } else if (/verify you are human|not a robot/i.test(document.title || '')) {
+            reason = 'captcha';
+        } else if (document.body && document.body.childElementCount < 20) {
+            const text = (document.body.innerText || '').slice(0, 3000);
+            if (/unusual traffic/i.test(text)) reason = 'unusual_traffic';
+            else if (/verify you are human|not a robot/i.test(text)) reason = 'captcha';
+        }
+        return {
+            captcha: reason !== null,
+            reason: reason,
+            size: arguments[0] ? document.documentElement.outerHTML.length : 0
+        };
+    """
+    
+    # Runs the email regex inside the page and returns only the matches
+    EMAIL_SCAN_JS = """
+        const html = document.documentElement.innerHTML;
+        const emails = html.match(/[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}/g) || [];
+        return {emails: Array.from(new Set(emails)).slice(0, 50), size: html.length};
+    """
+    
+    # True once a place panel titled arguments[0] is showing (whitespace and case insensitive)
+    PANEL_TITLE_JS = """
+        const norm = (text) => (text || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+        const name = norm(arguments[0]);
+        return Array.from(document.querySelectorAll('h1')).some(h1 => norm(h1.textContent) === name);
+    """
+    
+    DETAIL_SELECTORS = {
+        'address': [
+            (By.CSS_SELECTOR, 'button[data-item-id="address"] div.fontBodyMedium', 'text'),
+            (By.CSS_SELECTOR, 'button[data-tooltip="Copy address"]', 'aria-label'),
+            (By.XPATH, '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]', 'text'),
+        ],
+        'phone': [
+            (By.CSS_SELECTOR, 'button[data-tooltip="Copy phone number"]', 'aria-label'),
+            (By.CSS_SELECTOR, 'button[data-item-id*="phone"]', 'aria-label'),
+        ],
+        'website': [
+            (By.CSS_SELECTOR, 'a[data-item-id="authority"]', 'href'),
+            (By.CSS_SELECTOR, 'a[data-tooltip="Open website"]', 'href'),
+            (By.CSS_SELECTOR, 'a[aria-label*="website"]', 'href'),
+        ],
+        'rating': [
+            (By.CSS_SELECTOR, 'div.F7nice > span[aria-hidden="true"]', 'text'),
+            (By.CSS_SELECTOR, 'span[role="img"][aria-label*="stars"]', 'aria-label'),
+            (By.CSS_SELECTOR, '.fontDisplayLarge', 'text'),
+        ],
+        'reviews': [
+            (By.CSS_SELECTOR, 'div.F7nice > span > span > span[aria-label]', 'aria-label'),
+            (By.CSS_SELECTOR, 'button[jsaction*="review"]', 'text'),
+            (By.CSS_SELECTOR, 'span[aria-label*="reviews"]', 'aria-label'),
+        ],
+    }
+    
+    def __init__(self, config, headless=False, guest_mode=True, profile=None, delay=1.5, captcha_policy=None,
+                 recorder=None, metrics=None):
+        """
+        Initialize the Selenium scraper.
+        
+        captcha_policy decides what happens when a captcha appears (see
+        captcha_policy.py); by default it is built from the config.
+        recorder (a maps_replay.MapsRecorder) snapshots the Maps pages of the
+        run for offline replay. metrics (a metrics.RunMetrics) collects phase
+        timings and WebDriver command counts; pass the run's shared instance.
+        """
         self.config = config
         self.headless = headless
         self.guest_mode = guest_mode
         self.profile = profile
         self.delay = delay
+        self.recorder = recorder
+        self.metrics = metrics or RunMetrics()
         self.logger = logging.getLogger(__name__)
+        # Points at a maps_replay.ReplayServer for offline runs
+        self.maps_base_url = config.scraping.get('maps_base_url', 'https://www.google.com').rstrip('/')
         self.robots_checker = RobotsChecker(config)
+        self.selectors = SelectorRegistry(
+            config.selectors.get('stats_file') if config.selectors.get('persist', True) else None
+        )
         self.driver = None
         self.wait = None
+        self.user_data_dir = None
+        self.captcha_policy = captcha_policy or CaptchaPolicy.from_config(config)
+        
+        # AIMD pacing shared by all scrapers; delay only seeds unknown identities
+        self.rate_enabled = config.rate.get('enabled', True)
+        self.rate_controller = AdaptiveRateController.shared(config)
+        
+        # Captcha checks run after every navigation and every N-th place otherwise
+        self.captcha_check_every = max(1, int(config.captcha.get('check_every', 5)))
+        self.captcha_stats = {
+            'checks': 0,
+            'skipped': 0,
+            'detected': 0,
+            'page_source_bytes_avoided': 0
+        }
+        self._captcha_calls = 0
+        self._captcha_check_pending = True
+        self._last_page_size = 0
+        self._last_captcha_reason = None
+        
+        # Website enrichment follows contact/about pages within a page budget
+        self.website_crawler = WebsiteCrawler(config)
+        self.crawl_reports: List[Dict] = []
         
         self._setup_driver()
+        self.metrics.instrument_driver(self.driver)
     
+    @timed('driver_setup')
     def _setup_driver(self):
         """Set up Chrome WebDriver with appropriate options."""
         self.logger.info("Setting up Chrome WebDriver...")
@@ -62,6 +285,9 @@ class SeleniumScraper:
         if self.guest_mode and not self.profile:
             self.logger.info("Launching Chrome in Guest mode")
             options.add_argument('--guest')
+            if self.user_data_dir:
+                # Fresh throwaway profile after a captcha rotation
+                options.add_argument(f'--user-data-dir={self.user_data_dir}')
         elif self.profile:
             self.logger.info(f"Launching Chrome with profile: {self.profile}")
             system = platform.system()
@@ -98,6 +324,9 @@ class SeleniumScraper:
         if self.headless:
             options.add_argument('--headless=new')
         
+        if self.recorder:
+            self.recorder.configure_options(options)
+        
         # Additional stealth options
         options.add_argument('--disable-features=UserAgentClientHint')
         options.add_argument('--disable-features=VizDisplayCompositor')
@@ -196,15 +425,97 @@ class SeleniumScraper:
             self.logger.error(f"Failed to initialize Chrome WebDriver: {e}")
             raise
     
+    @property
+    def identity(self) -> str:
+        """
+        Egress identity used to attribute captchas and pacing.
+        
+        The Chrome profile name, 'guest' for the default guest session, or
+        'guest-<dir>' for each throwaway profile created by rotate_identity,
+        so a fresh browser does not inherit the blocked one's cool-down.
+        """
+        if self.profile:
+            return self.profile
+        if self.user_data_dir:
+            return f"guest-{os.path.basename(self.user_data_dir)}"
+        return 'guest'
+    
+    @timed('pacing')
+    def _pace(self):
+        """Wait before the next place action, at the adaptive or static rate."""
+        if self.rate_enabled:
+            self.rate_controller.wait(self.identity, initial_rate=1.0 / (self.delay * 1.5))
+        else:
+            sleep_random(self.delay * 1.5, 0.5)
+    
+    def _signal(self, outcome: str):
+        """Feed a success or penalty signal to the adaptive rate controller."""
+        if not self.rate_enabled:
+            return
+        if outcome == 'success':
+            self.rate_controller.success(self.identity)
+        else:
+            self.rate_controller.penalize(self.identity, outcome)
+    
+    def rotate_identity(self, tracker=None):
+        """
+        Restart the browser under a different identity after a captcha.
+        
+        Picks the least captcha-affected profile from captcha.profiles (or a
+        fresh throwaway guest profile) and sets up a new driver.
+        """
+        tracker = tracker or self.captcha_policy.tracker
+        old_identity = self.identity
+        
+        candidates = [p for p in self.config.captcha.get('profiles', []) if p != self.profile]
+        next_profile = tracker.pick(candidates + ['guest']) if candidates else 'guest'
+        
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error closing browser during rotation: {e}")
+        self.driver = None
+        
+        if next_profile == 'guest':
+            self.profile = None
+            self.guest_mode = True
+            self.user_data_dir = tempfile.mkdtemp(prefix='lead-scraper-')
+        else:
+            self.profile = next_profile
+            self.guest_mode = False
+            self.user_data_dir = None
+        
+        self.logger.info(f"Rotating browser identity: {old_identity} -> {self.identity}")
+        self._setup_driver()
+        self.metrics.instrument_driver(self.driver)
+        self.metrics.count('identity_rotations')
+        self._captcha_check_pending = True
+    
     def scrape_google_maps(
         self,
         query: str,
         location: str,
         max_results: int = 100,
         tile_mode: bool = False,
-        tile_size: float = 0.1
+        tile_size: float = 0.1,
+        center: Optional[Tuple[float, float]] = None,
+        depth: str = 'website'
     ) -> List[Dict]:
-        """Scrape business leads from Google Maps with enhanced extraction."""
+        """
+        Scrape business leads from Google Maps with enhanced extraction.
+        
+        depth controls how much work is done per place:
+        'list' parses the feed cards only (no clicks), 'details' also opens
+        each place panel, 'website' additionally visits the business website.
+        
+        The 'leads' counter of self.metrics is left to the caller, which
+        knows which attempt's leads (or captcha-interrupted partial leads)
+        it finally keeps.
+        """
+        if depth not in self.DEPTHS:
+            raise ValueError(f"Unknown depth '{depth}', expected one of {self.DEPTHS}")
+        
         all_leads = []
         
         # Temporarily disable robots.txt for testing purposes
@@ -212,27 +523,43 @@ class SeleniumScraper:
         self.config.robots['enabled'] = False
         
         try:
-            self.logger.info("Navigating to Google Maps...")
-            self.driver.get('https://www.google.com/maps')
-            sleep_random(3, 1)
-            
-            if self._detect_captcha():
-                self._handle_captcha()
-            
             search_query = f"{query} {location}"
             self.logger.info(f"Searching for: {search_query}")
             
-            if not self._perform_search(search_query):
-                self.logger.error("Search failed")
-                return all_leads
-            
-            self.logger.info("Waiting for results to load...")
-            sleep_random(4, 1)
+            with self.metrics.span('search'):
+                search_mode = self.config.scraping.get('search_mode', 'url')
+                searched = False
+                
+                if search_mode == 'url':
+                    searched = self._navigate_to_search(search_query, center)
+                
+                if not searched:
+                    # Fallback: open Maps and type the query into the search box
+                    self.logger.info("Navigating to Google Maps...")
+                    self._navigate(f"{self.maps_base_url}/maps")
+                    sleep_random(3, 1)
+                
+                    if self._detect_captcha():
+                        self._handle_captcha()
+                
+                    if not self._perform_search(search_query):
+                        self.logger.error("Search failed")
+                        return all_leads
+                
+                    self.logger.info("Waiting for results to load...")
+                    sleep_random(4, 1)
             
-            # Scroll to load more results
-            self._scroll_for_more_results(max_results)
+            if self.recorder:
+                self.recorder.record_search(self.driver, search_query)
             
-            leads = self._extract_results(max_results)
+            if self.config.scraping.get('stream_results', True):
+                # Scrolling and extraction happen in a single pipelined loop
+                leads = self._extract_results_streaming(max_results, depth)
+            else:
+                # Scroll to load more results
+                self._scroll_for_more_results(max_results)
+                
+                leads = self._extract_results(max_results, depth)
             all_leads.extend(leads)
             
             self.logger.info(f"✓ Extracted {len(leads)} businesses from Google Maps")
@@ -258,27 +585,12 @@ class SeleniumScraper:
         
         return allowed
     
+    @timed('scroll')
     def _scroll_for_more_results(self, max_results: int):
         """Scroll the results panel to load more businesses."""
         try:
             # Find the results panel
-            result_panels = [
-                '[role="feed"]',
-                '.m6QErb[role="feed"]',
-                '.m6QErb.DxyBCb.kA9KIf.dS8AEf.ecceSd',
-                '.m6QErb[aria-label*="Results"]'
-            ]
-            
-            results_panel = None
-            for selector in result_panels:
-                try:
-                    results_panel = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    self.logger.debug(f"Found results panel with: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            results_panel = self._wait_for_field('results_panel', self.RESULTS_PANEL_SELECTORS)
             
             if not results_panel:
                 self.logger.warning("Could not find results panel for scrolling")
@@ -310,69 +622,134 @@ class SeleniumScraper:
         except Exception as e:
             self.logger.warning(f"Error during scrolling: {e}")
     
-    def _perform_search(self, query: str) -> bool:
-        """Perform search on Google Maps."""
+    def _navigate_to_search(
+        self,
+        query: str,
+        center: Optional[Tuple[float, float]] = None,
+        zoom: Optional[int] = None
+    ) -> bool:
+        """
+        Open the results page directly via a /maps/search/ URL (fast path).
+        
+        A captcha interstitial goes to the captcha policy (which may raise
+        CaptchaBlocked) instead of counting as a slow page and falling back
+        to a typed search on the same blocked page.
+        """
+        search_url = self._build_search_url(query, center, zoom)
+        
         try:
-            search_box = None
+            self.logger.info(f"Opening search URL: {search_url}")
+            self._navigate(search_url)
+            if self._detect_captcha():
+                self._handle_captcha()
             
-            # Method 1: Try the original ID selector
             try:
-                search_box = self.wait.until(
-                    EC.presence_of_element_located((By.ID, 'searchboxinput'))
+                self._wait_for_search_results()
+            except TimeoutException:
+                # The interstitial may replace the page after the first probe
+                if not self._detect_captcha(force=True):
+                    raise
+                self._handle_captcha()
+                self._wait_for_search_results()
+            
+            self.logger.info("✓ Search results opened via direct URL")
+            return True
+            
+        except CaptchaBlocked:
+            raise
+        except TimeoutException:
+            self.logger.warning("Direct search URL did not render results")
+            self._signal('timeout')
+            return False
+        except Exception as e:
+            self.logger.warning(f"Direct search URL failed: {e}")
+            return False
+    
+    def _wait_for_search_results(self, timeout: float = 15):
+        """Wait until a search rendered: the feed, or a single match's /maps/place/ page."""
+        WebDriverWait(self.driver, timeout).until(
+            lambda d: '/maps/place/' in d.current_url or
+            d.find_elements(By.CSS_SELECTOR, 'div[role="feed"]')
+        )
+    
+    def _build_search_url(
+        self,
+        query: str,
+        center: Optional[Tuple[float, float]] = None,
+        zoom: Optional[int] = None
+    ) -> str:
+        """Build a Google Maps search URL, optionally pinned to a map viewport."""
+        url = f"{self.maps_base_url}/maps/search/{quote_plus(query)}"
+        
+        if center:
+            if zoom is None:
+                zoom = self.config.scraping.get('search_zoom', 13)
+            url += f"/@{center[0]:.6f},{center[1]:.6f},{zoom}z"
+        
+        return url
+    
+    def _wait_for_field(self, field: str, candidates: List[Tuple], timeout: float = 15):
+        """
+        Wait for the first matching element of a logical field.
+        
+        Candidates are tried in registry order. Only the first one waits the
+        full timeout; once the page is up the remaining selectors either match
+        immediately or not at all, so they get a short wait.
+        
+        Misses are only recorded when another candidate matched: if none does,
+        the page probably never loaded and no selector is to blame.
+        """
+        misses = []
+        for attempt, candidate in enumerate(self.selectors.ordered(field, candidates)):
+            by, selector = candidate[:2]
+            started = time.monotonic()
+            try:
+                element = WebDriverWait(self.driver, timeout if attempt == 0 else 2).until(
+                    EC.presence_of_element_located((by, selector))
                 )
-                self.logger.debug("Found search box with ID 'searchboxinput'")
             except TimeoutException:
-                pass
+                misses.append((candidate, time.monotonic() - started))
+                continue
             
-            # Method 2: Try the name attribute (found by diagnostic)
-            if not search_box:
-                try:
-                    search_box = self.wait.until(
-                        EC.presence_of_element_located((By.NAME, 'q'))
-                    )
-                    self.logger.debug("Found search box with NAME 'q'")
-                except TimeoutException:
-                    pass
-            
-            # Method 3: Try updated selectors for 2025 Google Maps
-            if not search_box:
-                try:
-                    search_box = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'input[id*="search"]'))
-                    )
-                    self.logger.debug("Found search box with CSS 'input[id*=\"search\"]'")
-                except TimeoutException:
-                    pass
-            
-            # Method 4: Try by placeholder attribute
-            if not search_box:
-                try:
-                    search_box = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'input[placeholder*="Search" i]'))
-                    )
-                    self.logger.debug("Found search box with placeholder")
-                except TimeoutException:
-                    pass
-            
-            # Method 5: Try by aria-label attribute
-            if not search_box:
-                try:
-                    search_box = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'input[aria-label*="Search" i]'))
-                    )
-                    self.logger.debug("Found search box with aria-label")
-                except TimeoutException:
-                    pass
-            
-            # Method 6: Try any input in search area
-            if not search_box:
-                try:
-                    search_box = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '#searchbox-form input, .searchbox input, [data-attr*="search"] input'))
-                    )
-                    self.logger.debug("Found search box with form selector")
-                except TimeoutException:
-                    pass
+            for missed, elapsed in misses:
+                self.selectors.record(field, missed, False, elapsed)
+            self.selectors.record(field, candidate, True, time.monotonic() - started)
+            self.logger.debug(f"Found {field} with {by} '{selector}'")
+            return element
+        
+        return None
+    
+    def _extract_field(self, field: str) -> Optional[str]:
+        """
+        Extract a detail-panel field using its registered fallback selectors.
+        
+        As in _wait_for_field, misses are only recorded when another candidate
+        matched; many places simply have no phone or website.
+        """
+        misses = []
+        for candidate in self.selectors.ordered(field, self.DETAIL_SELECTORS[field]):
+            by, selector, attribute = candidate
+            started = time.monotonic()
+            value = self._safe_extract(by, selector, attribute)
+            if not value:
+                misses.append((candidate, time.monotonic() - started))
+                continue
+            
+            for missed, elapsed in misses:
+                self.selectors.record(field, missed, False, elapsed)
+            self.selectors.record(field, candidate, True, time.monotonic() - started)
+            return value
+        
+        return None
+    
+    def _find_search_box(self):
+        """Locate the search input, trying the last working selector first."""
+        return self._wait_for_field('search_box', self.SEARCH_BOX_SELECTORS)
+    
+    def _perform_search(self, query: str) -> bool:
+        """Perform search on Google Maps by typing into the search box."""
+        try:
+            search_box = self._find_search_box()
             
             if not search_box:
                 self.logger.error("Search box not found with any selector")
@@ -398,52 +775,13 @@ class SeleniumScraper:
             self.logger.error(f"Search failed: {e}")
             return False
     
-    def _extract_results(self, max_results: int) -> List[Dict]:
+    def _extract_results(self, max_results: int, depth: str = 'website') -> List[Dict]:
         """Extract business information from search results - FIXED FOR 2025."""
         leads = []
         processed_names = set()
         
         try:
-            results_panel = None
-            
-            # Method 1: Try the original feed selector
-            try:
-                results_panel = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div[role="feed"]'))
-                )
-                self.logger.debug("Found results panel with 'div[role=\"feed\"]'")
-            except TimeoutException:
-                pass
-            
-            # Method 2: Try updated selectors for 2025
-            if not results_panel:
-                try:
-                    results_panel = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '[role="main"] div[role="feed"], .search-results, .results-panel'))
-                    )
-                    self.logger.debug("Found results panel with updated selectors")
-                except TimeoutException:
-                    pass
-            
-            # Method 3: Try from diagnostic findings - search-related area
-            if not results_panel:
-                try:
-                    results_panel = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '[jsaction*="search" i], [aria-label*="search" i] + div, div[role="main"]'))
-                    )
-                    self.logger.debug("Found results panel from diagnostic findings")
-                except TimeoutException:
-                    pass
-            
-            # Method 4: Try any scrollable results area
-            if not results_panel:
-                try:
-                    results_panel = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'div[aria-label*="results" i], div[data-section*="results" i], .scrollable-results'))
-                    )
-                    self.logger.debug("Found results panel with aria-label")
-                except TimeoutException:
-                    pass
+            results_panel = self._wait_for_field('results_panel', self.RESULTS_PANEL_SELECTORS)
             
             if not results_panel:
                 self.logger.warning("Results panel not found with any selector")
@@ -458,146 +796,36 @@ class SeleniumScraper:
         scroll_attempts = 0
         max_scroll_attempts = self.config.scraping['max_scroll_attempts']
         no_new_results_count = 0
+        seen_hrefs = set()
+        signaled_empty = False
         
         while len(leads) < max_results and scroll_attempts < max_scroll_attempts:
             try:
-                # Find all result links with multiple fallback selectors
-                result_elements = []
-                
-                # Method 1: Original selector
-                elements = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'div[role="feed"] > div > div > a'
-                )
-                if elements:
-                    result_elements.extend(elements)
-                    self.logger.debug(f"Found {len(elements)} elements with original selector")
-                
-                # Method 2: From diagnostic - search result items
-                elements = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'a[data-value][href*="/place"], [data-result-index] a, [jsaction*="result" i] a'
-                )
-                if elements:
-                    result_elements.extend(elements)
-                    self.logger.debug(f"Found {len(elements)} elements with diagnostic selectors")
-                
-                # Method 3: Updated selectors for 2025
-                elements = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'a[href*="/maps/place/"], [data-value*="place"], .result-item a, .search-result a'
-                )
-                if elements:
-                    result_elements.extend(elements)
-                    self.logger.debug(f"Found {len(elements)} elements with updated selectors")
-                
-                # Method 4: Any links in results area
-                elements = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    '[role="feed"] a, [role="main"] a[href*="/maps/"], .results-list a'
-                )
-                if elements:
-                    result_elements.extend(elements)
-                    self.logger.debug(f"Found {len(elements)} elements with generic selectors")
+                # Snapshot every result card in one round trip and keep only new ones
+                with self.metrics.span('feed'):
+                    cards = self._snapshot_cards()
+                if self.recorder:
+                    self.recorder.record_feed(self.driver)
+                new_cards = [card for card in cards if card['href'] not in seen_hrefs]
+                seen_hrefs.update(card['href'] for card in new_cards)
+                self.metrics.count('cards_seen', len(new_cards))
                 
-                # Remove duplicates by href
-                seen_hrefs = set()
-                unique_elements = []
-                for elem in result_elements:
-                    href = elem.get_attribute('href') or ''
-                    if href and href not in seen_hrefs:
-                        seen_hrefs.add(href)
-                        unique_elements.append(elem)
+                self.logger.info(f"Found {len(cards)} result cards on page ({len(new_cards)} new)")
                 
-                result_elements = unique_elements
-                
-                self.logger.info(f"Found {len(result_elements)} result elements on page")
+                if not cards and not seen_hrefs and not signaled_empty:
+                    # Once per search, like _stream_cards: each signal is a persisted rate cut
+                    self._signal('empty_feed')
+                    signaled_empty = True
                 
                 current_leads_count = len(leads)
                 
-                for idx, element in enumerate(result_elements):
+                for card in new_cards:
                     if len(leads) >= max_results:
                         break
                     
-                    try:
-                        # UPDATED: Multiple fallback methods for business name
-                        business_name = None
-                        
-                        # Method 1: aria-label attribute (MOST RELIABLE)
-                        try:
-                            aria_label = element.get_attribute('aria-label')
-                            if aria_label and len(aria_label) > 2:
-                                business_name = aria_label.strip()
-                                self.logger.debug(f"Name from aria-label: {business_name}")
-                        except:
-                            pass
-                        
-                        # Method 2: Get text from any div inside
-                        if not business_name:
-                            try:
-                                divs = element.find_elements(By.TAG_NAME, 'div')
-                                for div in divs:
-                                    text = div.text.strip()
-                                    # Look for text that seems like a business name
-                                    if text and 3 < len(text) < 100 and '\n' not in text:
-                                        business_name = text
-                                        self.logger.debug(f"Name from div: {business_name}")
-                                        break
-                            except:
-                                pass
-                        
-                        # Method 3: All text from element (last resort)
-                        if not business_name:
-                            try:
-                                all_text = element.text.strip()
-                                if all_text:
-                                    # Take first line, max 100 chars
-                                    business_name = all_text.split('\n')[0][:100]
-                                    self.logger.debug(f"Name from element text: {business_name}")
-                            except:
-                                pass
-                        
-                        # Skip if no name or duplicate
-                        if not business_name or business_name in processed_names:
-                            self.logger.debug(f"Skipping: no name or duplicate")
-                            continue
-                        
-                        # Skip common non-business text
-                        skip_words = ['more places', 'see more', 'show more', 'load more', 'results']
-                        if any(word in business_name.lower() for word in skip_words):
-                            continue
-                        
-                        self.logger.info(f"Processing ({len(leads)+1}/{max_results}): {business_name}")
-                        processed_names.add(business_name)
-                        
-                        # Scroll into view
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center'});",
-                            element
-                        )
-                        sleep_random(0.5, 0.2)
-                        
-                        # Click element
-                        try:
-                            element.click()
-                        except:
-                            self.driver.execute_script("arguments[0].click();", element)
-                        
-                        sleep_random(self.delay * 1.5, 0.5)
-                        
-                        # Extract detailed information
-                        business_data = self._extract_business_details_simple(business_name)
-                        
-                        if business_data:
-                            leads.append(business_data)
-                            self.logger.info(f"✓ Extracted: {business_name}")
-                        
-                        if self._detect_captcha():
-                            self._handle_captcha()
-                        
-                    except Exception as e:
-                        self.logger.debug(f"Error processing result {idx}: {e}")
-                        continue
+                    business_data = self._process_card(card, processed_names, len(leads), max_results, depth)
+                    if business_data:
+                        leads.append(business_data)
                 
                 # Check if we got new results
                 if len(leads) == current_leads_count:
@@ -612,45 +840,426 @@ class SeleniumScraper:
                 # Scroll for more results
                 if len(leads) < max_results:
                     self.logger.info(f"Scrolling... ({len(leads)}/{max_results})")
-                    self._scroll_results_panel()
+                    with self.metrics.span('scroll'):
+                        self._scroll_results_panel()
+                        sleep_random(self.config.scraping['scroll_delay'], 0.5)
                     scroll_attempts += 1
-                    sleep_random(self.config.scraping['scroll_delay'], 0.5)
                 
+            except CaptchaBlocked as e:
+                e.partial_leads = leads
+                raise
             except Exception as e:
                 self.logger.error(f"Error in extraction loop: {e}", exc_info=True)
                 break
         
         return leads
     
-    def _extract_business_details_simple(self, name: str) -> Optional[Dict]:
-        """Extract business details from detail panel with EMAIL."""
+    def _process_card(
+        self,
+        card: Dict,
+        processed_names: set,
+        lead_number: int,
+        max_results: int,
+        depth: str = 'website'
+    ) -> Optional[Dict]:
+        """Turn a result card into a lead at the requested depth, skipping duplicates."""
+        try:
+            business_name = self._card_name(card)
+            
+            # Skip if no name or duplicate
+            if not business_name or business_name in processed_names:
+                self.logger.debug(f"Skipping: no name or duplicate")
+                self.metrics.count('cards_skipped')
+                return None
+            
+            # Skip common non-business text
+            skip_words = ['more places', 'see more', 'show more', 'load more', 'results']
+            if any(word in business_name.lower() for word in skip_words):
+                return None
+            
+            self.logger.info(f"Processing ({lead_number+1}/{max_results}): {business_name}")
+            processed_names.add(business_name)
+            self.metrics.count('cards_processed')
+            
+            if depth == 'list':
+                with self.metrics.span('card_parse'):
+                    return self._parse_card(card, business_name)
+            
+            # Scroll into view and click, paced by the rate controller
+            self._pace()
+            if not self._click_card(card):
+                self.logger.debug(f"Card no longer in DOM: {business_name}")
+                self.metrics.count('click_failures')
+                return None
+            
+            # The previous place's panel stays up until the clicked one replaces it
+            if not self._wait_for_panel(business_name):
+                self.logger.warning(f"Place panel did not open for {business_name}")
+                self.metrics.count('panel_timeouts')
+                self._signal('timeout')
+                return None
+            
+            # Extract detailed information
+            business_data = self._extract_business_details_simple(
+                business_name,
+                visit_website=(depth == 'website')
+            )
+            
+            if self._detect_captcha():
+                self._handle_captcha()
+            
+            if self.recorder:
+                self.recorder.record_place(self.driver, card)
+            
+            if business_data:
+                self.logger.info(f"✓ Extracted: {business_name}")
+                self._signal('success')
+            
+            return business_data
+            
+        except CaptchaBlocked:
+            raise
+        except Exception as e:
+            self.logger.debug(f"Error processing result {card.get('index')}: {e}")
+            return None
+    
+    def hydrate_details(self, leads: List[Dict], depth: str = 'details') -> List[Dict]:
+        """
+        Fill in place details for leads collected with depth='list'.
+        
+        Meant to run after filtering so only the leads worth keeping pay for
+        a detail page (and optionally a website visit). Leads are updated in
+        place; values already present are kept when a detail is missing.
+        With depth='website' the websites are crawled in one batch after the
+        Maps pages, interleaving hosts through the politeness scheduler.
+        
+        Args:
+            leads: Leads with a maps_url
+            depth: 'details' or 'website'
+            
+        Returns:
+            The same list of leads
+        """
+        if depth not in ('details', 'website'):
+            raise ValueError(f"Hydration depth must be 'details' or 'website', got '{depth}'")
+        
+        for idx, lead in enumerate(leads):
+            maps_url = lead.get('maps_url')
+            if not maps_url:
+                continue
+            
+            self.logger.info(f"Hydrating ({idx+1}/{len(leads)}): {lead.get('name')}")
+            try:
+                self._pace()
+                with self.metrics.span('navigate'):
+                    self._navigate(maps_url)
+                    self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'h1')))
+                
+                details = self._extract_business_details_simple(
+                    lead.get('name'),
+                    visit_website=False
+                )
+                for key, value in (details or {}).items():
+                    if value is not None:
+                        lead[key] = value
+                
+                if self._detect_captcha():
+                    self._handle_captcha()
+                
+                if self.recorder:
+                    self.recorder.record_place(self.driver, {'href': maps_url})
+                
+                self._signal('success')
+                self.metrics.count('leads_hydrated')
+                
+            except CaptchaBlocked as e:
+                e.partial_leads = leads
+                raise
+            except TimeoutException:
+                self.logger.warning(f"Timed out hydrating {lead.get('name')}")
+                self._signal('timeout')
+                self.metrics.count('hydrate_failures')
+            except Exception as e:
+                self.logger.warning(f"Failed to hydrate {lead.get('name')}: {e}")
+                self.metrics.count('hydrate_failures')
+        
+        if depth == 'website':
+            self._hydrate_websites(leads)
+        
+        return leads
+    
+    @timed('website_batch')
+    def _hydrate_websites(self, leads: List[Dict]):
+        """Crawl the websites of hydrated leads in one polite batch and merge contacts."""
+        websites = [lead.get('website') for lead in leads if lead.get('website')]
+        if not websites:
+            return
+        
+        self.logger.info(f"Enriching {len(set(websites))} websites...")
+        crawled = self.website_crawler.crawl_many(websites)
+        self.crawl_reports.extend(d.pop('crawl') for d in crawled.values() if d)
+        
+        for lead in leads:
+            site_details = crawled.get(lead.get('website'))
+            if not site_details:
+                continue
+            if not lead.get('email') and site_details.get('email'):
+                lead['email'] = site_details['email']
+            for k, v in site_details.get('social_media', {}).items():
+                if v:
+                    lead[k] = v
+            if lead.get('whatsapp'):
+                lead['whatsapp_status'] = "Available"
+    
+    def _parse_card(self, card: Dict, name: str) -> Dict:
+        """
+        Build a lead from the text of a feed card without opening the place.
+        
+        Card text looks like "Name\n4.6(1,234)\nCafe · $ · 12 Main St\nOpen ⋅ Closes 7 PM".
+        """
+        href = card.get('href') or ''
+        lines = [line.strip() for line in (card.get('text') or '').split('\n') if line.strip()]
+        
+        rating = None
+        reviews = None
+        rating_match = re.search(r'(\d[.,]\d)\s*\(([\d,.]+)\)', card.get('text') or '')
+        if rating_match:
+            rating = self._parse_rating(rating_match.group(1).replace(',', '.'))
+            reviews = self._parse_reviews(rating_match.group(2).replace('.', ','))
+        
+        category = None
+        address = None
+        price_level = None
+        phone = None
+        opening_hours = None
+        
+        for line in lines[1:]:
+            # "4.6(1,234) · $$" style lines carry the price after the rating
+            line = self.RATING_PREFIX.sub('', line)
+            parts = [part.strip() for part in re.split(r'[·⋅]', line) if part.strip()]
+            
+            hours = []
+            while parts and re.match(r'^(Open|Closed|Closes|Opens|Temporarily closed)', parts[0], re.IGNORECASE):
+                hours.append(parts.pop(0))
+            if hours and not opening_hours:
+                opening_hours = ' ⋅ '.join(hours)
+            
+            remaining = []
+            for part in parts:
+                if re.fullmatch(r'[$€£₹]{1,4}', part):
+                    price_level = part
+                elif re.fullmatch(r'\+?[\d\s().-]{7,}', part) and sum(c.isdigit() for c in part) >= 7:
+                    phone = phone or part
+                else:
+                    remaining.append(part)
+            
+            # The first "Category · Address" line describes the place
+            if category is None and '·' in line and remaining:
+                category = remaining[0]
+                if len(remaining) > 1:
+                    address = remaining[-1]
+        
+        coords = self._extract_coordinates(href)
+        
+        return {
+            'place_id': self._extract_place_id(href),
+            'name': name,
+            'address': address,
+            'phone': phone,
+            'email': None,
+            'website': None,
+            'category': category,
+            'rating': rating,
+            'reviews': reviews,
+            'opening_hours': opening_hours,
+            'price_level': price_level,
+            'whatsapp_status': None,
+            'latitude': coords[0] if coords else None,
+            'longitude': coords[1] if coords else None,
+            'maps_url': href,
+            'source_url': href,
+            'timestamp': datetime.now().isoformat(),
+            'labels': None
+        }
+    
+    def _extract_results_streaming(self, max_results: int, depth: str = 'website') -> List[Dict]:
+        """Scroll and extract in one pipelined loop fed by _stream_cards."""
+        leads = []
+        processed_names = set()
+        
         try:
-            sleep_random(1.5, 0.3)
+            for card in self._stream_cards():
+                if len(leads) >= max_results:
+                    break
+                
+                business_data = self._process_card(card, processed_names, len(leads), max_results, depth)
+                if business_data:
+                    leads.append(business_data)
+        except CaptchaBlocked as e:
+            e.partial_leads = leads
+            raise
+        
+        return leads
+    
+    def _stream_cards(self, low_watermark: int = 5):
+        """
+        Yield result cards as Google Maps renders them.
+        
+        A MutationObserver injected into the feed buffers newly rendered cards
+        in the page. Each drain call returns the buffered cards and, when the
+        local backlog is at or below low_watermark, scrolls the feed to load
+        the next batch in the same round trip. The stream ends at the
+        "end of the list" marker or after max_scroll_attempts idle scrolls.
+        
+        Args:
+            low_watermark: Backlog size at which the next scroll is triggered
+            
+        Yields:
+            Card dicts of the same shape as _snapshot_cards returns
+        """
+        panel = self._wait_for_field('results_panel', self.RESULTS_PANEL_SELECTORS)
+        if not panel:
+            self.logger.warning("Results panel not found with any selector")
+            return
+        
+        candidates = self.selectors.ordered('result_links', self.RESULT_LINK_SELECTORS)
+        installed = self.driver.execute_script(
+            self.FEED_OBSERVER_JS,
+            panel,
+            [selector for _, selector in candidates]
+        )
+        if not installed:
+            self.logger.warning("Could not attach feed observer")
+            return
+        self.logger.info("✓ Streaming results from feed")
+        
+        max_idle_scrolls = self.config.scraping['max_scroll_attempts']
+        scroll_delay = self.config.scraping['scroll_delay']
+        backlog = deque()
+        idle_scrolls = 0
+        yielded_any = False
+        
+        while True:
+            scroll = len(backlog) <= low_watermark
+            with self.metrics.span('feed'):
+                state = self.driver.execute_script(self.FEED_DRAIN_JS, scroll)
+            backlog.extend(state.get('cards', []))
+            self.metrics.count('cards_seen', len(state.get('cards', [])))
+            if self.recorder and (state.get('cards') or state.get('ended')):
+                self.recorder.record_feed(self.driver)
+            
+            if state.get('cards'):
+                idle_scrolls = 0
+                yielded_any = True
+            elif not backlog:
+                if state.get('ended'):
+                    self.logger.info("Reached the end of the results list")
+                    return
+                idle_scrolls += 1
+                if idle_scrolls > max_idle_scrolls:
+                    self.logger.info(f"Stopping - no new results after {max_idle_scrolls} scrolls")
+                    if not yielded_any:
+                        # A feed that never renders is a soft block more often than a real empty search
+                        self._signal('empty_feed')
+                    return
+                with self.metrics.span('scroll'):
+                    sleep_random(scroll_delay, 0.5)
+                continue
             
+            yield backlog.popleft()
+    
+    def _snapshot_cards(self) -> List[Dict]:
+        """
+        Collect every result card in the feed with a single execute_script.
+        
+        Each card is tagged with a stable data-lead-idx attribute so it can be
+        clicked later without holding a WebElement reference.
+        
+        Returns:
+            List of {href, aria_label, text, index} dicts in feed order
+        """
+        candidates = self.selectors.ordered('result_links', self.RESULT_LINK_SELECTORS)
+        started = time.monotonic()
+        
+        try:
+            snapshot = self.driver.execute_script(
+                self.CARD_SNAPSHOT_JS,
+                [selector for _, selector in candidates]
+            )
+        except WebDriverException as e:
+            self.logger.debug(f"Card snapshot failed: {e}")
+            return []
+        
+        elapsed = time.monotonic() - started
+        matched = snapshot.get('matched')
+        # An empty feed blames no selector
+        for _, selector in candidates[:matched + 1] if matched is not None else []:
+            hit = selector == snapshot.get('selector')
+            self.selectors.record('result_links', (By.CSS_SELECTOR, selector), hit, elapsed if hit else 0.0)
+        
+        return snapshot.get('cards', [])
+    
+    def _card_name(self, card: Dict) -> Optional[str]:
+        """Pick the business name from a card snapshot."""
+        aria_label = (card.get('aria_label') or '').strip()
+        if len(aria_label) > 2:
+            return aria_label
+        
+        text = (card.get('text') or '').strip()
+        if text:
+            # First line of the card is the business name, max 100 chars
+            return text.split('\n')[0][:100]
+        
+        return None
+    
+    @timed('panel_wait')
+    def _wait_for_panel(self, name: str, timeout: float = 10) -> bool:
+        """Wait until the place panel's h1 shows name, i.e. the clicked place has opened."""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                lambda driver: driver.execute_script(self.PANEL_TITLE_JS, name)
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    @timed('click')
+    def _click_card(self, card: Dict) -> bool:
+        """Scroll a snapshotted card into view and click it."""
+        clicked = self.driver.execute_script(
+            """
+            const card = document.querySelector('[data-lead-idx="' + arguments[0] + '"]');
+            if (!card) return false;
+            card.scrollIntoView({block: 'center'});
+            card.click();
+            return true;
+            """,
+            card['index']
+        )
+        return bool(clicked)
+    
+    @timed('details')
+    def _extract_business_details_simple(self, name: str, visit_website: bool = True) -> Optional[Dict]:
+        """
+        Extract business details from detail panel with EMAIL (timed including the website visit).
+        
+        The caller waits for the place's panel first (_wait_for_panel after a
+        click, the h1 wait after navigating in hydrate_details).
+        """
+        try:
             current_url = self.driver.current_url
             place_id = self._extract_place_id(current_url)
             
             # Extract address
-            address = (
-                self._safe_extract(By.CSS_SELECTOR, 'button[data-item-id="address"] div.fontBodyMedium', 'text') or
-                self._safe_extract(By.CSS_SELECTOR, 'button[data-tooltip="Copy address"]', 'aria-label') or
-                self._safe_extract(By.XPATH, '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]', 'text')
-            )
+            address = self._extract_field('address')
             
             # Extract phone
-            phone = (
-                self._safe_extract(By.CSS_SELECTOR, 'button[data-tooltip="Copy phone number"]', 'aria-label') or
-                self._safe_extract(By.CSS_SELECTOR, 'button[data-item-id*="phone"]', 'aria-label')
-            )
+            phone = self._extract_field('phone')
             if phone and ':' in phone:
                 phone = phone.split(':')[-1].strip()
             
             # Extract website
-            website = (
-                self._safe_extract(By.CSS_SELECTOR, 'a[data-item-id="authority"]', 'href') or
-                self._safe_extract(By.CSS_SELECTOR, 'a[data-tooltip="Open website"]', 'href') or
-                self._safe_extract(By.CSS_SELECTOR, 'a[aria-label*="website"]', 'href')
-            )
+            website = self._extract_field('website')
             
             # Website Details (Email + Social Media)
             email = None
@@ -659,11 +1268,12 @@ class SeleniumScraper:
                 'linkedin': None, 'youtube': None, 'tiktok': None, 'whatsapp': None
             }
             
-            # First try to find email in Maps source
+            # First try to find email in Maps source (regex runs in the page,
+            # only the matches cross the WebDriver connection)
             try:
-                page_source = self.driver.page_source
-                email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                emails_found = re.findall(email_pattern, page_source)
+                found = self.driver.execute_script(self.EMAIL_SCAN_JS) or {}
+                emails_found = found.get('emails', [])
+                self.captcha_stats['page_source_bytes_avoided'] += found.get('size', 0)
                 
                 filtered_emails = [
                     e for e in emails_found 
@@ -680,7 +1290,7 @@ class SeleniumScraper:
                 pass
             
             # If website exists, visit it for more details
-            if website:
+            if website and visit_website:
                 try:
                     site_details = self._extract_website_details(website)
                     if site_details:
@@ -699,21 +1309,13 @@ class SeleniumScraper:
             
             # Extract rating - IMPROVED SELECTORS
             rating = None
-            rating_text = (
-                self._safe_extract(By.CSS_SELECTOR, 'div.F7nice > span[aria-hidden="true"]', 'text') or
-                self._safe_extract(By.CSS_SELECTOR, 'span[role="img"][aria-label*="stars"]', 'aria-label') or 
-                self._safe_extract(By.CSS_SELECTOR, '.fontDisplayLarge', 'text')
-            )
+            rating_text = self._extract_field('rating')
             if rating_text:
                 rating = self._parse_rating(rating_text)
             
             # Extract reviews - IMPROVED SELECTORS
             reviews = None
-            reviews_text = (
-                self._safe_extract(By.CSS_SELECTOR, 'div.F7nice > span > span > span[aria-label]', 'aria-label') or
-                self._safe_extract(By.CSS_SELECTOR, 'button[jsaction*="review"]', 'text') or
-                self._safe_extract(By.CSS_SELECTOR, 'span[aria-label*="reviews"]', 'aria-label')
-            )
+            reviews_text = self._extract_field('reviews')
             if reviews_text:
                 reviews = self._parse_reviews(reviews_text)
             
@@ -771,105 +1373,16 @@ class SeleniumScraper:
                 'labels': None
             }
     
+    @timed('website')
     def _extract_website_details(self, website_url: str, timeout: int = 10) -> Dict:
-        """Extract email and social media links from business website."""
-        details = {
-            'email': None,
-            'social_media': {
-                'facebook': None, 'instagram': None, 'twitter': None, 
-                'linkedin': None, 'youtube': None, 'tiktok': None,
-                'whatsapp': None
-            }
-        }
-        
-        try:
-            import requests
-            from requests.exceptions import RequestException
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-            }
-            
-            self.logger.info(f"Visiting website: {website_url}")
-            response = requests.get(
-                website_url,
-                headers=headers,
-                timeout=timeout,
-                allow_redirects=True,
-                verify=False  # Sometimes needed for small business sites with bad certs
-            )
-            
-            if response.status_code == 200:
-                html_content = response.text
-                
-                # 1. Extract Email
-                email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                emails = re.findall(email_pattern, html_content)
-                
-                filtered = [
-                    e for e in emails 
-                    if not any(x in e.lower() for x in [
-                        'example.com', 'test.com', 'sample.com', 
-                        'wix.com', 'wordpress.com', 'yourdomain.com',
-                        'sentry.io', 'privacy@', 'noreply@', '.png', '.jpg', '.jpeg', '.gif'
-                    ])
-                ]
-                
-                if filtered:
-                    details['email'] = filtered[0]
-                
-                # 2. Extract Social Media
-                if BeautifulSoup:
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    links = soup.find_all('a', href=True)
-                    
-                    for link in links:
-                        href = link['href'].lower()
-                        
-                        if 'facebook.com' in href and not details['social_media']['facebook']:
-                            details['social_media']['facebook'] = link['href']
-                        elif 'instagram.com' in href and not details['social_media']['instagram']:
-                            details['social_media']['instagram'] = link['href']
-                        elif ('twitter.com' in href or 'x.com' in href) and not details['social_media']['twitter']:
-                            details['social_media']['twitter'] = link['href']
-                        elif 'linkedin.com/company' in href or 'linkedin.com/in' in href and not details['social_media']['linkedin']:
-                            details['social_media']['linkedin'] = link['href']
-                        elif 'youtube.com' in href and not details['social_media']['youtube']:
-                            details['social_media']['youtube'] = link['href']
-                        elif 'tiktok.com' in href and not details['social_media']['tiktok']:
-                            details['social_media']['tiktok'] = link['href']
-                        elif ('wa.me' in href or 'api.whatsapp.com' in href or 'whatsapp.com' in href) and not details['social_media']['whatsapp']:
-                            # Extract number from WhatsApp URL
-                            wa_url = link['href']
-                            wa_number = None
-                            
-                            # Case 1: wa.me/NUMBER
-                            wa_match = re.search(r'wa\.me/(\d+)', wa_url)
-                            if wa_match:
-                                wa_number = wa_match.group(1)
-                                
-                            # Case 2: api.whatsapp.com/send?phone=NUMBER
-                            if not wa_number:
-                                wa_match = re.search(r'phone=(\d+)', wa_url)
-                                if wa_match:
-                                    wa_number = wa_match.group(1)
-                                    
-                            # Case 3: whatsapp.com ...
-                            if not wa_number:
-                                wa_match = re.search(r'whatsapp\.com.*?(\d{10,})', wa_url)
-                                if wa_match:
-                                    wa_number = wa_match.group(1)
-                                    
-                            details['social_media']['whatsapp'] = wa_number if wa_number else wa_url
-                else:
-                    # Fallback if BS4 not installed (though we added it)
-                    pass
-                    
-        except Exception as e:
-            self.logger.debug(f"Website extraction error: {e}")
-        
+        """
+        Extract email and social media links from business website.
+
+        Follows contact/about pages within the crawler's page budget;
+        the per-domain crawl report is kept in self.crawl_reports.
+        """
+        details = self.website_crawler.crawl(website_url, timeout=timeout)
+        self.crawl_reports.append(details.pop('crawl'))
         return details
     
     def _safe_extract(self, by: By, selector: str, attribute: str = 'text') -> Optional[str]:
@@ -899,6 +1412,11 @@ class SeleniumScraper:
     
     def _extract_coordinates(self, url: str) -> Optional[Tuple[float, float]]:
         """Extract coordinates from URL."""
+        # Place links carry the pin position as !3d<lat>!4d<lon>
+        match = re.search(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)', url)
+        if match:
+            return (float(match.group(1)), float(match.group(2)))
+        
         match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
         if match:
             return (float(match.group(1)), float(match.group(2)))
@@ -949,26 +1467,64 @@ class SeleniumScraper:
         except Exception as e:
             self.logger.debug(f"Error scrolling: {e}")
     
-    def _detect_captcha(self) -> bool:
-        """Detect captcha."""
-        captcha_indicators = [
-            'g-recaptcha',
-            'recaptcha',
-            'captcha',
-            'verify you are human',
-            'unusual traffic'
-        ]
+    def _navigate(self, url: str):
+        """Load a URL and schedule a captcha check for the new page."""
+        self.driver.get(url)
+        self._captcha_check_pending = True
+    
+    def _detect_captcha(self, force: bool = False) -> bool:
+        """
+        Detect captcha with a small in-page probe instead of page_source.
+        
+        The probe runs right after a navigation and on every
+        captcha.check_every-th call otherwise; skipped calls return False.
+        captcha_stats tracks how many page_source bytes were not transferred.
+        """
+        self._captcha_calls += 1
+        due = force or self._captcha_check_pending or self._captcha_calls % self.captcha_check_every == 0
+        
+        if not due:
+            self.captcha_stats['skipped'] += 1
+            self.captcha_stats['page_source_bytes_avoided'] += self._last_page_size
+            return False
+        
+        self._captcha_check_pending = False
         
-        page_source = self.driver.page_source.lower()
+        try:
+            # Measure the DOM size now and then so the savings metric stays realistic
+            sample_size = self.captcha_stats['checks'] % 10 == 0
+            with self.metrics.span('captcha_check'):
+                result = self.driver.execute_script(self.CAPTCHA_CHECK_JS, sample_size) or {}
+        except WebDriverException as e:
+            self.logger.debug(f"Captcha probe failed: {e}")
+            return False
         
-        for indicator in captcha_indicators:
-            if indicator in page_source:
-                return True
+        self.captcha_stats['checks'] += 1
+        if result.get('size'):
+            self._last_page_size = result['size']
+        self.captcha_stats['page_source_bytes_avoided'] += self._last_page_size
         
+        if result.get('captcha'):
+            self.captcha_stats['detected'] += 1
+            self.metrics.count('captchas')
+            self._last_captcha_reason = result.get('reason')
+            return True
+        
+        self.captcha_policy.tracker.record_success(self.identity)
         return False
     
     def _handle_captcha(self):
-        """Handle captcha."""
+        """
+        Handle captcha according to the captcha policy.
+        
+        Raises:
+            CaptchaBlocked: When this worker should stop and requeue its job
+        """
+        self._signal(self._last_captcha_reason or 'captcha')
+        self.captcha_policy.handle(self)
+    
+    def _wait_for_manual_captcha(self):
+        """Block until the user solves the captcha (interactive runs only)."""
         print("\n" + "="*70)
         print("⚠️  CAPTCHA DETECTED!")
         print("="*70)
@@ -983,6 +1539,29 @@ class SeleniumScraper:
     
     def close(self):
         """Close browser."""
+        self.selectors.save()
+        self.rate_controller.save()
+        self.robots_checker.close()
+        self.logger.info(
+            f"Captcha checks: {self.captcha_stats['checks']} run, "
+            f"{self.captcha_stats['skipped']} skipped, {self.captcha_stats['detected']} detected "
+            f"(~{self.captcha_stats['page_source_bytes_avoided'] / 1024:.0f} KB of page_source avoided)"
+        )
+        if self.crawl_reports:
+            pages = sum(r['pages_fetched'] for r in self.crawl_reports)
+            elapsed = sum(r['elapsed'] for r in self.crawl_reports)
+            early = sum(1 for r in self.crawl_reports if r['stopped_early'])
+            self.logger.info(
+                f"Website crawls: {len(self.crawl_reports)} domains, {pages} pages "
+                f"in {elapsed:.1f}s ({early} stopped early)"
+            )
+        if self.website_crawler.cache:
+            self.logger.info(self.website_crawler.cache.summary())
+        self.logger.info(self.website_crawler.http.summary())
+        
+        if self.recorder:
+            self.recorder.close(self.driver)
+        
         if self.driver:
             self.logger.info("Closing browser...")
             try:
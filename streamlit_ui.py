@@ -17,8 +17,9 @@ DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'users.db')
 
 # Import our existing modules
 from config import Config
-from utils import setup_logging
+from utils import setup_logging, filter_leads
 from selenium_scraper import SeleniumScraper
+from captcha_policy import CaptchaBlocked
 from dedupe import Deduplicator
 from exporter import DataExporter
 from robots_checker import RobotsChecker
@@ -1415,6 +1416,28 @@ def price_estimator():
             except Exception as e:
                 st.error(f"❌ Error: {str(e)}")
 
+def export_leads_for_download(config, leads, formats, name):
+    """Export leads to a temp dir and return (type, data, suffix, filename) tuples for the download buttons."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        exporter = DataExporter(config, output_dir=temp_dir)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        exported_files = exporter.export(
+            data=leads,
+            formats=formats,
+            filename=f"{name}_{timestamp}"
+        )
+        
+        results_list = []
+        for file_path in exported_files:
+            if file_path.startswith("http") or file_path.startswith("ERROR"):
+                results_list.append(('Open', file_path, '', ''))
+            else:
+                path_obj = Path(file_path)
+                with open(file_path, 'rb') as f:
+                    results_list.append(('Download', f.read(), path_obj.suffix.upper(), path_obj.name))
+        return results_list
+
 def google_maps_scraping():
     col1, col2 = st.columns(2)
     with col1:
@@ -1422,7 +1445,18 @@ def google_maps_scraping():
         location = st.text_input("Target Location", "New York, USA", help="City, State, or Region")
     with col2:
         max_leads = st.number_input("Target Unique Leads", min_value=1, max_value=1000, value=50, step=1, help="Exact number of unique leads to generate")
-        delay = st.slider("Safe Delay (seconds)", 1.0, 10.0, 3.0, step=0.5, help="Increase to avoid detection")
+        delay = st.slider("Starting Delay (seconds)", 1.0, 10.0, 3.0, step=0.5, help="Starting pace only - the scraper speeds up while pages load cleanly and slows down automatically on captchas, empty results or timeouts")
+        depth_labels = {
+            "website": "Full (details + website emails & socials)",
+            "details": "Details (phone & website, no site visit)",
+            "list": "List only (fastest - name, category, rating, address)"
+        }
+        depth = st.selectbox(
+            "Scrape Depth",
+            list(depth_labels.keys()),
+            format_func=lambda d: depth_labels[d],
+            help="List mode reads the results list without opening each place. You can fill in details later for the leads you keep."
+        )
     
     # Enhanced format selection including Excel
     formats = st.multiselect(
@@ -1481,13 +1515,18 @@ def google_maps_scraping():
             status_text.markdown(f"### 🔍 Searching for **{query}** in **{location}**...")
             progress_bar.progress(10)
             
-            leads = scraper.scrape_google_maps(
-                query=query,
-                location=location,
-                max_results=max_leads
-            )
-            
-            scraper.close()
+            try:
+                leads = scraper.scrape_google_maps(
+                    query=query,
+                    location=location,
+                    max_results=max_leads,
+                    depth=depth
+                )
+            except CaptchaBlocked as e:
+                leads = e.partial_leads
+                st.warning(f"⚠️ Google showed a captcha. Kept {len(leads)} leads collected so far - try again in {e.retry_after / 60:.0f} min or increase the delay.")
+            finally:
+                scraper.close()
             status_text.markdown("### ⚙️ Processing and Deduplicating Data...")
             progress_bar.progress(70)
             
@@ -1497,41 +1536,26 @@ def google_maps_scraping():
             status_text.markdown("### 💾 Preparing Download...")
             progress_bar.progress(90)
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                exporter = DataExporter(config, output_dir=temp_dir)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                
-                clean_query = "".join(x for x in query if x.isalnum() or x in " -_").strip().replace(" ", "_")
-                clean_loc = "".join(x for x in location if x.isalnum() or x in " -_").strip().replace(" ", "_")
-                base_filename = f"Leads_{clean_query}_{clean_loc}_{timestamp}"
-                
-                exported_files = exporter.export(
-                    data=unique_leads,
-                    formats=formats,
-                    filename=base_filename
-                )
-                
-                # Store results in session state for persistence
-                st.session_state.scrape_results = unique_leads
-                results_list = []
-                for file_path in exported_files:
-                    if file_path.startswith("http") or file_path.startswith("ERROR"):
-                        results_list.append(('Open', file_path, '', ''))
-                    else:
-                        path_obj = Path(file_path)
-                        with open(file_path, 'rb') as f:
-                            results_list.append(('Download', f.read(), path_obj.suffix.upper(), path_obj.name))
-                st.session_state.exported_files_data = results_list
-
-                # SaaS Usage Tracking
-                found_count = len(unique_leads)
-                new_total = st.session_state.usage_count + found_count
-                db.update_settings(st.session_state.username, {'usage_count': new_total})
-                st.session_state.usage_count = new_total
-
-                progress_bar.progress(100)
-                status_text.markdown("### ✅ Generation Complete!")
-                st.rerun()
+            clean_query = "".join(x for x in query if x.isalnum() or x in " -_").strip().replace(" ", "_")
+            clean_loc = "".join(x for x in location if x.isalnum() or x in " -_").strip().replace(" ", "_")
+            
+            # Store results in session state for persistence
+            st.session_state.scrape_results = unique_leads
+            st.session_state.scrape_depth = depth
+            st.session_state.scrape_export = {'formats': formats, 'name': f"Leads_{clean_query}_{clean_loc}"}
+            st.session_state.exported_files_data = export_leads_for_download(
+                config, unique_leads, formats, st.session_state.scrape_export['name']
+            )
+            
+            # SaaS Usage Tracking
+            found_count = len(unique_leads)
+            new_total = st.session_state.usage_count + found_count
+            db.update_settings(st.session_state.username, {'usage_count': new_total})
+            st.session_state.usage_count = new_total
+
+            progress_bar.progress(100)
+            status_text.markdown("### ✅ Generation Complete!")
+            st.rerun()
         
         except Exception as e:
             st.error(f"System Error: {str(e)}")
@@ -1544,11 +1568,58 @@ def google_maps_scraping():
         exported_files_data = st.session_state.exported_files_data
         
         st.success(f"Successfully generated {len(unique_leads)} unique leads")
+        if st.session_state.get('hydrate_warning'):
+            st.warning(st.session_state.pop('hydrate_warning'))
         
         df = pd.DataFrame(unique_leads)
         preview_cols = ['name', 'phone', 'email', 'website', 'address']
+        if st.session_state.get('scrape_depth') == 'list':
+            preview_cols = ['name', 'category', 'rating', 'reviews', 'address', 'maps_url']
         st.dataframe(df[ [c for c in preview_cols if c in df.columns] ])
         
+        # Deferred detail pass for list-only results
+        if st.session_state.get('scrape_depth') == 'list':
+            with st.expander("🔎 Hydrate Details for Selected Leads"):
+                st.caption("Open only the places that pass your filters to fetch phone, website and (optionally) emails.")
+                h_col1, h_col2, h_col3 = st.columns(3)
+                with h_col1:
+                    min_rating = st.number_input("Min Rating", 0.0, 5.0, 4.0, step=0.1, key="hydrate_min_rating")
+                with h_col2:
+                    min_reviews = st.number_input("Min Reviews", 0, 100000, 10, step=5, key="hydrate_min_reviews")
+                with h_col3:
+                    hydrate_depth = st.selectbox("Detail Level", ["details", "website"], key="hydrate_depth")
+                
+                selected = filter_leads(unique_leads, min_rating, min_reviews)
+                st.write(f"{len(selected)} of {len(unique_leads)} leads pass the filters")
+                
+                if st.button("Hydrate Details", key="hydrate_start", disabled=not selected):
+                    try:
+                        config = Config()
+                        config._config['robots']['enabled'] = False
+                        with st.spinner(f"Fetching details for {len(selected)} leads..."):
+                            scraper = SeleniumScraper(config=config, headless=True, guest_mode=True)
+                            try:
+                                scraper.hydrate_details(selected, depth=hydrate_depth)
+                            except CaptchaBlocked as e:
+                                # Leads are hydrated in place, so the details fetched so far are kept
+                                selected = e.partial_leads or selected
+                                st.session_state.hydrate_warning = (
+                                    f"⚠️ Google showed a captcha. Kept the details fetched so far - "
+                                    f"try again in {e.retry_after / 60:.0f} min or increase the delay."
+                                )
+                            finally:
+                                scraper.close()
+                        
+                        st.session_state.scrape_results = selected
+                        st.session_state.scrape_depth = hydrate_depth
+                        export = st.session_state.get('scrape_export', {'formats': ['csv'], 'name': 'Leads'})
+                        st.session_state.exported_files_data = export_leads_for_download(
+                            config, selected, export['formats'], export['name']
+                        )
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Hydration failed: {str(e)}")
+        
         if exported_files_data:
             st.markdown("### 📥 Download Results" )
             st.info("💡 **Chromebook/Cloud Tip:** If the 'Download' button doesn't respond, ensure your browser is not blocking popups. **Google Sheets** (if selected) is the best way to view data on a Chromebook.")
@@ -1930,4 +2001,4 @@ def main():
             user_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
\ No newline at end of file
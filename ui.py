@@ -4,17 +4,20 @@ Flask web UI for business lead scraper.
 Beautiful, production-ready interface with real-time progress tracking.
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 import logging
 
 from selenium_scraper import SeleniumScraper
+from captcha_policy import CaptchaBlocked, default_tracker
 from exporter import DataExporter
 from dedupe import Deduplicator
 from config import Config
+from metrics import RunMetrics
 
 app = Flask(__name__)
 CORS(app)
@@ -28,6 +31,9 @@ scraping_status = {
     'error': None
 }
 
+# Totals over every finished scrape, served at /metrics
+service_metrics = RunMetrics()
+
 @app.route('/')
 def index():
     """Render main page with beautiful UI."""
@@ -104,7 +110,8 @@ def index():
         }
         
         input[type="text"],
-        input[type="number"] {
+        input[type="number"],
+        select {
             width: 100%;
             padding: 15px;
             font-size: 15px;
@@ -115,7 +122,8 @@ def index():
         }
         
         input[type="text"]:focus,
-        input[type="number"]:focus {
+        input[type="number"]:focus,
+        select:focus {
             outline: none;
             border-color: #667eea;
             box-shadow: 0 0 0 4px rgba(102, 126, 234, 0.1);
@@ -384,6 +392,16 @@ def index():
                 <div class="example">Recommended: 10-100 for faster results</div>
             </div>
             
+            <div class="form-group">
+                <label for="depth">Scrape Depth</label>
+                <select id="depth">
+                    <option value="list">List only - name, category, rating, address (fastest)</option>
+                    <option value="details">Details - also phone and website</option>
+                    <option value="website" selected>Website - also emails and social links (slowest)</option>
+                </select>
+                <div class="example">List mode reads the results list without opening each place</div>
+            </div>
+            
             <div class="form-group">
                 <label>Export Formats</label>
                 <div class="checkbox-group">
@@ -434,6 +452,7 @@ def index():
             const query = document.getElementById('query').value.trim();
             const location = document.getElementById('location').value.trim();
             const max = parseInt(document.getElementById('max').value);
+            const depth = document.getElementById('depth').value;
             
             if (!query) {
                 alert('Please enter a business type!');
@@ -455,7 +474,7 @@ def index():
                 return;
             }
             
-            console.log('Data:', {query, location, max, formats});
+            console.log('Data:', {query, location, max, formats, depth});
             
             statusDiv.classList.add('show');
             submitBtn.disabled = true;
@@ -470,7 +489,7 @@ def index():
                 const response = await fetch('/scrape', {
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({query, location, max, formats})
+                    body: JSON.stringify({query, location, max, formats, depth})
                 });
                 
                 const result = await response.json();
@@ -584,6 +603,13 @@ def scrape():
     location = data.get('location')
     max_results = int(data.get('max', 50))
     formats = data.get('formats', ['csv', 'json', 'sqlite'])
+    depth = data.get('depth', 'website')
+    
+    if depth not in SeleniumScraper.DEPTHS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown depth: {depth}'
+        }), 400
     
     scraping_status = {
         'running': True,
@@ -595,7 +621,7 @@ def scrape():
     
     thread = threading.Thread(
         target=run_scraper,
-        args=(query, location, max_results, formats)
+        args=(query, location, max_results, formats, depth)
     )
     thread.daemon = True
     thread.start()
@@ -610,6 +636,11 @@ def status():
     """Get current scraping status."""
     return jsonify(scraping_status)
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics summed over all finished scrapes."""
+    return Response(service_metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/download/<filename>')
 def download(filename):
     """Download result file."""
@@ -618,7 +649,7 @@ def download(filename):
         return send_file(file_path, as_attachment=True)
     return jsonify({'error': 'File not found'}), 404
 
-def run_scraper(query, location, max_results, formats):
+def run_scraper(query, location, max_results, formats, depth='website'):
     """Run the scraper (background task)."""
     global scraping_status
     
@@ -629,35 +660,60 @@ def run_scraper(query, location, max_results, formats):
         scraping_status['progress'] = 10
         
         config = Config()
+        max_requeues = config.captcha.get('max_requeues', 2)
+        leads = []
+        run_metrics = RunMetrics()
         
         scraper = SeleniumScraper(
             config=config,
             headless=False,
             guest_mode=True,
-            delay=1.5
+            delay=1.5,
+            metrics=run_metrics
         )
         
-        scraping_status['message'] = f'Searching Google Maps for "{query}" in {location}...'
-        scraping_status['progress'] = 20
-        
-        leads = scraper.scrape_google_maps(
-            query=query,
-            location=location,
-            max_results=max_results
-        )
-        
-        scraper.close()
+        # A captcha only pauses this job: it is retried right away when the policy
+        # rotated the browser's identity, otherwise after the identity's cool-down,
+        # instead of blocking on input()
+        try:
+            for attempt in range(max_requeues + 1):
+                scraping_status['message'] = f'Searching Google Maps for "{query}" in {location}...'
+                scraping_status['progress'] = 20
+                
+                try:
+                    leads = scraper.scrape_google_maps(
+                        query=query,
+                        location=location,
+                        max_results=max_results,
+                        depth=depth
+                    )
+                    break
+                except CaptchaBlocked as e:
+                    leads = e.partial_leads or leads
+                    if attempt == max_requeues:
+                        scraping_status['message'] = f'Captcha persisted - keeping {len(leads)} leads'
+                        break
+                    if e.rotated:
+                        scraping_status['message'] = f'Captcha detected - retrying as {scraper.identity}...'
+                        continue
+                    wait = max(e.retry_after, default_tracker.cooldown_remaining(e.identity))
+                    scraping_status['message'] = f'Captcha detected - job requeued, retrying in {wait:.0f}s...'
+                    time.sleep(wait)
+        finally:
+            scraper.close()
+        # Counted once for the leads kept, not per requeued attempt
+        run_metrics.count('leads', len(leads))
         
         scraping_status['message'] = 'Deduplicating results...'
         scraping_status['progress'] = 70
         
-        deduplicator = Deduplicator(config)
+        deduplicator = Deduplicator(config, metrics=run_metrics)
         unique_leads = deduplicator.deduplicate(leads)
         
         scraping_status['message'] = 'Exporting data...'
         scraping_status['progress'] = 85
         
-        exporter = DataExporter(config, output_dir='./data')
+        exporter = DataExporter(config, output_dir='./data', metrics=run_metrics)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         base_filename = f"leads_{timestamp}"
         
@@ -666,6 +722,15 @@ def run_scraper(query, location, max_results, formats):
             formats=formats,
             filename=base_filename
         )
+        exporter.export_run_report(
+            base_filename,
+            query=query,
+            location=location,
+            depth=depth,
+            unique_leads=len(unique_leads)
+        )
+        run_metrics.count('runs')
+        service_metrics.merge(run_metrics)
         
         duration = (datetime.now() - start_time).total_seconds()
         
@@ -681,6 +746,7 @@ def run_scraper(query, location, max_results, formats):
         
     except Exception as e:
         logging.error(f"Scraping error: {e}", exc_info=True)
+        service_metrics.count('failed_runs')
         scraping_status['running'] = False
         scraping_status['error'] = str(e)
         scraping_status['progress'] = 0
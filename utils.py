@@ -7,7 +7,7 @@ import random
 import logging
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 def sleep_random(base_delay: float, randomization: float = 0.5):
@@ -107,6 +107,32 @@ def extract_domain(url: str) -> Optional[str]:
     return match.group(1) if match else None
 
 
+def filter_leads(
+    leads: List[Dict],
+    min_rating: Optional[float] = None,
+    min_reviews: Optional[int] = None
+) -> List[Dict]:
+    """
+    Keep only leads that pass rating/review thresholds.
+    
+    Args:
+        leads: List of business dictionaries
+        min_rating: Minimum star rating (None = no filter)
+        min_reviews: Minimum number of reviews (None = no filter)
+        
+    Returns:
+        Filtered list of leads
+    """
+    filtered = []
+    for lead in leads:
+        if min_rating is not None and (lead.get('rating') or 0) < min_rating:
+            continue
+        if min_reviews is not None and (lead.get('reviews') or 0) < min_reviews:
+            continue
+        filtered.append(lead)
+    return filtered
+
+
 def format_timestamp(timestamp: str) -> str:
     """
     Format ISO timestamp for display.
@@ -0,0 +1,301 @@
+"""
+Bounded website crawler for lead enrichment.
+
+Most small-business emails live on /contact or /about rather than the
+homepage. For each business website this module fetches the homepage,
+discovers likely contact pages from its links and the sitemap, fetches up
+to a fixed page budget concurrently through the shared pooled HttpClient,
+and stops as soon as an email and enough social links have been found.
+Pages and per-domain results go through the persistent HttpCache, so
+repeat runs and chain stores sharing one website are served from disk.
+Every network fetch waits for its host's slot in the PolitenessScheduler,
+and crawl_many() interleaves many websites while keeping each host polite.
+"""
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from http_cache import HttpCache
+from http_client import HttpClient
+from extraction import SOCIAL_NETWORKS, extract_emails, extract_social_links
+from politeness import PolitenessScheduler
+
+
+class WebsiteCrawler:
+    """
+    Crawl a business website within a per-domain page budget.
+
+    Pages are ranked by how strongly their URL or link text suggests
+    contact details (contact > about > team ...).
+    """
+
+    # Hosts serving many unrelated businesses; their per-domain results are not cached
+    SHARED_HOSTS = (
+        'facebook.com', 'fb.com', 'instagram.com', 'twitter.com', 'x.com', 'linkedin.com',
+        'youtube.com', 'tiktok.com', 'linktr.ee', 'sites.google.com', 'business.site',
+        'wixsite.com', 'wix.com', 'squarespace.com', 'wordpress.com', 'blogspot.com',
+        'weebly.com', 'godaddysites.com', 'yelp.com', 'tripadvisor.com', 'bit.ly'
+    )
+    
+    # URL/link-text hints and their priority (higher = fetched first)
+    CONTACT_HINTS = {
+        'contact': 10, 'kontakt': 10, 'contacto': 10, 'get-in-touch': 9, 'reach-us': 9,
+        'impressum': 8, 'about': 6, 'team': 4, 'support': 3, 'location': 2, 'legal': 1
+    }
+
+    ANCHOR_RE = re.compile(r'<a\s[^>]*href=["\']([^"\'#]+)["\'][^>]*>(.*?)</a>', re.I | re.S)
+    TAG_RE = re.compile(r'<[^>]+>')
+    SITEMAP_LOC_RE = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>')
+
+    def __init__(self, config):
+        """
+        Initialize the crawler.
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        settings = config.crawler
+        self.max_pages = settings.get('max_pages', 5)
+        self.workers = settings.get('workers', 3)
+        self.use_sitemap = settings.get('use_sitemap', True)
+        self.min_social_links = settings.get('min_social_links', 2)
+        self.cache = HttpCache.shared(config)
+        self.http = HttpClient.shared(config)
+        self.scheduler = PolitenessScheduler.shared(config)
+        self.batch_workers = config.politeness.get('workers', 8)
+        self.reports: List[Dict] = []
+
+    def crawl(self, website_url: str, timeout: int = 10) -> Dict:
+        """
+        Collect email and social links from a website.
+
+        Args:
+            website_url: Business homepage URL
+            timeout: Per-request timeout in seconds
+
+        Returns:
+            Dict with 'email', 'social_media' and a 'crawl' report
+            (domain, pages_fetched, page_budget, elapsed, stopped_early, cached, urls)
+        """
+        started = time.monotonic()
+        details = {
+            'email': None,
+            'social_media': {network: None for network in SOCIAL_NETWORKS}
+        }
+        report = {
+            'domain': urlparse(website_url).netloc,
+            'pages_fetched': 0,
+            'page_budget': self.max_pages,
+            'elapsed': 0.0,
+            'stopped_early': False,
+            'cached': False,
+            'urls': []
+        }
+
+        domain = self._domain_key(website_url)
+        cached = self.cache.get_result(domain) if self.cache and domain else None
+        if cached:
+            details.update(cached)
+            report['cached'] = True
+            details['crawl'] = report
+            self.reports.append(report)
+            self.logger.debug(f"Reusing cached website details for {domain}")
+            return details
+
+        self.logger.info(f"Visiting website: {website_url}")
+        homepage = self._fetch(website_url, timeout)
+        report['pages_fetched'] += 1
+        report['urls'].append(website_url)
+
+        if homepage:
+            base_url, html_content = homepage
+            self._extract_contacts(html_content, details)
+
+            if self._is_complete(details):
+                report['stopped_early'] = True
+            else:
+                candidates = self._discover_pages(base_url, html_content, timeout, report)
+                self._crawl_candidates(candidates, timeout, details, report)
+
+            if self.cache and domain:
+                self.cache.put_result(domain, {
+                    'email': details['email'],
+                    'social_media': details['social_media']
+                })
+
+        report['elapsed'] = time.monotonic() - started
+        details['crawl'] = report
+        self.reports.append(report)
+        self.logger.info(
+            f"Crawled {report['domain']}: {report['pages_fetched']}/{report['page_budget']} pages "
+            f"in {report['elapsed']:.1f}s" + (" (stopped early)" if report['stopped_early'] else "")
+        )
+        return details
+
+    def crawl_many(self, website_urls: List[str], timeout: int = 10) -> Dict[str, Dict]:
+        """
+        Crawl many websites, interleaving hosts politely.
+
+        Args:
+            website_urls: Business homepage URLs
+            timeout: Per-request timeout in seconds
+
+        Returns:
+            Dict mapping each URL to its crawl() result (None if the crawl failed)
+        """
+        urls = list(dict.fromkeys(url for url in website_urls if url))
+        results = self.scheduler.run(
+            urls,
+            lambda url: self.crawl(url, timeout=timeout),
+            workers=self.batch_workers
+        )
+        return dict(zip(urls, results))
+
+    @classmethod
+    def _domain_key(cls, url: str) -> str:
+        """
+        Cache key shared by every place on the same website.
+        
+        Chains share their host. Shared hosts (social networks, link-in-bio
+        and site-builder domains) return '' so their results are not cached:
+        their URL layouts (/pages/<name>/<id>, /view/<site>, profile.php?id=)
+        have no reliable per-business key, and their pages stay in the
+        per-URL page cache anyway.
+        """
+        host = urlparse(url).netloc.lower()
+        host = host[4:] if host.startswith('www.') else host
+        if any(host == shared or host.endswith('.' + shared) for shared in cls.SHARED_HOSTS):
+            return ''
+        return host
+
+    def _fetch(self, url: str, timeout: int) -> Optional[tuple]:
+        """
+        Fetch a page, serving fresh cache entries and revalidating stale ones.
+
+        Returns:
+            (final_url, text) or None if the fetch failed
+        """
+        entry = self.cache.get_page(url) if self.cache else None
+        if entry and entry['fresh']:
+            self.cache.record('hits')
+            return entry['final_url'], entry['body']
+
+        self.scheduler.wait(url)
+        try:
+            response = self.http.get(
+                url,
+                headers=self.cache.conditional_headers(entry) if self.cache else None,
+                timeout=timeout,
+                allow_redirects=True,
+                verify=False  # Sometimes needed for small business sites with bad certs
+            )
+            if response.status_code == 304 and entry:
+                self.cache.touch_page(url)
+                self.cache.record('revalidated')
+                return entry['final_url'], entry['body']
+            if response.status_code == 200:
+                if self.cache:
+                    self.cache.record('misses')
+                    self.cache.put_page(
+                        url, response.url, response.text,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                return response.url, response.text
+        except Exception as e:
+            self.logger.debug(f"Website fetch error for {url}: {e}")
+        return None
+
+    def _discover_pages(
+        self,
+        base_url: str,
+        html_content: str,
+        timeout: int,
+        report: Dict
+    ) -> List[str]:
+        """Rank same-host links (and sitemap entries) that likely hold contact details."""
+        host = urlparse(base_url).netloc
+        scores: Dict[str, int] = {}
+
+        for href, text in self.ANCHOR_RE.findall(html_content):
+            url = urljoin(base_url, href.strip())
+            if urlparse(url).netloc != host or url.rstrip('/') == base_url.rstrip('/'):
+                continue
+            score = self._score(url + ' ' + self.TAG_RE.sub(' ', text))
+            if score:
+                scores[url] = max(scores.get(url, 0), score)
+
+        budget_left = self.max_pages - report['pages_fetched']
+        if self.use_sitemap and len(scores) < budget_left and budget_left > 1:
+            sitemap = self._fetch(urljoin(base_url, '/sitemap.xml'), timeout)
+            report['pages_fetched'] += 1
+            report['urls'].append(urljoin(base_url, '/sitemap.xml'))
+            if sitemap:
+                for loc in self.SITEMAP_LOC_RE.findall(sitemap[1]):
+                    if urlparse(loc).netloc == host:
+                        score = self._score(loc)
+                        if score:
+                            scores[loc] = max(scores.get(loc, 0), score)
+
+        ranked = sorted(scores, key=lambda url: -scores[url])
+        return ranked[:max(0, self.max_pages - report['pages_fetched'])]
+
+    def _score(self, text: str) -> int:
+        """Priority of a URL/link text as a contact page (0 = not a candidate)."""
+        text = text.lower()
+        return max((weight for hint, weight in self.CONTACT_HINTS.items() if hint in text), default=0)
+
+    def _crawl_candidates(
+        self,
+        candidates: List[str],
+        timeout: int,
+        details: Dict,
+        report: Dict
+    ):
+        """Fetch candidate pages concurrently until the budget is spent or details are complete."""
+        if not candidates:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._fetch, url, timeout): url for url in candidates}
+            for future in as_completed(futures):
+                page = future.result()
+                if page:
+                    self._extract_contacts(page[1], details)
+
+                if self._is_complete(details):
+                    report['stopped_early'] = True
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        # Counted once the executor has drained: fetches still running at the
+        # early stop finish and count, cancelled ones never ran
+        fetched = [url for future, url in futures.items() if not future.cancelled()]
+        report['pages_fetched'] += len(fetched)
+        report['urls'].extend(fetched)
+
+    def _is_complete(self, details: Dict) -> bool:
+        """Whether an email and enough social links have been found."""
+        socials = sum(1 for v in details['social_media'].values() if v)
+        return bool(details['email']) and socials >= self.min_social_links
+
+    def _extract_contacts(self, html_content: str, details: Dict):
+        """Fill missing email/social fields in details from one page."""
+        if not details['email']:
+            emails = extract_emails(html_content)
+            if emails:
+                details['email'] = emails[0]
+
+        social = details['social_media']
+        missing = [network for network, value in social.items() if not value]
+        if missing:
+            for network, value in extract_social_links(html_content, missing).items():
+                if value:
+                    social[network] = value